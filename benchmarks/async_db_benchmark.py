@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark: async routes doing their database work through a
+blocking Session (the old get_db_session) vs the async engine
+(get_async_db_session).
+
+A small FastAPI app exposes the same handler twice: it loads the applicant,
+writes a chat message and reads the session's history back, as the chatbot
+route does. --requests calls with --concurrency in flight are sent through
+httpx's ASGI transport (no network between client and app) and requests per
+second and p50 / p95 latency are reported per variant.
+
+The blocking variant holds the event loop for every round trip, so its
+throughput is bounded by database latency; use --database-url with a real
+Postgres (e.g. the docker-compose one) for representative numbers. The
+default temporary SQLite file has no network round trip, so --db-latency-ms
+adds one per statement: a blocking sleep for the synchronous engine and an
+awaited one (inside SQLAlchemy's greenlet) for the async engine, like a
+driver waiting on the socket.
+
+Usage:
+  python benchmarks/async_db_benchmark.py --requests 2000 --concurrency 50 --db-latency-ms 1
+  python benchmarks/async_db_benchmark.py --database-url postgresql://user:pw@localhost/scratch
+"""
+
+import os
+import sys
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+import tempfile
+import warnings
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import create_engine, event, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.util import await_only  # noqa: E402
+
+from src.services.db import Applicant, Base, ChatHistory, async_url, engine_options  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings("ignore")
+
+APPLICANTS = 100
+
+
+def build_app(url: str, latency: float):
+    options = engine_options(url)
+    sync_engine = create_engine(url, **options)
+    async_engine = create_async_engine(async_url(url), **options)
+    if url.startswith("sqlite"):
+        for engine in (sync_engine, async_engine.sync_engine):
+            @event.listens_for(engine, "connect")
+            def _sqlite(dbapi_conn, _):
+                dbapi_conn.execute("PRAGMA journal_mode=WAL")
+                dbapi_conn.execute("PRAGMA busy_timeout=10000")
+    if latency:
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _blocking_round_trip(*_):
+            time.sleep(latency)
+
+        @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+        def _awaited_round_trip(*_):
+            await_only(asyncio.sleep(latency))
+
+    sync_sessions = sessionmaker(bind=sync_engine)
+    async_sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def sync_db():
+        db = sync_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def async_db():
+        async with async_sessions() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.post("/sync/{applicant_id}")
+    async def blocking(applicant_id: str, db: Session = Depends(sync_db)):
+        db.get(Applicant, applicant_id)
+        session_id = str(uuid.uuid4())
+        db.add(ChatHistory(session_id=session_id, applicant_id=applicant_id, role="user", message="hi"))
+        count = len(db.scalars(select(ChatHistory).where(ChatHistory.session_id == session_id)).all())
+        # Committing last returns the connection before the dependency teardown
+        db.commit()
+        return count
+
+    @app.post("/async/{applicant_id}")
+    async def non_blocking(applicant_id: str, db: AsyncSession = Depends(async_db)):
+        await db.get(Applicant, applicant_id)
+        session_id = str(uuid.uuid4())
+        db.add(ChatHistory(session_id=session_id, applicant_id=applicant_id, role="user", message="hi"))
+        rows = await db.scalars(select(ChatHistory).where(ChatHistory.session_id == session_id))
+        count = len(rows.all())
+        await db.commit()
+        return count
+
+    return app, sync_engine, async_engine
+
+
+async def drive(app, variant: str, requests: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(f"/{variant}/applicant-{i % APPLICANTS}")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (
+        requests / elapsed,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    )
+
+
+async def run(url: str, requests: int, concurrency: int, latency: float):
+    app, sync_engine, async_engine = build_app(url, latency)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        session.add_all(Applicant(applicant_id=f"applicant-{i}", demographic={}) for i in range(APPLICANTS))
+        session.commit()
+    try:
+        # Warm both pools before measuring
+        await drive(app, "sync", concurrency, concurrency)
+        await drive(app, "async", concurrency, concurrency)
+        return {
+            "blocking Session": await drive(app, "sync", requests, concurrency),
+            "async engine": await drive(app, "async", requests, concurrency),
+        }
+    finally:
+        await async_engine.dispose()
+        Base.metadata.drop_all(sync_engine)
+        sync_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blocking vs async database access in async routes")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per variant")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight")
+    parser.add_argument("--database-url", help="Scratch database (default: temporary SQLite file)")
+    parser.add_argument(
+        "--db-latency-ms", type=float, default=0.0,
+        help="Simulated network round trip per statement",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        results = asyncio.run(run(url, args.requests, args.concurrency, args.db_latency_ms / 1000))
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent, "
+          f"{args.db_latency_ms:g} ms simulated latency")
+    print(f"{'variant':<18} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for label, (rps, p50, p95) in results.items():
+        print(f"{label:<18} {rps:>9.0f} {p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
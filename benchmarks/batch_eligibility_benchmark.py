@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-row EligibilityEngine.assess vs vectorised assess_batch.
+
+Both the rule path and an ML path are measured. The ML path uses a small
+2-feature LogisticRegression fitted here, because the shipped model expects
+a different feature count and always falls back to rules. The per-row loop
+runs at most --row-cap rows and its throughput is extrapolated to larger
+batches (it is linear in the row count).
+
+Usage:
+  python benchmarks/batch_eligibility_benchmark.py --sizes 1 1000 100000
+"""
+
+import sys
+import time
+import logging
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.eligibility_engine import EligibilityEngine  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+# sklearn feature-name warnings would otherwise flood the output
+warnings.filterwarnings("ignore")
+
+
+def make_engine(ml: bool) -> EligibilityEngine:
+    engine = EligibilityEngine(settings={"ELIGIBILITY_MODEL_PATH": ""})
+    if ml:
+        from sklearn.linear_model import LogisticRegression
+
+        rng = np.random.default_rng(0)
+        X = np.column_stack([rng.uniform(0, 8000, 2000), rng.integers(1, 9, 2000)])
+        y = (X[:, 0] * X[:, 1] < 8000).astype(int)
+        engine.model = LogisticRegression(max_iter=1000).fit(X, y)
+    return engine
+
+
+def rows_per_second(fn, rows: int, min_seconds: float = 0.2) -> float:
+    fn()  # warm-up
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls * rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row vs batch eligibility throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 100000], help="Batch sizes")
+    parser.add_argument("--row-cap", type=int, default=2000, help="Max rows timed in the per-row loop")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    print(f"{'path':<6}{'rows':>9}{'per-row rows/s':>17}{'batch rows/s':>15}{'speedup':>9}")
+    for ml in (False, True):
+        engine = make_engine(ml)
+        for size in args.sizes:
+            incomes = rng.uniform(0, 8000, size)
+            sizes = rng.integers(1, 9, size).astype(float)
+            looped = min(size, args.row_cap)
+
+            def per_row():
+                for i in range(looped):
+                    engine.assess(float(incomes[i]), int(sizes[i]))
+
+            single = rows_per_second(per_row, looped)
+            batch = rows_per_second(lambda: engine.assess_batch(incomes, sizes), size)
+            print(f"{'ml' if ml else 'rules':<6}{size:>9}{single:>17,.0f}{batch:>15,.0f}{batch / single:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: applications with base64 documents inline in raw_data vs
+documents in the content-addressed blob store (src/services/blob_store.py)
+and only references in raw_data.
+
+For each variant, --rows applications with realistic documents (an ID scan,
+a bank statement PDF and a CSV by default, see --doc-kb) are inserted one
+commit at a time, then read back: one application by primary key, and a
+page of the applicant's 20 most recent applications as the listing screens
+do. Reports p50 / p95 latency and the total size of raw_data.
+
+Runs against a temporary SQLite file unless --database-url is given (use a
+scratch Postgres database: the tables are dropped and re-created).
+
+Usage:
+  python benchmarks/blob_store_benchmark.py --rows 100
+  python benchmarks/blob_store_benchmark.py --database-url postgresql://.../scratch
+"""
+
+import os
+import sys
+import time
+import base64
+import logging
+import argparse
+import tempfile
+import warnings
+import statistics
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import Text, cast, create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.services.blob_store import LocalBlobStore, store_document  # noqa: E402
+from src.services.db import Applicant, Application, Base  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings("ignore")
+
+MIMES = ("image/png", "application/pdf", "text/csv")
+
+
+def documents(sizes_kb, seed):
+    # Distinct random content per application, so nothing deduplicates
+    return [
+        f"data:{MIMES[i % len(MIMES)]};base64,"
+        + base64.b64encode(os.urandom(kb * 1024 - 8) + seed.to_bytes(8, "big")).decode()
+        for i, kb in enumerate(sizes_kb)
+    ]
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return statistics.median(ordered) * 1000, ordered[int(len(ordered) * 0.95) - 1] * 1000
+
+
+def run_variant(db_engine, store, rows, sizes_kb):
+    Base.metadata.drop_all(db_engine)
+    Base.metadata.create_all(db_engine)
+    with Session(db_engine) as session:
+        session.add(Applicant(applicant_id="bench", demographic={}))
+        session.commit()
+
+    inserts, ids = [], []
+    for i in range(rows):
+        docs = documents(sizes_kb, i)
+        start = time.perf_counter()
+        stored = docs if store is None else [store_document(store, doc) for doc in docs]
+        with Session(db_engine) as session:
+            app_id = str(uuid4())
+            session.add(Application(
+                application_id=app_id, applicant_id="bench", income=1000.0, family_size=3,
+                eligibility="approved", recommendation="ok",
+                raw_data={"documents": stored, "ocr_texts": ["x" * 2000]},
+            ))
+            session.commit()
+        inserts.append(time.perf_counter() - start)
+        ids.append(app_id)
+
+    by_id, listing = [], []
+    for app_id in ids:
+        start = time.perf_counter()
+        with Session(db_engine) as session:
+            session.get(Application, app_id)
+        by_id.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with Session(db_engine) as session:
+            session.scalars(
+                select(Application)
+                .where(Application.applicant_id == "bench")
+                .order_by(Application.created_at.desc())
+                .limit(20)
+            ).all()
+        listing.append(time.perf_counter() - start)
+
+    with Session(db_engine) as session:
+        # Size of the stored JSON, comparable across backends
+        table_mb = session.scalar(
+            select(func.sum(func.length(cast(Application.raw_data, Text))))
+        ) / 1024 / 1024
+    return percentiles(inserts), percentiles(by_id), percentiles(listing), table_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inline base64 documents vs blob references")
+    parser.add_argument("--rows", type=int, default=100, help="Applications per variant")
+    parser.add_argument(
+        "--doc-kb", type=int, nargs="+", default=[1500, 400, 40],
+        help="Document sizes per application in KiB",
+    )
+    parser.add_argument("--database-url", help="Scratch database (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        db_engine = create_engine(url)
+        try:
+            results = {
+                "inline base64": run_variant(db_engine, None, args.rows, args.doc_kb),
+                "blob references": run_variant(
+                    db_engine, LocalBlobStore(os.path.join(tmp, "blobs")), args.rows, args.doc_kb
+                ),
+            }
+        finally:
+            Base.metadata.drop_all(db_engine)
+            db_engine.dispose()
+
+    print(f"{args.rows} applications, documents of {args.doc_kb} KiB")
+    print(f"{'variant':<16} {'insert p50/p95 ms':>20} {'get p50/p95 ms':>18} "
+          f"{'list20 p50/p95 ms':>20} {'raw_data MB':>12}")
+    for label, (insert, by_id, listing, table_mb) in results.items():
+        print(f"{label:<16} {insert[0]:>9.2f}/{insert[1]:<10.2f} {by_id[0]:>8.2f}/{by_id[1]:<9.2f} "
+              f"{listing[0]:>9.2f}/{listing[1]:<10.2f} {table_mb:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
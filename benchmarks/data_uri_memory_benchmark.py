@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: legacy split + b64decode + BytesIO decoding of a data URI
+vs the chunked decoder in src/core/data_uri.py.
+
+Each variant runs in a fresh subprocess on the same synthetic scan (random
+bytes behind a PNG signature, 20 MB by default). The child builds the data
+URI, records its RSS and resets the peak counter (/proc/self/clear_refs),
+decodes the document and computes the OCR cache key and format (what
+ImageOCR does before OCR), then reports peak RSS. Peak minus baseline is the
+memory the decoding path itself needed. Where the peak counter cannot be
+reset, ru_maxrss is reported and includes building the URI.
+
+Usage:
+  python benchmarks/data_uri_memory_benchmark.py --size-mb 20
+"""
+
+import io
+import os
+import sys
+import json
+import base64
+import argparse
+import resource
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.data_uri import decode_data_uri  # noqa: E402
+from src.core.document_format import detect_format  # noqa: E402
+from src.core.ocr_cache import OCRCache  # noqa: E402
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def _reset_peak() -> bool:
+    """
+    Reset the kernel's peak-RSS counter (Linux) so building the URI is not counted.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def legacy_decode(uri: str):
+    header, b64data = uri.split(",", 1)
+    raw = base64.b64decode(b64data)
+    buffer = io.BytesIO(raw)
+    detect_format(raw, header.split(";")[0].removeprefix("data:"))
+    OCRCache.make_key(raw, "eng", engine_version="bench")
+    return buffer
+
+
+def chunked_decode(uri: str):
+    payload = decode_data_uri(uri, max_bytes=1 << 40)
+    detect_format(payload, payload.mime)
+    OCRCache.make_key(payload, "eng", engine_version="bench")
+    return payload
+
+
+def child(variant: str, size_mb: int) -> None:
+    raw = PNG_SIGNATURE + os.urandom(size_mb * 1024 * 1024 - len(PNG_SIGNATURE))
+    uri = "data:image/png;base64," + base64.b64encode(raw).decode()
+    del raw
+    baseline = _status_kb("VmRSS")
+    reset = _reset_peak()
+    result = {"legacy": legacy_decode, "chunked": chunked_decode}[variant](uri)
+    if reset:
+        peak = _status_kb("VmHWM")
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"baseline_kb": baseline, "peak_kb": peak, "uri_chars": len(uri)}))
+    del result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of data-URI decoding paths")
+    parser.add_argument("--size-mb", type=int, default=20, help="Decoded document size")
+    parser.add_argument("--child", choices=["legacy", "chunked"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.size_mb)
+        return
+
+    print(f"{'variant':<10} {'uri MB':>8} {'baseline MB':>12} {'peak MB':>9} {'decode MB':>10}")
+    for variant in ("legacy", "chunked"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", variant, "--size-mb", str(args.size_mb)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        stats = json.loads(out.strip().splitlines()[-1])
+        extra = max(stats["peak_kb"] - stats["baseline_kb"], 0)
+        print(f"{variant:<10} {stats['uri_chars'] / 2**20:>8.1f} {stats['baseline_kb'] / 1024:>12.1f} "
+              f"{stats['peak_kb'] / 1024:>9.1f} {extra / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-request engine setup before and after EngineRegistry.
+
+"before" builds a fresh AgentOrchestrator per request (ImageOCR,
+EligibilityEngine with model unpickling, RecommendationEngine, env parsing);
+"after" fetches the orchestrator from a registry built once, including its
+periodic hot-reload check. Each variant is also timed end to end with a
+document-free AgentOrchestrator.run so the saving can be put in proportion
+to a whole (OCR-less) request.
+
+Usage:
+  python benchmarks/engine_registry_benchmark.py --iterations 500
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.agent_orchestrator import AgentOrchestrator  # noqa: E402
+from src.core.engine_registry import EngineRegistry  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+# sklearn version / feature-name warnings would otherwise flood the output
+warnings.filterwarnings("ignore")
+
+
+def time_per_call(fn, iterations: int) -> float:
+    """
+    Mean microseconds per call.
+    """
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request engine setup overhead")
+    parser.add_argument("--iterations", type=int, default=500, help="Simulated requests per variant")
+    args = parser.parse_args()
+
+    # Check for changes on every request: the worst case for the registry
+    os.environ["ENGINE_RELOAD_INTERVAL"] = "1e-9"
+    registry = EngineRegistry()
+
+    def request(orchestrator):
+        return orchestrator.run(applicant_id="bench", documents=[], income=1500.0, family_size=3)
+
+    rows = [
+        ("setup / before", time_per_call(AgentOrchestrator, args.iterations)),
+        ("setup / after", time_per_call(lambda: registry.snapshot().orchestrator, args.iterations)),
+        ("request / before", time_per_call(lambda: request(AgentOrchestrator()), args.iterations)),
+        ("request / after",
+         time_per_call(lambda: request(registry.snapshot().orchestrator), args.iterations)),
+    ]
+
+    print(f"{'variant':<20} {'us/request':>12}")
+    for label, us in rows:
+        print(f"{label:<20} {us:>12.1f}")
+    print(f"setup speedup: {rows[0][1] / rows[1][1]:.0f}x, "
+          f"request speedup: {rows[2][1] / rows[3][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget for the API process: `python -X importtime` over
+`import src.api.main`, in fresh interpreters without POSTGRES_URL (importing
+the app must not need, or connect to, the database).
+
+Reports the median total import time over --runs, the slowest top-level
+packages, and fails (exit status 1) when
+  - the median exceeds --budget-ms (default IMPORT_BUDGET_MS or 1500), or
+  - a dependency that should load on first use was imported eagerly.
+
+Usage:
+  python benchmarks/import_time_benchmark.py --runs 5 --budget-ms 1500
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+TARGET = "src.api.main"
+
+# Loaded on first use (PDF, URL download, chat, batch re-scoring, spreadsheets)
+DEFERRED = ("pandas", "PyPDF2", "pytesseract", "requests", "httpx", "sklearn", "openpyxl", "xlrd",
+            "boto3")
+
+_PROBE = (
+    "import sys; import {target}; "
+    "print(','.join(m for m in {deferred!r} if m in sys.modules))"
+)
+
+
+def run_once() -> Tuple[int, Dict[str, int], List[str]]:
+    """
+    :return: total microseconds, self-time per top-level package, deferred
+             modules that were imported
+    """
+    env = {k: v for k, v in os.environ.items() if k != "POSTGRES_URL"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(target=TARGET, deferred=DEFERRED)],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-2000:])
+        raise SystemExit(f"import {TARGET} failed")
+
+    total = 0
+    packages: Dict[str, int] = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        packages[name.split(".")[0]] += int(self_us)
+        if name == TARGET:
+            total = int(cumulative_us)
+    eager = [m for m in proc.stdout.strip().split(",") if m]
+    return total, packages, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget for the API process")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument(
+        "--budget-ms", type=float,
+        default=float(os.getenv("IMPORT_BUDGET_MS", "1500")),
+        help="Fail when the median import time exceeds this",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    args = parser.parse_args()
+
+    totals: List[int] = []
+    packages: Dict[str, List[int]] = defaultdict(list)
+    eager: set = set()
+    for _ in range(args.runs):
+        total, per_package, imported = run_once()
+        totals.append(total)
+        for name, us in per_package.items():
+            packages[name].append(us)
+        eager.update(imported)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"import {TARGET}: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {min(totals) / 1000:.0f}, max {max(totals) / 1000:.0f}), budget {args.budget_ms:.0f} ms")
+    print(f"{'package':<24} {'self ms':>8}")
+    slowest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+    for name, samples in slowest[:args.top]:
+        print(f"{name:<24} {statistics.median(samples) / 1000:>8.1f}")
+
+    failed = False
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(sorted(eager))}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: {median_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
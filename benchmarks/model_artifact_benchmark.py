@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Worker startup benchmark: EligibilityEngine loading a pickled sklearn model
+vs the JSON model artifact (src/models/artifact.py).
+
+A 2-feature LogisticRegression is fitted once and saved both ways, in
+separate directories. Each variant then runs in fresh subprocesses that
+import the engine, load the model and score one applicant, as an API worker
+does on its first request. The children report elapsed time (median over
+--repeats), resident memory and whether sklearn ended up imported.
+
+Usage:
+  python benchmarks/model_artifact_benchmark.py --repeats 5
+"""
+
+import sys
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+START = time.perf_counter()
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def child(model_path: str) -> None:
+    import logging
+    import warnings
+
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    from src.core.eligibility_engine import EligibilityEngine
+
+    engine = EligibilityEngine({"ELIGIBILITY_MODEL_PATH": model_path})
+    decision = engine.assess(1000.0, 4)
+    elapsed = time.perf_counter() - START
+    print(json.dumps({
+        "seconds": elapsed,
+        "rss_kb": _status_kb("VmRSS"),
+        "sklearn": "sklearn" in sys.modules,
+        "model": type(engine.model).__name__,
+        "decision": decision,
+    }))
+
+
+def build_models(root: Path) -> dict:
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from src.models.artifact import export_model
+
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.uniform(0, 8000, 2000), rng.integers(1, 9, 2000)])
+    y = (X[:, 0] * X[:, 1] < 8000).astype(int)
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+
+    paths = {}
+    for variant in ("pickle", "artifact"):
+        (root / variant).mkdir()
+        pkl = root / variant / "model.pkl"
+        pkl.write_bytes(pickle.dumps(model))
+        if variant == "artifact":
+            export_model(model, str(root / variant / "model.json"), feature_names=["income", "family_size"])
+        paths[variant] = str(pkl)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker startup time and RSS per model format")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh processes per variant")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_models(Path(tmp))
+        print(f"{'variant':<10} {'model':<22} {'startup ms':>11} {'RSS MB':>8} {'sklearn':>8}")
+        for variant, path in paths.items():
+            runs = []
+            for _ in range(args.repeats):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", path],
+                    check=True, capture_output=True, text=True, cwd=ROOT,
+                ).stdout
+                runs.append(json.loads(out.strip().splitlines()[-1]))
+            seconds = statistics.median(r["seconds"] for r in runs)
+            rss = statistics.median(r["rss_kb"] for r in runs)
+            print(f"{variant:<10} {runs[0]['model']:<22} {seconds * 1000:>11.0f} "
+                  f"{rss / 1024:>8.1f} {str(runs[0]['sklearn']):>8}")
+
+
+if __name__ == "__main__":
+    main()
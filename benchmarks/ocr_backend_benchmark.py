@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Throughput comparison of the OCR backends (pytesseract vs tesserocr).
+
+OCRs the sample images repeatedly on a single thread per backend and
+reports images per second. The first call per backend is excluded so engine
+start-up (loading the language data) is reported separately.
+
+Usage:
+  python benchmarks/ocr_backend_benchmark.py --images 50
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.ocr_backends import PytesseractBackend, TesserocrBackend  # noqa: E402
+from src.core.ocr_pool import get_preprocessor  # noqa: E402
+from PIL import Image  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("ocr_backend_benchmark")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SAMPLES = ["id_card.jpg", "utility_bill.png"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OCR backend throughput")
+    parser.add_argument("--images", type=int, default=50, help="Images OCR'd per backend")
+    args = parser.parse_args()
+
+    preprocess = get_preprocessor()
+    images = []
+    for name in SAMPLES:
+        with Image.open(REPO_ROOT / name) as img:
+            images.append(preprocess(img))
+
+    print(f"{'backend':<12} {'startup s':>10} {'images/s':>10}")
+    for backend_cls in (PytesseractBackend, TesserocrBackend):
+        try:
+            backend = backend_cls()
+            start = time.perf_counter()
+            backend.image_to_string(images[0], lang="eng", timeout=0)
+            startup = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for i in range(args.images):
+                backend.image_to_string(images[i % len(images)], lang="eng", timeout=0)
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            logger.error("%s unavailable: %s", backend_cls.name, e)
+            continue
+        print(f"{backend_cls.name:<12} {startup:>10.3f} {args.images / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark ImageOCR.extract_texts with an increasing number of pool workers.
+
+Builds a batch of data URIs from the sample id_card.jpg and utility_bill.png,
+OCRs it once per worker count and reports wall time and speedup relative to
+the sequential (1 worker) run.
+
+Usage:
+  python benchmarks/ocr_pool_benchmark.py --documents 10 --max-workers 8
+"""
+
+import os
+import sys
+import time
+import base64
+import logging
+import argparse
+import mimetypes
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.image_ocr import ImageOCR  # noqa: E402
+from src.core.ocr_pool import shutdown_pool  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+)
+logger = logging.getLogger("ocr_pool_benchmark")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_IMAGES = ["id_card.jpg", "utility_bill.png"]
+
+
+def load_documents(count: int) -> list:
+    """
+    Build `count` data URIs by cycling through the sample images.
+    """
+    samples = []
+    for name in SAMPLE_IMAGES:
+        path = REPO_ROOT / name
+        mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        b64 = base64.b64encode(path.read_bytes()).decode("utf-8")
+        samples.append(f"data:{mime};base64,{b64}")
+    return [samples[i % len(samples)] for i in range(count)]
+
+
+def run(documents: list, workers: int, repeat: int) -> float:
+    """
+    Return the best wall time over `repeat` runs with the given worker count.
+    """
+    os.environ["OCR_MAX_WORKERS"] = str(workers)
+    ocr = ImageOCR()
+    # Warm the pool so worker start-up is not billed to the first run
+    ocr.extract_texts(documents[:workers])
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        texts = ocr.extract_texts(documents)
+        best = min(best, time.perf_counter() - start)
+    if len(texts) != len(documents):
+        logger.warning("%d/%d documents OCR'd with %d workers", len(texts), len(documents), workers)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel OCR scaling")
+    parser.add_argument("--documents", type=int, default=10, help="Documents per request")
+    parser.add_argument(
+        "--max-workers", type=int, default=os.cpu_count() or 1,
+        help="Largest worker count to try (doubling from 1)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per worker count")
+    args = parser.parse_args()
+
+    documents = load_documents(args.documents)
+    worker_counts = []
+    n = 1
+    while n < args.max_workers:
+        worker_counts.append(n)
+        n *= 2
+    worker_counts.append(args.max_workers)
+
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    baseline = None
+    try:
+        for workers in worker_counts:
+            elapsed = run(documents, workers, args.repeat)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>7.2f}x")
+    finally:
+        shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
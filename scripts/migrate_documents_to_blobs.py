@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Move base64 data URIs stored in applications.raw_data into the blob store
+(configured like the API: BLOB_STORE, BLOB_STORE_DIR / BLOB_S3_*), leaving
+only blob references in the rows.
+
+Rows are streamed in application_id order and rewritten in chunks of
+--chunk-size, one bulk UPDATE per chunk. Rows without inline documents are
+left alone, so the migration can be interrupted and re-run at any time.
+Run VACUUM FULL (or pg_repack) on applications afterwards to give the
+space back to the operating system.
+
+Usage:
+  python scripts/migrate_documents_to_blobs.py --chunk-size 200
+"""
+
+import os
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+)
+logger = logging.getLogger("migrate_documents_to_blobs")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Move inline documents to the blob store")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("POSTGRES_URL"),
+        help="Database URL (default: POSTGRES_URL)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=200, help="Rows per fetch / bulk update")
+    parser.add_argument("--dry-run", action="store_true", help="Count rows to migrate without writing")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        logger.error("No database URL (set POSTGRES_URL or pass --database-url)")
+        sys.exit(1)
+
+    from sqlalchemy import create_engine, select, update
+    from sqlalchemy.orm import Session
+    from src.services.blob_store import get_blob_store, has_inline_documents, migrate_raw_data
+    from src.services.db import Application
+
+    store = get_blob_store()
+    if store is None:
+        logger.error("BLOB_STORE is disabled; nothing to migrate to")
+        sys.exit(1)
+
+    db_engine = create_engine(args.database_url, pool_pre_ping=True)
+    scanned = migrated = 0
+    try:
+        # Reads stream on one connection; each chunk's writes commit on another
+        with db_engine.connect() as reader, Session(db_engine) as writer:
+            query = select(Application.application_id, Application.raw_data).order_by(
+                Application.application_id
+            )
+            result = reader.execution_options(
+                stream_results=True, yield_per=args.chunk_size
+            ).execute(query)
+            for rows in result.partitions():
+                pending = [row for row in rows if has_inline_documents(row.raw_data)]
+                changes = [] if args.dry_run else [
+                    {"application_id": row.application_id, "raw_data": migrate_raw_data(store, row.raw_data)}
+                    for row in pending
+                ]
+                if changes:
+                    writer.execute(update(Application), changes)
+                    writer.commit()
+                scanned += len(rows)
+                migrated += len(pending)
+                logger.info(f"{scanned} scanned, {migrated} migrated (at {rows[-1].application_id})")
+    finally:
+        db_engine.dispose()
+    logger.info(f"Migrated {migrated} of {scanned} applications"
+                f"{' (dry run, nothing written)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Re-score stored applications with the current eligibility model / thresholds
+and recommendation rules, without repeating OCR.
+
+Engines are configured exactly like the API's (environment overlaid with
+ENGINE_CONFIG_PATH). Rows are streamed in chunks, re-assessed in batch and
+only changed rows are updated. Work is split into --workers id-range
+partitions run in separate processes.
+
+Progress is checkpointed under --checkpoint-dir after every committed chunk;
+re-running the same command after an interruption resumes where each
+partition stopped. The checkpoint is removed once every partition finished
+(use --restart to discard an unfinished one).
+
+Usage:
+  python scripts/rescore_applications.py --workers 4 --chunk-size 1000
+"""
+
+import os
+import sys
+import logging
+import argparse
+from pathlib import Path
+from functools import partial
+from multiprocessing import get_context
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+)
+logger = logging.getLogger("rescore_applications")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Re-score stored applications")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("POSTGRES_URL"),
+        help="Database URL (default: POSTGRES_URL)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes / partitions")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per fetch / bulk update")
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=os.getenv("RESCORE_CHECKPOINT_DIR", "data/rescore_checkpoint"),
+        help="Where the partition plan and progress are kept",
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        logger.error("No database URL (set POSTGRES_URL or pass --database-url)")
+        sys.exit(1)
+
+    from sqlalchemy import create_engine
+    from src.core.engine_registry import EngineRegistry
+    from src.services.rescoring import Checkpoint, plan_partitions, rescore_partition
+
+    # Same threshold / model / rules settings the API's EngineRegistry uses
+    settings = EngineRegistry().snapshot().settings
+
+    checkpoint = Checkpoint(args.checkpoint_dir)
+    if args.restart or args.dry_run:
+        partitions = None
+    else:
+        partitions = checkpoint.load_plan()
+    if partitions:
+        logger.info(f"Resuming {len(partitions)} partitions from {args.checkpoint_dir}")
+    else:
+        if not args.dry_run:
+            checkpoint.clear()
+        db_engine = create_engine(args.database_url)
+        try:
+            partitions = plan_partitions(db_engine, args.workers)
+        finally:
+            db_engine.dispose()
+        if not args.dry_run:
+            checkpoint.save_plan(partitions)
+
+    run = partial(
+        rescore_partition,
+        args.database_url,
+        checkpoint_dir=args.checkpoint_dir,
+        chunk_size=args.chunk_size,
+        dry_run=args.dry_run,
+        settings=settings,
+    )
+    if len(partitions) == 1:
+        results = [run(partitions[0])]
+    else:
+        # spawn: workers must not inherit the parent's DB connections
+        with get_context("spawn").Pool(processes=len(partitions)) as pool:
+            results = pool.map(run, partitions)
+
+    scanned = sum(r.scanned for r in results)
+    changed = sum(r.changed for r in results)
+    logger.info(f"Re-scored {scanned} applications, {changed} changed"
+                f"{' (dry run, nothing written)' if args.dry_run else ''}")
+    if not args.dry_run:
+        checkpoint.clear()
+
+
+if __name__ == "__main__":
+    main()
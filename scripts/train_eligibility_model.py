@@ -9,12 +9,16 @@ Reads a CSV with columns:
 
 Writes:
   - a scikit-learn model at ELIGIBILITY_MODEL_PATH
+  - its JSON artifact next to it (model.pkl → model.json), which
+    EligibilityEngine scores without importing scikit-learn
 """
 
 import os
 import sys
 import logging
 import argparse
+from datetime import datetime, timezone
+from pathlib import Path
 
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
@@ -22,6 +26,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 import joblib
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.models.artifact import ELIGIBILITY_FEATURES, artifact_path_for, export_model  # noqa: E402
+
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Logging Setup
@@ -50,6 +58,11 @@ def parse_args():
         default=os.getenv("ELIGIBILITY_MODEL_PATH", "src/models/eligibility_model.pkl"),
         help="Where to save the trained model",
     )
+    parser.add_argument(
+        "--artifact-path",
+        default=None,
+        help="Where to save the JSON model artifact (default: next to --model-path)",
+    )
     parser.add_argument(
         "--test-size",
         type=float,
@@ -80,7 +93,7 @@ def main():
         logger.exception("Failed to read CSV")
         sys.exit(1)
 
-    required_cols = {"income", "family_size", "eligible"}
+    required_cols = {*ELIGIBILITY_FEATURES, "eligible"}
     if not required_cols.issubset(df.columns):
         logger.error(
             "CSV missing required columns: %s (got %s)",
@@ -89,7 +102,7 @@ def main():
         sys.exit(1)
 
     # 2) Prepare features and labels
-    X = df[["income", "family_size"]].astype(float)
+    X = df[list(ELIGIBILITY_FEATURES)].astype(float)
     y = df["eligible"].astype(int)
 
     # 3) Split
@@ -119,6 +132,16 @@ def main():
     try:
         joblib.dump(model, args.model_path)
         logger.info("Model saved to %r", args.model_path)
+        export_model(
+            model,
+            args.artifact_path or artifact_path_for(args.model_path),
+            feature_names=ELIGIBILITY_FEATURES,
+            metadata={
+                "trained_at": datetime.now(timezone.utc).isoformat(),
+                "training_csv": os.path.basename(args.csv_path),
+                "training_rows": int(len(X_train)),
+            },
+        )
     except Exception:
         logger.exception("Failed to save model to disk")
         sys.exit(1)
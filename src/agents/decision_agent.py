@@ -7,6 +7,9 @@ from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# EligibilityEngine's label, plus the one older engines returned
+APPROVED = ("approved", "Approve")
+
 class DecisionAgent:
     def __init__(self):
         """
@@ -23,7 +26,8 @@ class DecisionAgent:
         """
         Produce a final decision based on eligibility and recommendation.
         
-        :param eligibility: result from EligibilityEngine ("Approve" or "Soft Decline")
+        :param eligibility: result from EligibilityEngine ("approved" or "declined";
+                            the legacy "Approve" / "Soft Decline" are accepted too)
         :param recommendation: text from RecommendationEngine
         :param processed_data: data from DocumentProcessor (for potential future use)
         :return: combined decision string
@@ -31,7 +35,7 @@ class DecisionAgent:
         try:
             logger.info("DecisionAgent: starting final decision assembly")
             
-            if eligibility == "Approve":
+            if eligibility in APPROVED:
                 decision = (
                     f"✅ APPROVED: Your application meets our criteria. {recommendation}"
                 )
@@ -7,6 +7,8 @@ from typing import Dict, Any
 
 from fastapi import HTTPException, status
 
+from src.core.deadline import FAILED
+
 logger = logging.getLogger(__name__)
 
 class ValidationAgent:
@@ -20,9 +22,13 @@ class ValidationAgent:
         """
         Perform validation on processed data.
         
+        Each document is an extraction result with its 'text', or a
+        per-document status ({"document_index", "status", "detail"}); a
+        document whose extraction failed fails validation.
+
         :param processed_data: data from DocumentProcessor
         :return: validated data (may be the same or enriched)
-        :raises HTTPException: if validation fails
+        :raises HTTPException: if validation fails (422 for a failed extraction)
         """
         try:
             logger.info("ValidationAgent: starting data validation")
@@ -42,9 +48,16 @@ class ValidationAgent:
                     detail="'documents' must be a list"
                 )
             
-            # Example check: ensure each document has 'text' key
+            # Example check: ensure each document has 'text' key (or a status)
             for idx, doc in enumerate(documents):
-                if "text" not in doc:
+                if doc.get("status") == FAILED:
+                    idx = doc.get("document_index", idx)
+                    logger.error(f"ValidationAgent: extraction of document {idx} failed: {doc.get('detail')}")
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail=f"Document index {idx} could not be extracted: {doc.get('detail') or 'failed'}"
+                    )
+                if "text" not in doc and "status" not in doc:
                     logger.error(f"ValidationAgent: document at index {idx} missing 'text'")
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
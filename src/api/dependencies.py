@@ -0,0 +1,36 @@
+"""
+Shared FastAPI dependencies.
+"""
+from fastapi import Request
+
+from src.core.agent_orchestrator import AgentOrchestrator
+from src.core.engine_registry import EngineRegistry
+from src.services.chat_history_buffer import ChatHistoryBuffer
+
+
+def get_engine_registry(request: Request) -> EngineRegistry:
+    """
+    The process-wide EngineRegistry created by the app lifespan.
+    """
+    registry = getattr(request.app.state, "engines", None)
+    if registry is None:
+        raise RuntimeError("EngineRegistry not initialised; is the app lifespan running?")
+    return registry
+
+
+def get_orchestrator(request: Request) -> AgentOrchestrator:
+    """
+    The orchestrator of the current engine snapshot (hot-reloaded when the
+    model or thresholds change).
+    """
+    return get_engine_registry(request).snapshot().orchestrator
+
+
+def get_chat_history_buffer(request: Request) -> ChatHistoryBuffer:
+    """
+    The write-behind ChatHistory buffer created by the app lifespan.
+    """
+    buffer = getattr(request.app.state, "chat_history", None)
+    if buffer is None:
+        raise RuntimeError("ChatHistoryBuffer not initialised; is the app lifespan running?")
+    return buffer
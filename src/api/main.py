@@ -1,5 +1,11 @@
 import logging
 import time
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+
+# Local .env before any module reads its settings (no-op in containers)
+load_dotenv()
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,7 +14,10 @@ from sqlalchemy.exc import OperationalError
 from src.api.routes.health import router as health_router
 from src.api.routes.chatbot import router as chatbot_router
 from src.api.routes.applications import router as application_router
-from src.services.db import Base, engine
+from src.core.engine_registry import EngineRegistry
+from src.core.stage_executor import shutdown_stage_executor
+from src.services.chat_history_buffer import ChatHistoryBuffer
+from src.services.db import Base, dispose_async_engine, get_engine
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -17,35 +26,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# ─── FastAPI App ──────────────────────────────────────────────────────────────
-app = FastAPI(
-    title="Social Support AI API",
-    version="1.0",
-    description="Eligibility & streaming chat service",
-)
-
-# ─── Enable CORS so Streamlit can call us ────────────────────────────────────
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# ─── Include Routers ──────────────────────────────────────────────────────────
-# Health at GET  /health/
-app.include_router(health_router, prefix="/health", tags=["Health"])
-# Chatbot at POST /chatbot/
-app.include_router(chatbot_router, prefix="/chatbot", tags=["Chatbot"])
-# Applications at POST /application/
-app.include_router(application_router, prefix="/application", tags=["Application"])
-
-# ─── Lifecycle Events ─────────────────────────────────────────────────────────
-@app.on_event("startup")
-async def on_startup():
-    logger.info("🚀 API startup — waiting for database to be ready")
+# ─── Lifespan ─────────────────────────────────────────────────────────────────
+def _wait_for_database() -> None:
     max_attempts = 10
     delay = 2  # seconds
+    engine = get_engine()
 
     # Wait for Postgres to accept connections
     for attempt in range(1, max_attempts + 1):
@@ -69,11 +54,57 @@ async def on_startup():
     # Create all tables defined in Base.metadata
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all skips existing tables; add indexes declared since
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         logger.info("✅ Database tables are ready")
     except Exception:
         logger.exception("❌ Failed to create database tables")
         raise
 
-@app.on_event("shutdown")
-async def on_shutdown():
-    logger.info("🛑 API shutdown")
\ No newline at end of file
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("🚀 API startup — waiting for database to be ready")
+    _wait_for_database()
+
+    # Decision engines are built once per process and shared by all requests
+    app.state.engines = EngineRegistry()
+    logger.info("✅ Decision engines loaded")
+
+    # Chat messages are written behind the chatbot responses, in batches
+    app.state.chat_history = ChatHistoryBuffer()
+    await app.state.chat_history.start()
+
+    yield
+
+    logger.info("🛑 API shutdown")
+    await app.state.chat_history.close()
+    shutdown_stage_executor()
+    await dispose_async_engine()
+
+
+# ─── FastAPI App ──────────────────────────────────────────────────────────────
+app = FastAPI(
+    title="Social Support AI API",
+    version="1.0",
+    description="Eligibility & streaming chat service",
+    lifespan=lifespan,
+)
+
+# ─── Enable CORS so Streamlit can call us ────────────────────────────────────
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# ─── Include Routers ──────────────────────────────────────────────────────────
+# Health at GET  /health/
+app.include_router(health_router, prefix="/health", tags=["Health"])
+# Chatbot at POST /chatbot/
+app.include_router(chatbot_router, prefix="/chatbot", tags=["Chatbot"])
+# Applications at POST /application/
+app.include_router(application_router, prefix="/application", tags=["Application"])
@@ -0,0 +1,36 @@
+"""
+Keyset pagination cursors for the list endpoints.
+
+A cursor is the sort key of the last row of a page, (timestamp, tiebreaker),
+as URL-safe base64 JSON. The next page is the rows after that key, read
+from the composite index, so each page costs the same however deep it is
+(unlike OFFSET). Cursors are opaque to clients.
+"""
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple, Union
+
+from fastapi import HTTPException, status
+
+Key = Union[str, int]
+
+
+def encode_cursor(timestamp: datetime, key: Key) -> str:
+    raw = json.dumps([timestamp.isoformat(), key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Key]:
+    """
+    :raises HTTPException: 400 if the cursor was not issued by encode_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, key = json.loads(raw)
+        if not isinstance(key, (str, int)):
+            raise ValueError(key)
+        return datetime.fromisoformat(timestamp), key
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
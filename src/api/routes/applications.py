@@ -1,26 +1,48 @@
 """
 Applications routes for Social Support AI API.
 """
+import os
+import csv
+import codecs
 import logging
 from uuid import uuid4
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from src.services.db import get_db_session, Applicant, Application
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
+from src.services.applicants import ensure_applicant
 from src.services.db import (
-    get_db_session,
-    Applicant,
+    get_async_db_session,
     Application,
 )
+from src.api.dependencies import get_engine_registry, get_orchestrator
+from src.api.pagination import decode_cursor, encode_cursor
 from src.core.agent_orchestrator import AgentOrchestrator
+from src.core.batch_eligibility import column_positions, iter_batch_decisions
+from src.core.deadline import Deadline
+from src.core.document_payload import DocumentPayload
+from src.core.engine_registry import EngineRegistry
+from src.core.stage_checkpoint import get_checkpoint_store
+from src.core.stage_executor import PipelineBusyError
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+try:
+    MAX_DOCUMENT_BYTES = int(os.getenv("MAX_DOCUMENT_BYTES", str(20 * 1024 * 1024)))
+except ValueError:
+    logger.error("Invalid MAX_DOCUMENT_BYTES; using default 20MB")
+    MAX_DOCUMENT_BYTES = 20 * 1024 * 1024
+
+# Re-runs of a documents PATCH whose application changed while it was processed
+PATCH_ATTEMPTS = 3
+
 # ----------------------------
 # Pydantic models
 # ----------------------------
@@ -29,12 +51,48 @@ class ApplicationRequest(BaseModel):
     income: float = Field(..., description="Applicant monthly income")
     family_size: int = Field(..., description="Number of family members")
     documents: List[str] = Field(..., description="Base64-encoded document data URIs")
+    application_id: Optional[str] = Field(
+        None, max_length=128,
+        description="Client-chosen application ID; retrying a failed submission with "
+                    "the same ID resumes its processing instead of starting over"
+    )
+
+class DocumentsPatch(BaseModel):
+    documents: List[str] = Field(
+        ..., min_length=1, description="Base64-encoded data URIs of the documents to add"
+    )
+
+class DocumentStatus(BaseModel):
+    document_index: int = Field(..., description="Position of the document in the request")
+    status: str = Field(..., description="complete, partial, deferred, failed or skipped")
+    detail: Optional[str] = Field(None, description="Why the document was not fully processed")
 
 class ApplicationResponse(BaseModel):
     application_id: str = Field(..., description="Generated application record ID")
     eligibility: str = Field(..., description="Eligibility decision")
     recommendation: str = Field(..., description="Enablement recommendation")
     final_decision: str = Field(..., description="Combined final decision message")
+    documents: List[DocumentStatus] = Field(
+        default_factory=list, description="Per-document processing status"
+    )
+
+class ApplicationSummary(BaseModel):
+    application_id: str
+    applicant_id: str
+    income: float
+    family_size: int
+    eligibility: str
+    recommendation: str
+    created_at: datetime
+    raw_data: Optional[Dict[str, Any]] = Field(
+        None, description="Stored documents and processed data (only if include_raw_data)"
+    )
+
+class ApplicationPage(BaseModel):
+    items: List[ApplicationSummary]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to get the next page; null on the last page"
+    )
 
 # ----------------------------
 # Routes
@@ -44,62 +102,314 @@ class ApplicationResponse(BaseModel):
 )
 async def submit_application(
     req: ApplicationRequest,
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session),
+    orchestrator: AgentOrchestrator = Depends(get_orchestrator)
 ) -> ApplicationResponse:
     """
     Submit a social support application.
     """
+    deadline = Deadline.from_env()
     logger.info(f"Received application for applicant {req.applicant_id}")
+    return await _process_application(
+        db, orchestrator, req.applicant_id, req.income, req.family_size, req.documents, deadline,
+        req.application_id
+    )
+
+
+@router.post(
+    "/upload", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED
+)
+async def submit_application_upload(
+    applicant_id: str = Form(..., description="Unique applicant identifier"),
+    income: float = Form(..., description="Applicant monthly income"),
+    family_size: int = Form(..., description="Number of family members"),
+    documents: List[UploadFile] = File(default=[], description="Supporting documents"),
+    application_id: Optional[str] = Form(
+        None, max_length=128, description="Client-chosen application ID (makes retries resume)"
+    ),
+    db: AsyncSession = Depends(get_async_db_session),
+    orchestrator: AgentOrchestrator = Depends(get_orchestrator)
+) -> ApplicationResponse:
+    """
+    Submit a social support application as multipart/form-data.
+
+    Files are streamed to spooled temporary files by the multipart parser and
+    handed to the pipeline as file objects, so they are never base64-encoded
+    or held in memory as a whole.
+    """
+    deadline = Deadline.from_env()
+    logger.info(f"Received upload application for applicant {applicant_id} ({len(documents)} files)")
+    payloads = [_upload_payload(upload) for upload in documents]
+    return await _process_application(
+        db, orchestrator, applicant_id, income, family_size, payloads, deadline, application_id
+    )
+
+
+@router.post(
+    "/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}}}},
+)
+async def assess_application_batch(
+    file: UploadFile = File(..., description="CSV with applicant_id, income, family_size columns"),
+    registry: EngineRegistry = Depends(get_engine_registry)
+) -> StreamingResponse:
+    """
+    Screen a CSV of applicants for eligibility.
+
+    Rows are scored in vectorised chunks and streamed back as CSV
+    (applicant_id, income, family_size, eligibility). Nothing is persisted.
+    """
+    rows = csv.reader(codecs.iterdecode(file.file, "utf-8-sig"))
+    try:
+        positions = column_positions(next(rows, []))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    # One snapshot for the whole batch, so a reload mid-stream cannot mix models
+    engine = registry.snapshot().eligibility_engine
+    logger.info(f"Streaming batch eligibility for {file.filename}")
+    return StreamingResponse(
+        iter_batch_decisions(engine, rows, positions),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="eligibility.csv"'},
+    )
+
+
+# Unset fields are left out: raw_data unless it was asked for (next_cursor is always set)
+@router.get("/", response_model=ApplicationPage, response_model_exclude_unset=True)
+async def list_applications(
+    applicant_id: str = Query(..., description="Applicant whose applications to list"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    include_raw_data: bool = Query(False, description="Also return the (large) raw_data JSON"),
+    db: AsyncSession = Depends(get_async_db_session),
+) -> ApplicationPage:
+    """
+    List an applicant's applications, newest first.
+
+    Pages are read from the (applicant_id, created_at) index by keyset, and
+    raw_data is only loaded when asked for.
+    """
+    columns = [
+        Application.application_id, Application.applicant_id, Application.income,
+        Application.family_size, Application.eligibility, Application.recommendation,
+        Application.created_at,
+    ]
+    if include_raw_data:
+        columns.append(Application.raw_data)
+    query = select(*columns).where(Application.applicant_id == applicant_id)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(Application.created_at, Application.application_id) < (created_at, last_id)
+        )
+    rows = (await db.execute(
+        query.order_by(Application.created_at.desc(), Application.application_id.desc())
+        .limit(limit + 1)
+    )).all()
+
+    items = [ApplicationSummary(**row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.application_id)
+    return ApplicationPage(items=items, next_cursor=next_cursor)
+
+
+@router.patch("/{application_id}/documents", response_model=ApplicationResponse)
+async def add_application_documents(
+    application_id: str,
+    req: DocumentsPatch,
+    db: AsyncSession = Depends(get_async_db_session),
+    orchestrator: AgentOrchestrator = Depends(get_orchestrator)
+) -> ApplicationResponse:
+    """
+    Add documents to a submitted application.
+
+    Only the new documents are processed; their results are merged into the
+    stored processed_data and eligibility, recommendation and final decision
+    are re-derived from the merged data, so the cost follows the size of the
+    change rather than of the application. The row is only locked to write
+    the result; if another request changed it meanwhile, the documents are
+    processed again on top of that change.
+    """
+    deadline = Deadline.from_env()
+    query = select(Application).where(Application.application_id == application_id)
+    logger.info(f"Adding {len(req.documents)} documents to application {application_id}")
 
     try:
-        # 1) Ensure applicant exists
-        applicant = db.query(Applicant).get(req.applicant_id)
-        if not applicant:
-            applicant = Applicant(
-                applicant_id=req.applicant_id,
-                demographic={},  # you could populate from context if available
+        for attempt in range(1, PATCH_ATTEMPTS + 1):
+            application = (await db.execute(query)).scalar_one_or_none()
+            if application is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application not found")
+            stored = dict(application.raw_data or {})
+            applicant_id = application.applicant_id
+            income, family_size = application.income, application.family_size
+            # No connection or lock is held while the documents are processed
+            await db.rollback()
+
+            result = await orchestrator.run_incremental_async(
+                applicant_id=applicant_id,
+                processed_data=stored,
+                new_documents=req.documents,
+                income=income,
+                family_size=family_size,
+                deadline=deadline
+            )
+
+            # Row lock for the write: concurrent additions must not lose documents
+            application = (await db.execute(query.with_for_update())).scalar_one_or_none()
+            if application is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application not found")
+            if (application.raw_data or {}) == stored:
+                break
+            # Changed by a concurrent request: redo on top of its result (the
+            # documents' OCR is cached by then)
+            await db.rollback()
+            logger.info(f"Application {application_id} changed during processing (attempt {attempt})")
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Application is being updated concurrently, please retry"
             )
-            db.add(applicant)
-            db.flush()  # ensure applicant_id is present
-
-        # 2) Run business logic
-        orchestrator = AgentOrchestrator()
-        result = orchestrator.run(
-            applicant_id=req.applicant_id,
-            documents=req.documents,
-            income=req.income,
-            family_size=req.family_size
+
+        processed_data = result.get("processed_data", {})
+        application.eligibility = result["eligibility"]
+        application.recommendation = result["recommendation"]
+        # A new dict, so the JSON column is flagged as changed
+        application.raw_data = dict(processed_data)
+        await db.commit()
+        logger.info(f"Application {application_id} updated")
+
+        return ApplicationResponse(
+            application_id=application_id,
+            eligibility=result["eligibility"],
+            recommendation=result["recommendation"],
+            final_decision=result["final_decision"],
+            documents=processed_data.get("document_status", [])
+        )
+
+    except PipelineBusyError as e:
+        logger.warning(f"Rejecting documents for application {application_id}: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many applications in progress, please retry shortly",
+            headers={"Retry-After": "5"}
         )
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception:
+        logger.exception("Error adding documents to application")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to process documents"
+        )
+
 
-        # 3) Persist application record
-        app_id = str(uuid4())
+def _upload_payload(upload: UploadFile) -> DocumentPayload:
+    """
+    Wrap an uploaded file for the pipeline, enforcing MAX_DOCUMENT_BYTES.
+    """
+    size = upload.size
+    if size is None:
+        upload.file.seek(0, os.SEEK_END)
+        size = upload.file.tell()
+    if size > MAX_DOCUMENT_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"{upload.filename} exceeds {MAX_DOCUMENT_BYTES} bytes"
+        )
+    return DocumentPayload(
+        body=upload.file, mime=upload.content_type, size=size, name=upload.filename
+    )
+
+
+async def _process_application(
+    db: AsyncSession,
+    orchestrator: AgentOrchestrator,
+    applicant_id: str,
+    income: float,
+    family_size: int,
+    documents: List[Union[str, DocumentPayload]],
+    deadline: Deadline,
+    application_id: Optional[str] = None,
+) -> ApplicationResponse:
+    """
+    Run the pipeline and store the application.
+
+    Pipeline stages are checkpointed under the application ID, so a retry
+    with the same ID after a failure (including a failed commit) resumes
+    after the last completed stage; the checkpoint is dropped once stored.
+    """
+    app_id = application_id or str(uuid4())
+    if application_id and await db.get(Application, application_id) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Application {application_id} already exists"
+        )
+    try:
+        # 1) Ensure applicant exists; committed now, so that no connection or
+        #    row lock is held while the pipeline runs
+        await ensure_applicant(db, applicant_id)
+        await db.commit()
+
+        # 2) Run business logic (engines shared via the EngineRegistry; the
+        #    blocking stages run on the bounded pipeline executor)
+        result = await orchestrator.run_async(
+            applicant_id=applicant_id,
+            documents=documents,
+            income=income,
+            family_size=family_size,
+            deadline=deadline,
+            # Generated IDs are never retried, so only client IDs are checkpointed
+            application_id=application_id
+        )
+
+        # 3) Persist application record; processed_data records the documents
+        #    as blob references (or upload metadata), never their contents
         application = Application(
             application_id=app_id,
-            applicant_id=req.applicant_id,
-            income=req.income,
-            family_size=req.family_size,
+            applicant_id=applicant_id,
+            income=income,
+            family_size=family_size,
             eligibility=result["eligibility"],
             recommendation=result["recommendation"],
-            raw_data={
-                "documents": req.documents,
-                **result.get("processed_data", {})
-            }
+            raw_data=dict(result.get("processed_data", {}))
         )
         db.add(application)
-        db.commit()
+        await db.commit()
+        if application_id:
+            get_checkpoint_store().clear(application_id)
         logger.info(f"Application {app_id} saved to database")
 
         return ApplicationResponse(
             application_id=app_id,
             eligibility=result["eligibility"],
             recommendation=result["recommendation"],
-            final_decision=result["final_decision"]
+            final_decision=result["final_decision"],
+            documents=result.get("processed_data", {}).get("document_status", [])
         )
 
+    except PipelineBusyError as e:
+        logger.warning(f"Rejecting application for applicant {applicant_id}: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many applications in progress, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    except HTTPException:
+        # e.g. ValidationAgent rejecting the extracted data
+        await db.rollback()
+        raise
     except Exception:
         logger.exception("Error processing application")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process application"
-        )
\ No newline at end of file
+        )
@@ -1,14 +1,21 @@
 import os
 import uuid
 import logging
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, Query, status, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services.db import get_db_session, Applicant, ChatHistory
+from src.api.dependencies import get_chat_history_buffer
+from src.api.pagination import decode_cursor, encode_cursor
+from src.services.chat_history_buffer import ChatHistoryBuffer
+from src.services.applicants import ensure_applicant
+from src.services.db import get_async_db_session, ChatHistory
 from src.services.llm_host import LLMClient
 
 logger = logging.getLogger(__name__)
@@ -26,44 +33,45 @@ class ChatResponse(BaseModel):
     session_id: str = Field(..., description="Chat session identifier")
 
 
+class ChatMessage(BaseModel):
+    role: str
+    message: str
+    timestamp: datetime
+
+
+class ChatSessionPage(BaseModel):
+    session_id: str
+    messages: List[ChatMessage]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to get the next page; null on the last page"
+    )
+
+
 @router.post("/", response_model=ChatResponse, summary="Chat with the LLM")
 async def chat(
     request: Request,
     chat_req: ChatRequest,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
+    history: ChatHistoryBuffer = Depends(get_chat_history_buffer),
 ):
     # 1) Initialize LLM client from env
     llm_host_url = os.getenv("LLM_HOST_URL", "http://llm:11434")
     llm_client = LLMClient(llm_host_url)
     #llm_client = LLMClient()
 
-    # 2) Ensure applicant record exists
-    applicant = db.query(Applicant).get(chat_req.user_id)
-    if not applicant:
-        logger.info(f"Creating new applicant for ID {chat_req.user_id}")
-        applicant = Applicant(applicant_id=chat_req.user_id, demographic={})
-        db.add(applicant)
-        db.commit()
+    # 2) Ensure applicant record exists (committed before the buffered
+    #    history rows referencing it are flushed)
+    if await ensure_applicant(db, chat_req.user_id):
+        await db.commit()
 
-    # 3) Persist the user message
+    # 3) Record the user message (written behind the response, in batches)
     session_id = str(uuid.uuid4())
-    try:
-        db.add(
-            ChatHistory(
-                session_id=session_id,
-                applicant_id=chat_req.user_id,
-                role="user",
-                message=chat_req.messages[-1],
-            )
-        )
-        db.commit()
-    except Exception:
-        logger.exception("❌ Failed to write user message to chat_history")
-        db.rollback()
+    await history.append(session_id, chat_req.user_id, "user", chat_req.messages[-1])
 
-    # 4) Call LLM
+    # 4) Call LLM (a blocking HTTP call, kept off the event loop)
     try:
-        responses, llm_session_id = llm_client.chat(
+        responses, llm_session_id = await run_in_threadpool(
+            llm_client.chat,
             user_id=chat_req.user_id,
             messages=chat_req.messages,
             context=chat_req.context,
@@ -77,24 +85,47 @@ async def chat(
             detail="Unexpected error calling LLM",
         )
 
-    # 5) Persist the assistant’s reply
+    # 5) Record the assistant’s reply
     full_response = responses[0] if responses else ""
-    try:
-        db.add(
-            ChatHistory(
-                session_id=session_id,
-                applicant_id=chat_req.user_id,
-                role="assistant",
-                message=full_response,
-            )
-        )
-        db.commit()
-    except Exception:
-        logger.exception("❌ Failed to write assistant reply to chat_history")
-        db.rollback()
+    await history.append(session_id, chat_req.user_id, "assistant", full_response)
 
     # 6) Return a single JSON payload
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={"responses": responses, "session_id": session_id},
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/sessions/{session_id}", response_model=ChatSessionPage, summary="Read a chat session")
+async def get_chat_session(
+    session_id: str,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db_session),
+) -> ChatSessionPage:
+    """
+    A session's messages, oldest first, paged by keyset over the
+    (session_id, timestamp) index. Messages are written behind the chat
+    responses, so the latest ones appear after the next buffer flush.
+    """
+    query = select(
+        ChatHistory.id, ChatHistory.role, ChatHistory.message, ChatHistory.timestamp
+    ).where(ChatHistory.session_id == session_id)
+    if cursor:
+        timestamp, last_id = decode_cursor(cursor)
+        query = query.where(tuple_(ChatHistory.timestamp, ChatHistory.id) > (timestamp, last_id))
+    rows = (await db.execute(
+        query.order_by(ChatHistory.timestamp, ChatHistory.id).limit(limit + 1)
+    )).all()
+    if not rows and not cursor:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+    return ChatSessionPage(
+        session_id=session_id,
+        messages=[ChatMessage(role=r.role, message=r.message, timestamp=r.timestamp) for r in rows[:limit]],
+        next_cursor=next_cursor,
+    )
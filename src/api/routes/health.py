@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from src.api.dependencies import get_chat_history_buffer
+from src.services.chat_history_buffer import ChatHistoryBuffer
 
 router = APIRouter()
 
@@ -7,4 +10,12 @@ async def health():
     """
     Simple health endpoint.
     """
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get("/chat-history", summary="Chat history write buffer metrics")
+async def chat_history_stats(history: ChatHistoryBuffer = Depends(get_chat_history_buffer)):
+    """
+    Depth and flush latency of the write-behind ChatHistory buffer.
+    """
+    return history.stats()
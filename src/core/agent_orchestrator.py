@@ -1,63 +1,436 @@
+import re
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple, Union
 
+from src.agents.decision_agent import DecisionAgent
+from src.agents.extractor_agent import ExtractorAgent
+from src.agents.validation_agent import ValidationAgent
+from src.core.data_uri import parse_header
+from src.core.deadline import COMPLETE, FAILED, TIMEOUT, Deadline, DocumentResult
+from src.core.document_payload import DocumentPayload
+from src.core.document_processor import DocumentProcessor
 from src.core.image_ocr import ImageOCR
 from src.core.eligibility_engine import EligibilityEngine
 from src.core.recommendation_engine import RecommendationEngine
+from src.core.stage_checkpoint import StageCheckpointStore, get_checkpoint_store, input_hash
+from src.core.stage_executor import StageExecutor, get_stage_executor
+from src.services.blob_store import BlobStore, store_document
+from src.core.structured_extractors import (
+    EmploymentRecord,
+    FinancialSummary,
+    ResumeData,
+    extract_financial,
+    financial_format,
+    parse_resume,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+Document = Union[str, DocumentPayload]
+# (original document index, document) pairs routed to one stage
+RoutedDocuments = List[Tuple[int, Document]]
+# Mutates the pipeline state: processed_data, eligibility, recommendation, final_decision
+Stage = Callable[[Dict[str, Any], str, float, int], None]
+
+# Named pipeline stages, in order; a checkpoint records which have completed
+DOCUMENTS_STAGE = "documents"
+STAGES = (DOCUMENTS_STAGE, "validation", "extraction", "eligibility", "recommendation", "decision")
+# State key listing the stages that fell back to a default result
+DEGRADED = "degraded"
+
+_RESUME_NAME = re.compile(r"resume|(^|[^a-z])cv([^a-z]|$)")
+
+
 class AgentOrchestrator:
     """
     Orchestrates:
-      1) OCR on images (skipping non-images)
-      2) Eligibility check
-      3) Recommendation
-      4) Final decision
+      1) Document stages, independent of each other:
+         - OCR on images / PDFs (skipping non-images)
+         - resume parsing (documents named like a resume / CV)
+         - financial statement parsing (CSV / Excel)
+      2) Validation (ValidationAgent) and field extraction (ExtractorAgent)
+      3) Eligibility check
+      4) Recommendation
+      5) Final decision (DecisionAgent)
+
+    run() executes the stages one after another; run_async() runs the
+    document stages concurrently on the bounded StageExecutor so async routes
+    never block the event loop, and can checkpoint every stage so a retried
+    application resumes where it failed. run_incremental_async() adds
+    documents to an application that was already processed.
     """
 
-    def __init__(self):
-        self.ocr = ImageOCR()
-        self.eligibility_engine = EligibilityEngine()
-        self.recommendation_engine = RecommendationEngine()
+    def __init__(
+        self,
+        ocr: Optional[ImageOCR] = None,
+        eligibility_engine: Optional[EligibilityEngine] = None,
+        recommendation_engine: Optional[RecommendationEngine] = None,
+        document_processor: Optional[DocumentProcessor] = None,
+        validation_agent: Optional[ValidationAgent] = None,
+        extractor_agent: Optional[ExtractorAgent] = None,
+        decision_agent: Optional[DecisionAgent] = None,
+        blob_store: Optional[BlobStore] = None
+    ):
+        # Engines are normally injected from the process-wide EngineRegistry;
+        # building them here re-reads env and the model file.
+        self.ocr = ocr or ImageOCR()
+        self.eligibility_engine = eligibility_engine or EligibilityEngine()
+        self.recommendation_engine = recommendation_engine or RecommendationEngine()
+        self.document_processor = document_processor or DocumentProcessor(
+            ocr_language=self.ocr.ocr_language
+        )
+        self.validation_agent = validation_agent or ValidationAgent()
+        self.extractor_agent = extractor_agent or ExtractorAgent()
+        self.decision_agent = decision_agent or DecisionAgent()
+        # Without a blob store, uploaded files are recorded by metadata and
+        # data URIs as they are
+        self.blob_store = blob_store
 
     def run(
         self,
         applicant_id: str,
-        documents: List[str],
+        documents: List[Document],
         income: float,
-        family_size: int
+        family_size: int,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
-        processed_data: Dict[str, Any] = {}
-        processed_data["documents"] = documents
+        # Request-level time budget for document processing
+        deadline = deadline or Deadline.from_env()
+        ocr_docs, resume_docs, financial_docs = self._route_documents(documents)
+
+        ocr_results = self._ocr_stage(ocr_docs, deadline)
+        resume_stage = self._resume_stage(resume_docs, applicant_id, deadline)
+        financial_stage = self._financial_stage(financial_docs, applicant_id, deadline)
+
+        processed_data = self._collect(
+            self._store_documents(documents), ocr_results, resume_stage, financial_stage
+        )
+        return self._decide(applicant_id, income, family_size, processed_data)
+
+    async def run_async(
+        self,
+        applicant_id: str,
+        documents: List[Document],
+        income: float,
+        family_size: int,
+        deadline: Optional[Deadline] = None,
+        executor: Optional[StageExecutor] = None,
+        application_id: Optional[str] = None,
+        checkpoints: Optional[StageCheckpointStore] = None
+    ) -> Dict[str, Any]:
+        """
+        Like run(), with the document stages running concurrently on the
+        bounded executor.
+
+        With an application_id, the state after each stage is checkpointed
+        (keyed by the ID and a hash of the inputs) and a retry of a failed
+        application resumes after the last completed stage.
+
+        :param checkpoints: checkpoint store (default: the process-wide one)
+        :raises PipelineBusyError: if the executor cannot admit another request
+        """
+        deadline = deadline or Deadline.from_env()
+        executor = executor or get_stage_executor()
+        checkpoints = checkpoints or get_checkpoint_store()
+        async with executor.admit():
+            key: Optional[str] = None
+            completed: List[str] = []
+            state: Dict[str, Any] = {}
+            if application_id and checkpoints.enabled:
+                # Hashing reads uploaded files, so it runs off the event loop
+                key = await executor.run(input_hash, applicant_id, income, family_size, documents)
+                completed, state = await executor.run(checkpoints.load, application_id, key)
+                if completed:
+                    logger.info(f"Resuming application {application_id} after stage {completed[-1]!r}")
+
+            def checkpoint(name: str, state: Dict[str, Any]) -> None:
+                completed.append(name)
+                if key is not None:
+                    checkpoints.save(application_id, key, completed, state)
 
-        # 1) OCR (skip non-images)
+            if DOCUMENTS_STAGE not in completed:
+                state = {"processed_data": await self._document_stages(
+                    documents, applicant_id, deadline, executor
+                )}
+                await executor.run(checkpoint, DOCUMENTS_STAGE, state)
+            return await executor.run(
+                self._run_stages, state, applicant_id, income, family_size, completed, checkpoint
+            )
+
+    async def run_incremental_async(
+        self,
+        applicant_id: str,
+        processed_data: Dict[str, Any],
+        new_documents: List[Document],
+        income: float,
+        family_size: int,
+        deadline: Optional[Deadline] = None,
+        executor: Optional[StageExecutor] = None
+    ) -> Dict[str, Any]:
+        """
+        Add documents to an application processed before.
+
+        Only `new_documents` go through the document stages; their results
+        are merged into the stored processed_data (new documents are numbered
+        after the existing ones). Eligibility, recommendation and final
+        decision are recomputed with the current engines: a stored decision
+        may predate a model or threshold reload, or a rescore.
+
+        :param processed_data: processed_data stored for the application
+        :raises PipelineBusyError: if the executor cannot admit another request
+        """
+        deadline = deadline or Deadline.from_env()
+        executor = executor or get_stage_executor()
+        async with executor.admit():
+            added = await self._document_stages(
+                new_documents, applicant_id, deadline, executor,
+                offset=len(processed_data.get("documents") or [])
+            )
+            merged = self._merge(processed_data, added)
+            return await executor.run(self._decide, applicant_id, income, family_size, merged)
+
+    async def _document_stages(
+        self,
+        documents: List[Document],
+        applicant_id: str,
+        deadline: Deadline,
+        executor: StageExecutor,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        ocr_docs, resume_docs, financial_docs = self._route_documents(documents, offset)
+        ocr_results, resume_stage, financial_stage = await asyncio.gather(
+            executor.run(self._ocr_stage, ocr_docs, deadline),
+            executor.run(self._resume_stage, resume_docs, applicant_id, deadline),
+            executor.run(self._financial_stage, financial_docs, applicant_id, deadline),
+        )
+        # Not concurrently with the stages: they share uploaded files' positions
+        stored = await executor.run(self._store_documents, documents)
+        return self._collect(stored, ocr_results, resume_stage, financial_stage)
+
+    # ─── Document stages ──────────────────────────────────────────────────
+    @staticmethod
+    def _route_documents(
+        documents: List[Document], offset: int = 0
+    ) -> Tuple[RoutedDocuments, RoutedDocuments, RoutedDocuments]:
+        """
+        Split documents into OCR, resume and financial-statement stages by
+        name / MIME type (never by scanning a data URI's payload).
+
+        :param offset: index of the first document within the application
+        """
+        ocr_docs: RoutedDocuments = []
+        resume_docs: RoutedDocuments = []
+        financial_docs: RoutedDocuments = []
+        for idx, doc in enumerate(documents, offset):
+            name, mime = _name_and_mime(doc)
+            if financial_format(name, mime):
+                financial_docs.append((idx, doc))
+            elif _RESUME_NAME.search(name):
+                resume_docs.append((idx, doc))
+            else:
+                ocr_docs.append((idx, doc))
+        return ocr_docs, resume_docs, financial_docs
+
+    def _ocr_stage(self, docs: RoutedDocuments, deadline: Deadline) -> List[DocumentResult]:
+        if not docs:
+            return []
         try:
-            ocr_texts = self.ocr.extract_texts(documents)
-            processed_data["ocr_texts"] = ocr_texts
-        except Exception as e:
+            results = self.ocr.extract_documents([doc for _, doc in docs], deadline)
+        except Exception:
             logger.exception("❌ OCR processing failed; continuing without OCR")
-            processed_data["ocr_texts"] = []
-            resume_data = {}
-            financial_data = {}
-            
-            for doc, text in zip(documents, text):
-                if "resume" in doc.lower():
-                     resume_data = self.doc_processor.parse_resume(text)
-                elif doc.lower().endswith(('.csv', '.xls', '.xlsx')):
-                    with open(doc, 'rb') as f:
-                        financial_data = self.doc_processor.parse_financial_csv(f.read())
-
-            processed_data["resume_data"] = resume_data
-            processed_data["financial_data"] = financial_data
-        
-        except Exception as e:
-            logger.exception("❌ OCR and structured parsing step encountered an issue for applicant %r", applicant_id)
-            raise RuntimeError("OCR or parsing failed") from e
-
-
-        # 2) Eligibility
+            return [DocumentResult(idx, FAILED, detail="OCR failed") for idx, _ in docs]
+        # Back to the document's position in the request
+        for (idx, _), result in zip(docs, results):
+            result.index = idx
+        return results
+
+    def _resume_stage(
+        self, docs: RoutedDocuments, applicant_id: str, deadline: Deadline
+    ) -> Tuple[Dict[str, Any], List[str], List[DocumentResult]]:
+        """
+        Extract and parse resumes.
+
+        :return: merged resume data, resume texts and per-document results
+        """
+        resume_data: Dict[str, Any] = {}
+        texts: List[str] = []
+        results: List[DocumentResult] = []
+        if not docs:
+            return resume_data, texts, results
+
+        processed = self.document_processor.process([doc for _, doc in docs], applicant_id, deadline)
+        extracted = {d["document_index"]: d["text"] for d in processed["documents"]}
+        history: List[EmploymentRecord] = []
+        for position, (idx, _) in enumerate(docs):
+            status = processed["document_status"][position]
+            results.append(DocumentResult(idx, status["status"], detail=status["detail"]))
+            if position in extracted:
+                texts.append(extracted[position])
+                history.extend(parse_resume(extracted[position]).employment_history)
+        resume_data = ResumeData(history).to_dict()
+        return resume_data, texts, results
+
+    def _financial_stage(
+        self, docs: RoutedDocuments, applicant_id: str, deadline: Deadline
+    ) -> Tuple[Dict[str, Any], List[DocumentResult]]:
+        """
+        Parse financial statements (assets / liabilities), summed across documents.
+        """
+        total = FinancialSummary()
+        results: List[DocumentResult] = []
+        for idx, doc in docs:
+            try:
+                payload = doc if isinstance(doc, DocumentPayload) else self.document_processor.open_document(
+                    doc, deadline
+                )
+                try:
+                    summary = extract_financial(payload, financial_format(*_name_and_mime(doc)))
+                finally:
+                    if payload is not doc:
+                        payload.close()
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Time budget exhausted while downloading financial document %d for %r", idx, applicant_id
+                )
+                results.append(DocumentResult(idx, TIMEOUT, detail="time budget exhausted while downloading"))
+                continue
+            except Exception:
+                logger.exception("❌ Financial document %d for applicant %r could not be read", idx, applicant_id)
+                results.append(DocumentResult(idx, FAILED, detail="could not read document"))
+                continue
+            total.total_assets += summary.total_assets
+            total.total_liabilities += summary.total_liabilities
+            results.append(DocumentResult(idx, COMPLETE))
+        financial_data: Dict[str, Any] = total.to_dict() if docs else {}
+        return financial_data, results
+
+    def _store_documents(self, documents: List[Document]) -> List[Any]:
+        """
+        What processed_data records for each document: a blob reference, or
+        (without a blob store) upload metadata / the document string.
+        """
+        if self.blob_store is None:
+            return [doc.describe() if isinstance(doc, DocumentPayload) else doc for doc in documents]
+        return [store_document(self.blob_store, doc) for doc in documents]
+
+    @staticmethod
+    def _collect(
+        stored_documents: List[Any],
+        ocr_results: List[DocumentResult],
+        resume_stage: Tuple[Dict[str, Any], List[str], List[DocumentResult]],
+        financial_stage: Tuple[Dict[str, Any], List[DocumentResult]]
+    ) -> Dict[str, Any]:
+        resume_data, resume_texts, resume_results = resume_stage
+        financial_data, financial_results = financial_stage
+        statuses = sorted(
+            ocr_results + resume_results + financial_results, key=lambda r: r.index
+        )
+
+        processed_data: Dict[str, Any] = {}
+        processed_data["documents"] = stored_documents
+        processed_data["ocr_texts"] = [
+            r.text for r in ocr_results if r.text is not None
+        ] + resume_texts
+        processed_data["document_status"] = [r.describe() for r in statuses]
+        processed_data["resume_data"] = resume_data
+        processed_data["financial_data"] = financial_data
+        return processed_data
+
+    @staticmethod
+    def _merge(stored: Dict[str, Any], added: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        processed_data for the stored documents plus the added ones.
+        """
+        merged = dict(stored)
+        for key in ("documents", "ocr_texts", "document_status"):
+            merged[key] = list(stored.get(key) or []) + added[key]
+
+        stored_resume, added_resume = stored.get("resume_data") or {}, added["resume_data"]
+        if stored_resume or added_resume:
+            history = stored_resume.get("employment_history", []) + added_resume.get("employment_history", [])
+            merged["resume_data"] = {"employment_history": history, "employment_count": len(history)}
+
+        stored_financial, added_financial = stored.get("financial_data") or {}, added["financial_data"]
+        if stored_financial or added_financial:
+            merged["financial_data"] = {
+                key: stored_financial.get(key, 0.0) + added_financial.get(key, 0.0)
+                for key in {**stored_financial, **added_financial}
+            }
+        return merged
+
+    # ─── Decision ─────────────────────────────────────────────────────────
+    def _decide(
+        self,
+        applicant_id: str,
+        income: float,
+        family_size: int,
+        processed_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Run the stages after the document stages.
+        """
+        return self._run_stages({"processed_data": processed_data}, applicant_id, income, family_size)
+
+    def _run_stages(
+        self,
+        state: Dict[str, Any],
+        applicant_id: str,
+        income: float,
+        family_size: int,
+        completed: Sequence[str] = (),
+        on_complete: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the stages after the document stages that have not completed yet.
+
+        A stage that falls back to a default result (e.g. the eligibility
+        engine failed) marks the state degraded: the result is still
+        returned, but neither it nor any later stage is reported as
+        completed, so a checkpointed retry runs the stage again.
+
+        :param on_complete: called with each stage's name and the state after it
+        """
+        stages: Dict[str, Stage] = {
+            "validation": self._validation_stage,
+            "extraction": self._extraction_stage,
+            "eligibility": self._eligibility_stage,
+            "recommendation": self._recommendation_stage,
+            "decision": self._decision_stage,
+        }
+        for name in STAGES[1:]:
+            if name in completed:
+                continue
+            stages[name](state, applicant_id, income, family_size)
+            if on_complete is not None and not state.get(DEGRADED):
+                on_complete(name, state)
+
+        return {
+            "eligibility": state["eligibility"],
+            "recommendation": state["recommendation"],
+            "final_decision": state["final_decision"],
+            "processed_data": state["processed_data"],
+        }
+
+    def _validation_stage(
+        self, state: Dict[str, Any], applicant_id: str, income: float, family_size: int
+    ) -> None:
+        # ValidationAgent checks each document's extraction status; a failed one fails the stage
+        self.validation_agent.validate({"documents": state["processed_data"]["document_status"]})
+
+    def _extraction_stage(
+        self, state: Dict[str, Any], applicant_id: str, income: float, family_size: int
+    ) -> None:
+        state["processed_data"] = self.extractor_agent.extract(state["processed_data"])
+
+    def _eligibility_stage(
+        self, state: Dict[str, Any], applicant_id: str, income: float, family_size: int
+    ) -> None:
+        processed_data = state["processed_data"]
+        if "eligibility" in state:
+            logger.info("Reusing eligibility for %r: %s", applicant_id, state["eligibility"])
+            return
         try:
             eligibility = self.eligibility_engine.assess(
                 income=income,
@@ -67,7 +440,6 @@ class AgentOrchestrator:
                 "income": income,
                 "family_size": family_size
             }
-            processed_data["eligibility"] = eligibility
             logger.info(
                 "Eligibility for %r: income=%.2f, family_size=%d → %s",
                 applicant_id, income, family_size, eligibility
@@ -75,25 +447,39 @@ class AgentOrchestrator:
         except Exception:
             logger.exception("❌ Eligibility assessment failed; defaulting to 'declined'")
             eligibility = "declined"
-            processed_data["eligibility"] = eligibility
+            state.setdefault(DEGRADED, []).append("eligibility")
+        processed_data["eligibility"] = eligibility
+        state["eligibility"] = eligibility
 
-        # 3) Recommendation
+    def _recommendation_stage(
+        self, state: Dict[str, Any], applicant_id: str, income: float, family_size: int
+    ) -> None:
         try:
-            recommendation = self.recommendation_engine.generate(processed_data)
+            recommendation = self.recommendation_engine.generate(state["processed_data"])
             logger.info("Recommendation for %r: %r", applicant_id, recommendation)
         except Exception:
             logger.exception("❌ Recommendation generation failed; using fallback text")
             recommendation = "We were unable to generate a recommendation at this time."
+            state.setdefault(DEGRADED, []).append("recommendation")
+        state["recommendation"] = recommendation
 
-        # 4) Final decision
-        final_decision = (
-            f"Based on our assessment, you are *{eligibility}*. "
-            f"Our recommendation: {recommendation}"
+    def _decision_stage(
+        self, state: Dict[str, Any], applicant_id: str, income: float, family_size: int
+    ) -> None:
+        state["final_decision"] = self.decision_agent.decide(
+            state["eligibility"], state["recommendation"], state["processed_data"]
         )
 
-        return {
-            "eligibility": eligibility,
-            "recommendation": recommendation,
-            "final_decision": final_decision,
-            "processed_data": processed_data,
-        }
\ No newline at end of file
+
+def _name_and_mime(doc: Document) -> Tuple[str, Optional[str]]:
+    """
+    Name (file name / URL / path) and declared MIME type used for routing.
+    """
+    if isinstance(doc, DocumentPayload):
+        return (doc.name or "").lower(), doc.mime
+    if doc.startswith("data:"):
+        try:
+            return "", parse_header(doc)[0]
+        except ValueError:
+            return "", None
+    return doc.lower(), None
@@ -0,0 +1,105 @@
+"""
+Batch eligibility screening of applicant CSVs (applicant_id, income,
+family_size), scored chunk by chunk with EligibilityEngine.assess_batch and
+emitted as CSV text so results can be streamed back while the rest of the
+file is still being read.
+"""
+
+import io
+import os
+import csv
+import logging
+from typing import Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from src.core.eligibility_engine import EligibilityEngine
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ("applicant_id", "income", "family_size")
+OUTPUT_COLUMNS = ("applicant_id", "income", "family_size", "eligibility")
+INVALID = "invalid"
+
+try:
+    BATCH_CHUNK_ROWS = int(os.getenv("BATCH_CHUNK_ROWS", "5000"))
+except ValueError:
+    logger.error("Invalid BATCH_CHUNK_ROWS; using default 5000")
+    BATCH_CHUNK_ROWS = 5000
+
+
+def column_positions(header: Sequence[str]) -> List[int]:
+    """
+    Positions of the required columns in a CSV header.
+
+    :raises ValueError: naming the missing columns
+    """
+    names = [name.strip().lower() for name in header]
+    missing = [col for col in REQUIRED_COLUMNS if col not in names]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+    return [names.index(col) for col in REQUIRED_COLUMNS]
+
+
+def iter_batch_decisions(
+    engine: EligibilityEngine,
+    rows: Iterable[Sequence[str]],
+    positions: Sequence[int],
+    chunk_rows: int = BATCH_CHUNK_ROWS
+) -> Iterator[str]:
+    """
+    Score data rows in chunks and yield CSV text (header first).
+
+    Rows whose income / family_size do not parse are passed through with
+    eligibility 'invalid' instead of failing the whole batch.
+    """
+    id_pos, income_pos, size_pos = positions
+    yield _to_csv([OUTPUT_COLUMNS])
+
+    chunk: List[Sequence[str]] = []
+    for row in rows:
+        if not row:
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield _score_chunk(engine, chunk, id_pos, income_pos, size_pos)
+            chunk = []
+    if chunk:
+        yield _score_chunk(engine, chunk, id_pos, income_pos, size_pos)
+
+
+def _score_chunk(
+    engine: EligibilityEngine,
+    chunk: List[Sequence[str]],
+    id_pos: int,
+    income_pos: int,
+    size_pos: int
+) -> str:
+    incomes = np.full(len(chunk), np.nan)
+    sizes = np.full(len(chunk), np.nan)
+    for i, row in enumerate(chunk):
+        try:
+            incomes[i] = float(row[income_pos])
+            sizes[i] = float(row[size_pos])
+        except (ValueError, IndexError):
+            pass
+
+    valid = ~(np.isnan(incomes) | np.isnan(sizes))
+    decisions = np.full(len(chunk), INVALID, dtype=object)
+    decisions[valid] = engine.assess_batch(incomes[valid], sizes[valid])
+
+    return _to_csv(
+        (
+            row[id_pos] if len(row) > id_pos else "",
+            row[income_pos] if len(row) > income_pos else "",
+            row[size_pos] if len(row) > size_pos else "",
+            decision,
+        )
+        for row, decision in zip(chunk, decisions)
+    )
+
+
+def _to_csv(rows: Iterable[Sequence[str]]) -> str:
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerows(rows)
+    return out.getvalue()
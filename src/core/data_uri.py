@@ -0,0 +1,129 @@
+"""
+Chunked decoding of base64 data URIs ("data:<mime>;base64,<payload>").
+
+The payload is never sliced out of the URI as a whole: the header is parsed
+from the first few hundred characters, the MIME type and decoded size are
+checked before any decoding, and the base64 text is decoded a chunk at a time
+into a spooled temporary file (rolled over to disk up front for documents
+larger than DATA_URI_SPOOL_BYTES). Shared by ImageOCR and DocumentProcessor.
+"""
+
+import os
+import base64
+import binascii
+import logging
+import tempfile
+from typing import Callable, Optional, Tuple
+
+from src.core.document_format import UnsupportedDocumentError, parse_mime
+from src.core.document_payload import DocumentPayload, DocumentTooLargeError
+
+logger = logging.getLogger(__name__)
+
+# Longest header accepted before the ',' that starts the payload
+_MAX_HEADER_CHARS = 512
+# Base64 characters decoded per step (multiple of 4 → 768 KiB of output)
+_CHUNK_CHARS = 1024 * 1024
+
+try:
+    MAX_DOCUMENT_BYTES = int(os.getenv("MAX_DOCUMENT_BYTES", str(20 * 1024 * 1024)))
+    DATA_URI_SPOOL_BYTES = int(os.getenv("DATA_URI_SPOOL_BYTES", str(1024 * 1024)))
+except ValueError:
+    logger.error("Invalid MAX_DOCUMENT_BYTES/DATA_URI_SPOOL_BYTES; using defaults")
+    MAX_DOCUMENT_BYTES = 20 * 1024 * 1024
+    DATA_URI_SPOOL_BYTES = 1024 * 1024
+
+
+class InvalidDataURIError(ValueError):
+    """
+    Raised for a data URI without a header or with a corrupt base64 payload.
+    """
+
+
+def parse_header(data_uri: str) -> Tuple[Optional[str], bool, int]:
+    """
+    Parse the header of a data URI without copying its payload.
+
+    :return: (MIME type, whether the payload is base64, payload start offset)
+    :raises InvalidDataURIError: if there is no ',' within the header limit
+    """
+    comma = data_uri.find(",", 0, _MAX_HEADER_CHARS)
+    if comma < 0:
+        raise InvalidDataURIError("malformed data URI")
+    params = data_uri[:comma].split(";")
+    mime = parse_mime(params[0][len("data:"):] if params[0].startswith("data:") else params[0])
+    return mime, "base64" in params[1:], comma + 1
+
+
+def is_base64_data_uri(doc_ref: str) -> bool:
+    if not doc_ref.startswith("data:"):
+        return False
+    try:
+        return parse_header(doc_ref)[1]
+    except InvalidDataURIError:
+        return False
+
+
+def decoded_size(data_uri: str, offset: int) -> int:
+    """
+    Exact decoded length of a base64 payload without surrounding whitespace.
+    """
+    end = len(data_uri)
+    padding = 0
+    while end > offset and padding < 2 and data_uri[end - 1] == "=":
+        end -= 1
+        padding += 1
+    return (len(data_uri) - offset) * 3 // 4 - padding
+
+
+def decode_data_uri(
+    data_uri: str,
+    max_bytes: Optional[int] = None,
+    accept: Optional[Callable[[Optional[str]], bool]] = None,
+    spool_bytes: Optional[int] = None,
+) -> DocumentPayload:
+    """
+    Decode a base64 data URI into a DocumentPayload.
+
+    :param data_uri: "data:<mime>;base64,<payload>"
+    :param max_bytes: decoded size limit (default MAX_DOCUMENT_BYTES)
+    :param accept: predicate on the MIME type; rejected types are not decoded
+    :param spool_bytes: documents above this size go straight to a temp file
+    :raises UnsupportedDocumentError: if `accept` rejects the MIME type
+    :raises DocumentTooLargeError: if the decoded size exceeds `max_bytes`
+    :raises InvalidDataURIError: for a malformed URI or corrupt payload
+    """
+    max_bytes = MAX_DOCUMENT_BYTES if max_bytes is None else max_bytes
+    spool_bytes = DATA_URI_SPOOL_BYTES if spool_bytes is None else spool_bytes
+
+    mime, _, offset = parse_header(data_uri)
+    if accept is not None and not accept(mime):
+        raise UnsupportedDocumentError(f"mime='{mime}' is not accepted")
+    size = decoded_size(data_uri, offset)
+    if size > max_bytes:
+        raise DocumentTooLargeError(f"data URI decodes to {size} bytes (limit {max_bytes})")
+
+    body = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+    if size > spool_bytes:
+        body.rollover()
+    try:
+        try:
+            for start in range(offset, len(data_uri), _CHUNK_CHARS):
+                body.write(base64.b64decode(data_uri[start:start + _CHUNK_CHARS], validate=True))
+        except binascii.Error:
+            # Line-wrapped or otherwise non-canonical base64 cannot be decoded
+            # in aligned chunks; fall back to the lenient whole-payload decode.
+            logger.debug("Non-canonical base64 payload; decoding in one pass")
+            body.seek(0)
+            body.truncate()
+            body.write(base64.b64decode(data_uri[offset:]))
+    except (binascii.Error, ValueError) as e:
+        body.close()
+        raise InvalidDataURIError("invalid base64 payload") from e
+
+    size = body.tell()
+    if size > max_bytes:
+        body.close()
+        raise DocumentTooLargeError(f"data URI decodes to {size} bytes (limit {max_bytes})")
+    body.seek(0)
+    return DocumentPayload(body=body, mime=mime, size=size)
@@ -0,0 +1,77 @@
+"""
+Deadline: a request-level time budget passed down from the API route through
+AgentOrchestrator into ImageOCR, DocumentProcessor and the PDF pipeline, plus
+the per-document status reported back when the budget cuts work short.
+"""
+
+import os
+import time
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-document outcomes
+COMPLETE = "complete"   # fully extracted
+PARTIAL = "partial"     # some pages extracted before the budget ran out
+DEFERRED = "deferred"   # not (fully) started before the budget ran out
+TIMEOUT = "timeout"     # download did not finish before the budget ran out
+FAILED = "failed"       # extraction raised
+SKIPPED = "skipped"     # not a supported / OCR-able document
+
+
+class Deadline:
+    def __init__(self, seconds: Optional[float]):
+        """
+        Start a budget of `seconds` from now (None or <= 0 means unlimited).
+        """
+        self.budget = seconds if seconds and seconds > 0 else None
+        self.expires_at = time.monotonic() + self.budget if self.budget else None
+
+    @classmethod
+    def from_env(cls) -> "Deadline":
+        """
+        Budget from APPLICATION_TIME_BUDGET (seconds, default 90 — below the
+        UI's 120 s read timeout so a partial answer still reaches the client).
+        """
+        try:
+            return cls(float(os.getenv("APPLICATION_TIME_BUDGET", "90")))
+        except ValueError:
+            logger.error("Invalid APPLICATION_TIME_BUDGET; using default 90s")
+            return cls(90.0)
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left (never negative), or None when unlimited.
+        """
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def cap(self, timeout: Optional[float]) -> Optional[float]:
+        """
+        Limit a per-step timeout to what is left of the budget.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        remaining = max(remaining, 0.001)
+        return min(timeout, remaining) if timeout else remaining
+
+
+@dataclass
+class DocumentResult:
+    index: int
+    status: str
+    text: Optional[str] = None
+    detail: Optional[str] = None
+
+    def describe(self) -> dict:
+        """
+        JSON-serialisable status (without the text) for processed_data / responses.
+        """
+        return {"document_index": self.index, "status": self.status, "detail": self.detail}
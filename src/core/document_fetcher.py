@@ -0,0 +1,179 @@
+"""
+AsyncDocumentFetcher: concurrent download of URL document references.
+
+All downloads share one keep-alive httpx connection pool running on a
+dedicated event-loop thread, so synchronous callers (DocumentProcessor) get
+connection reuse across requests. Per-host concurrency is capped, oversized
+documents are aborted as soon as the limit is crossed (Content-Length or
+streamed byte count), and bodies larger than FETCH_SPOOL_BYTES are spooled to
+a temporary file instead of being held in memory. FETCH_TIMEOUT bounds each
+network operation; callers pass what is left of the request's time budget to
+bound a whole download (asyncio.TimeoutError when it runs out).
+"""
+
+import os
+import asyncio
+import logging
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+from src.core.document_format import parse_mime
+from src.core.document_payload import DocumentPayload, DocumentTooLargeError
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDocumentFetcher:
+    def __init__(self):
+        """
+        Initialize the fetcher from environment-based settings.
+        """
+        try:
+            self.max_connections = int(os.getenv("FETCH_MAX_CONNECTIONS", "20"))
+            self.per_host_limit = int(os.getenv("FETCH_PER_HOST_LIMIT", "4"))
+            self.max_document_bytes = int(os.getenv("MAX_DOCUMENT_BYTES", str(20 * 1024 * 1024)))
+            self.spool_bytes = int(os.getenv("FETCH_SPOOL_BYTES", str(1024 * 1024)))
+            self.timeout = float(os.getenv("FETCH_TIMEOUT", "10"))
+        except ValueError:
+            logger.error("Invalid FETCH_* configuration; using defaults")
+            self.max_connections = 20
+            self.per_host_limit = 4
+            self.max_document_bytes = 20 * 1024 * 1024
+            self.spool_bytes = 1024 * 1024
+            self.timeout = 10.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._start_lock = threading.Lock()
+
+    # ─── Sync entry point ─────────────────────────────────────────────────
+    def fetch_all_sync(
+        self, urls: List[str], timeout: Optional[float] = None
+    ) -> List[Union[DocumentPayload, Exception]]:
+        """
+        Fetch every URL concurrently from synchronous code.
+
+        :param timeout: seconds each download may take in total, e.g.
+                        Deadline.remaining() (None: only FETCH_TIMEOUT applies)
+        :return: one DocumentPayload or the raised exception per URL, in order
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.fetch_all(urls, timeout), loop).result()
+
+    def close(self) -> None:
+        """
+        Close the connection pool and stop the event-loop thread.
+        """
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+    # ─── Async API (runs on the fetcher's loop) ───────────────────────────
+    async def fetch_all(
+        self, urls: List[str], timeout: Optional[float] = None
+    ) -> List[Union[DocumentPayload, Exception]]:
+        return await asyncio.gather(*(self.fetch(url, timeout) for url in urls), return_exceptions=True)
+
+    async def fetch(self, url: str, timeout: Optional[float] = None) -> DocumentPayload:
+        """
+        :param timeout: seconds for the whole download, waiting for a per-host
+                        slot included (None: only FETCH_TIMEOUT applies)
+        :raises asyncio.TimeoutError: if the download takes longer than `timeout`
+        """
+        if timeout is None:
+            return await self._fetch(url)
+        if timeout <= 0:
+            raise asyncio.TimeoutError(f"No time left to fetch {url}")
+        # Cancelling the download closes its partial body
+        return await asyncio.wait_for(self._fetch(url), timeout)
+
+    async def _fetch(self, url: str) -> DocumentPayload:
+        client = self._get_client()
+        host = urlsplit(url).netloc
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+
+        async with limit:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                declared = response.headers.get("Content-Length")
+                if declared and declared.isdigit() and int(declared) > self.max_document_bytes:
+                    raise DocumentTooLargeError(
+                        f"{url} is {declared} bytes (limit {self.max_document_bytes})"
+                    )
+
+                body = tempfile.SpooledTemporaryFile(max_size=self.spool_bytes)
+                size = 0
+                try:
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > self.max_document_bytes:
+                            raise DocumentTooLargeError(
+                                f"{url} exceeded {self.max_document_bytes} bytes while downloading"
+                            )
+                        body.write(chunk)
+                except BaseException:
+                    body.close()
+                    raise
+
+        logger.debug(f"Fetched {url}: {size} bytes")
+        return DocumentPayload(
+            body=body,
+            mime=parse_mime(response.headers.get("Content-Type")),
+            size=size,
+            name=url,
+        )
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            # Imported with the first URL download, not at API startup
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def _aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_limits.clear()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="document-fetcher", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+
+_fetcher: Optional[AsyncDocumentFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_document_fetcher() -> AsyncDocumentFetcher:
+    """
+    Return the process-wide fetcher (and its shared connection pool).
+    """
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = AsyncDocumentFetcher()
+        return _fetcher
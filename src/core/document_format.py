@@ -0,0 +1,86 @@
+"""
+Document format detection from magic bytes and data-URI / HTTP MIME types,
+so each document can be sent straight to the matching extractor.
+"""
+
+import logging
+from typing import Optional
+
+from src.core.document_payload import DocumentData, DocumentPayload, read_head
+
+logger = logging.getLogger(__name__)
+
+PDF = "pdf"
+IMAGE = "image"
+TEXT = "text"
+
+# (signature, format) checked against the start of the document
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", IMAGE),
+    (b"\xff\xd8\xff", IMAGE),           # JPEG
+    (b"GIF87a", IMAGE),
+    (b"GIF89a", IMAGE),
+    (b"II*\x00", IMAGE),                # TIFF, little endian
+    (b"MM\x00*", IMAGE),                # TIFF, big endian
+)
+
+_TEXT_MIME_TYPES = {
+    "application/json",
+    "application/csv",
+    "application/xml",
+}
+
+
+class UnsupportedDocumentError(ValueError):
+    """
+    Raised when a document is neither a PDF, a supported image, nor text.
+    """
+
+
+def parse_mime(content_type: Optional[str]) -> Optional[str]:
+    """
+    Normalise a Content-Type / data-URI header to a bare lowercase MIME type.
+    """
+    if not content_type:
+        return None
+    return content_type.split(";", 1)[0].strip().lower() or None
+
+
+def detect_format(raw_bytes: DocumentData, mime: Optional[str] = None) -> str:
+    """
+    Classify a document as PDF, IMAGE or TEXT.
+
+    Magic bytes win over the declared MIME type; the MIME type is only used to
+    accept text documents. Anything else is rejected.
+
+    :param raw_bytes: decoded document bytes or uploaded file
+    :param mime: declared MIME type, if known
+    :raises UnsupportedDocumentError: for unrecognised binary content
+    """
+    head = read_head(raw_bytes)
+    size = raw_bytes.size if isinstance(raw_bytes, DocumentPayload) else len(raw_bytes)
+
+    # PDF readers tolerate up to 1 KiB of junk before the header
+    if b"%PDF-" in head:
+        return PDF
+    for signature, fmt in _SIGNATURES:
+        if head.startswith(signature):
+            return fmt
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return IMAGE
+    if head.startswith(b"BM") and head[6:10] == b"\x00\x00\x00\x00":
+        return IMAGE
+
+    mime = parse_mime(mime)
+    if mime and (mime.startswith("text/") or mime in _TEXT_MIME_TYPES):
+        return TEXT
+    if b"\x00" not in head:
+        try:
+            head.decode("utf-8")
+            return TEXT
+        except UnicodeDecodeError as e:
+            # A multi-byte character may straddle the 1 KiB boundary
+            if e.start >= len(head) - 3 and size > len(head):
+                return TEXT
+
+    raise UnsupportedDocumentError(f"Unsupported document format (mime={mime!r})")
@@ -0,0 +1,90 @@
+"""
+DocumentPayload: a decoded document held in a file object.
+
+Multipart uploads, URL downloads and decoded data URIs all end up in
+(spooled) temporary files; passing the file object through the pipeline
+avoids materialising extra copies of large scans. Helpers here let the
+extractors accept either plain bytes or a payload.
+"""
+
+import io
+from dataclasses import dataclass
+from typing import IO, Iterator, Optional, Union
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class DocumentTooLargeError(ValueError):
+    """
+    Raised when a document exceeds MAX_DOCUMENT_BYTES.
+    """
+
+
+@dataclass
+class DocumentPayload:
+    body: IO[bytes]
+    mime: Optional[str]
+    size: int
+    name: Optional[str] = None
+
+    def read_bytes(self) -> bytes:
+        self.body.seek(0)
+        return self.body.read()
+
+    def close(self) -> None:
+        self.body.close()
+
+    def describe(self) -> dict:
+        """
+        JSON-serialisable metadata (stored in processed_data instead of the content).
+        """
+        return {"filename": self.name, "mime": self.mime, "size": self.size}
+
+
+DocumentData = Union[bytes, bytearray, memoryview, DocumentPayload]
+
+
+def open_stream(data: DocumentData) -> IO[bytes]:
+    """
+    Return a readable binary stream positioned at the start of the document.
+    """
+    if isinstance(data, DocumentPayload):
+        data.body.seek(0)
+        return data.body
+    return io.BytesIO(data)
+
+
+def read_head(data: DocumentData, size: int = 1024) -> bytes:
+    """
+    Return the first `size` bytes without reading the whole document.
+    """
+    if isinstance(data, DocumentPayload):
+        data.body.seek(0)
+        head = data.body.read(size)
+        data.body.seek(0)
+        return head
+    return bytes(data[:size])
+
+
+def read_all(data: DocumentData) -> bytes:
+    if isinstance(data, DocumentPayload):
+        return data.read_bytes()
+    return bytes(data)
+
+
+def iter_chunks(data: DocumentData, chunk_size: int = _CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield the document in chunks (used for hashing without a full copy).
+    """
+    if isinstance(data, DocumentPayload):
+        data.body.seek(0)
+        while True:
+            chunk = data.body.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        data.body.seek(0)
+        return
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
@@ -3,110 +3,244 @@ DocumentProcessor: handles ingestion and extraction of text from various documen
 (e.g., PDFs, images, raw text/base64), returning structured data for downstream processing.
 """
 
-import logging
-import base64
 import io
-from typing import List, Dict
+import os
+import asyncio
+import logging
+from typing import List, Dict, Optional, Tuple, Union
 
-import requests
-from PIL import Image
-import PyPDF2
-import pytesseract  # Ensure pytesseract and Tesseract are installed in your environment
+from src.core import ocr_pool
+from src.core.data_uri import InvalidDataURIError, decode_data_uri, is_base64_data_uri
+from src.core.deadline import (
+    COMPLETE, DEFERRED, FAILED, PARTIAL, SKIPPED, TIMEOUT, Deadline, DocumentResult
+)
+from src.core.document_fetcher import get_document_fetcher
+from src.core.document_format import (
+    IMAGE, PDF, TEXT, UnsupportedDocumentError, detect_format
+)
+from src.core.document_payload import DocumentData, DocumentPayload, DocumentTooLargeError, read_all
+from src.core.ocr_backends import DEFAULT_BACKEND
+from src.core.ocr_cache import OCRCache, get_ocr_cache
+from src.core.pdf_pipeline import PDFPagePipeline
 
 logger = logging.getLogger(__name__)
 
 class DocumentProcessor:
-    def __init__(self, ocr_language: str = 'eng'):
+    def __init__(self, ocr_language: str = 'eng', cache: Optional[OCRCache] = None):
         """
         Initialize the document processor.
         
         :param ocr_language: language code for OCR (default 'eng')
+        :param cache: extraction cache (defaults to the process-wide cache shared with ImageOCR)
         """
         self.ocr_language = ocr_language
+        self.backend = os.getenv("OCR_BACKEND", DEFAULT_BACKEND)
+        try:
+            self.document_timeout = float(os.getenv("OCR_DOCUMENT_TIMEOUT", "30"))
+        except ValueError:
+            logger.error("Invalid OCR_DOCUMENT_TIMEOUT; using default 30s")
+            self.document_timeout = 30.0
+        self.cache = cache or get_ocr_cache()
+        self.pdf_pipeline = PDFPagePipeline(ocr_language=ocr_language)
+        self.fetcher = get_document_fetcher()
 
-    def process(self, documents: List[str], applicant_id: str) -> Dict:
+    def process(
+        self,
+        documents: List[Union[str, DocumentPayload]],
+        applicant_id: str,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
         """
         Process a list of document references (URLs or base64 strings) and extract text.
+
+        Documents are extracted smallest-first; once the deadline passes the
+        remaining ones are deferred. Every input gets an entry in
+        "document_status" (complete / partial / deferred / timeout / failed /
+        skipped); URL downloads are bounded by the deadline too.
         
-        :param documents: list of document inputs (URLs or base64 data URIs)
+        :param documents: list of document inputs (URLs, base64 data URIs or uploaded files)
         :param applicant_id: identifier for the applicant (for logging context)
-        :return: dict containing applicant_id and list of extracted document texts
+        :param deadline: request-level deadline (default: unlimited)
+        :return: dict containing applicant_id, list of extracted document texts and statuses
         """
+        deadline = deadline or Deadline(None)
         processed_data = {
             "applicant_id": applicant_id,
             "documents": []
         }
+        statuses: Dict[int, DocumentResult] = {}
 
+        opened = self._open_all(documents, applicant_id, statuses, deadline)
+        try:
+            for idx in sorted(opened, key=lambda i: opened[i].size):
+                if deadline.expired():
+                    logger.warning(f"Time budget exhausted; deferring document {idx} for applicant {applicant_id}")
+                    statuses[idx] = DocumentResult(idx, DEFERRED, detail="time budget exhausted")
+                    continue
+                try:
+                    logger.info(f"Processing document {idx} for applicant {applicant_id}")
+                    text, complete = self._extract_text(opened[idx], opened[idx].mime, deadline)
+                    status = COMPLETE if complete else PARTIAL
+                    statuses[idx] = DocumentResult(idx, status)
+                    processed_data["documents"].append({
+                        "document_index": idx,
+                        "text": text,
+                        "status": status
+                    })
+                    logger.debug(f"Extracted text for document {idx}: {text[:100]}...")
+                except (UnsupportedDocumentError, DocumentTooLargeError) as e:
+                    logger.warning(f"Rejected document index {idx} for applicant {applicant_id}: {e}")
+                    statuses[idx] = DocumentResult(idx, SKIPPED, detail=str(e))
+                except Exception:
+                    if deadline.expired():
+                        statuses[idx] = DocumentResult(idx, DEFERRED, detail="time budget exhausted")
+                        continue
+                    logger.exception(f"Failed to process document index {idx} for applicant {applicant_id}")
+                    statuses[idx] = DocumentResult(idx, FAILED, detail="extraction failed")
+                    # Continue processing remaining docs
+        finally:
+            for idx, payload in opened.items():
+                if payload is not documents[idx]:
+                    payload.close()
+
+        processed_data["documents"].sort(key=lambda doc: doc["document_index"])
+        processed_data["document_status"] = [
+            statuses[idx].describe() for idx in range(len(documents))
+        ]
+        return processed_data
+
+    def _open_all(
+        self,
+        documents: List[Union[str, DocumentPayload]],
+        applicant_id: str,
+        statuses: Dict[int, DocumentResult],
+        deadline: Deadline
+    ) -> Dict[int, DocumentPayload]:
+        """
+        Open every document up front (URLs are downloaded concurrently, within
+        the deadline) so their sizes are known for smallest-first scheduling.
+        """
+        url_indexes = [
+            idx for idx, doc_ref in enumerate(documents)
+            if isinstance(doc_ref, str) and self._is_url(doc_ref)
+        ]
+        fetched = dict(zip(
+            url_indexes,
+            self.fetcher.fetch_all_sync(
+                [documents[idx] for idx in url_indexes], timeout=deadline.remaining()
+            ) if url_indexes else [],
+        ))
+
+        opened: Dict[int, DocumentPayload] = {}
         for idx, doc_ref in enumerate(documents):
             try:
-                logger.info(f"Processing document {idx} for applicant {applicant_id}")
-                raw_bytes = self._fetch_bytes(doc_ref)
-                text = self._extract_text(raw_bytes)
-                processed_data["documents"].append({
-                    "document_index": idx,
-                    "text": text
-                })
-                logger.debug(f"Extracted text for document {idx}: {text[:100]}...")
-            except Exception:
-                logger.exception(f"Failed to process document index {idx} for applicant {applicant_id}")
-                # Continue processing remaining docs
-        return processed_data
+                if idx in fetched:
+                    if isinstance(fetched[idx], Exception):
+                        raise fetched[idx]
+                    opened[idx] = fetched[idx]
+                elif isinstance(doc_ref, DocumentPayload):
+                    opened[idx] = doc_ref
+                else:
+                    opened[idx] = self.open_document(doc_ref)
+            except (UnsupportedDocumentError, DocumentTooLargeError) as e:
+                logger.warning(f"Rejected document index {idx} for applicant {applicant_id}: {e}")
+                statuses[idx] = DocumentResult(idx, SKIPPED, detail=str(e))
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError) or deadline.expired():
+                    logger.warning(
+                        f"Time budget exhausted while downloading document {idx} for applicant {applicant_id}"
+                    )
+                    statuses[idx] = DocumentResult(idx, TIMEOUT, detail="time budget exhausted while downloading")
+                    continue
+                logger.exception(f"Failed to load document index {idx} for applicant {applicant_id}")
+                statuses[idx] = DocumentResult(idx, FAILED, detail="could not load document")
+        return opened
+
+    @staticmethod
+    def _is_url(doc_ref: str) -> bool:
+        return doc_ref.startswith(("http://", "https://"))
 
-    def _fetch_bytes(self, doc_ref: str) -> bytes:
+    def open_document(self, doc_ref: str, deadline: Optional[Deadline] = None) -> DocumentPayload:
         """
-        Fetch raw bytes from a document reference. Supports HTTP URLs or base64 data URIs.
+        Open a document reference. Supports HTTP URLs or base64 data URIs.
         
         :param doc_ref: URL string or data URI
-        :return: raw bytes of the document
+        :param deadline: request-level deadline bounding a URL download
+        :return: the document body with its declared MIME type (if any)
+        :raises asyncio.TimeoutError: if the deadline expires during the download
         """
-        if doc_ref.startswith(("http://", "https://")):
-            response = requests.get(doc_ref, timeout=10)
-            response.raise_for_status()
-            return response.content
+        if self._is_url(doc_ref):
+            timeout = deadline.remaining() if deadline else None
+            result = self.fetcher.fetch_all_sync([doc_ref], timeout=timeout)[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
 
         # Assume base64 data URI: "data:<mime>;base64,<encoded>"
-        if doc_ref.startswith("data:") and ";base64," in doc_ref:
+        if is_base64_data_uri(doc_ref):
             try:
-                _, b64data = doc_ref.split(";base64,", 1)
-                return base64.b64decode(b64data)
-            except Exception:
+                return decode_data_uri(doc_ref)
+            except InvalidDataURIError:
                 logger.error("Invalid base64 document data URI")
                 raise
 
         # Fallback: treat as raw text
         logger.warning("Unrecognized document format, treating input as raw text")
-        return doc_ref.encode('utf-8')
+        raw_bytes = doc_ref.encode('utf-8')
+        return DocumentPayload(body=io.BytesIO(raw_bytes), mime="text/plain", size=len(raw_bytes))
 
-    def _extract_text(self, raw_bytes: bytes) -> str:
+    def _extract_text(
+        self,
+        raw_bytes: DocumentData,
+        mime: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Tuple[str, bool]:
         """
-        Extract text from raw document bytes. Tries PDF parsing first, then OCR on images,
-        and falls back to plaintext decoding.
+        Extract text from raw document bytes, reusing a cached result when the
+        same document was extracted before.
         
-        :param raw_bytes: raw bytes of the document
-        :return: extracted text
+        :param raw_bytes: raw bytes of the document, or an uploaded/downloaded file
+        :param mime: declared MIME type, used to recognise text documents
+        :param deadline: request-level deadline bounding OCR / PDF extraction
+        :return: extracted text and whether the document was extracted in full
+        :raises UnsupportedDocumentError: if the format is not PDF, image or text
         """
-        # Try PDF parsing
-        try:
-            reader = PyPDF2.PdfReader(io.BytesIO(raw_bytes))
-            text_pages = [page.extract_text() or "" for page in reader.pages]
-            text = "\n".join(text_pages).strip()
-            if text:
-                return text
-        except Exception:
-            logger.debug("PDF parsing failed, trying image OCR", exc_info=True)
-
-        # Try image OCR
-        try:
-            image = Image.open(io.BytesIO(raw_bytes))
-            text = pytesseract.image_to_string(image, lang=self.ocr_language).strip()
-            if text:
-                return text
-        except Exception:
-            logger.debug("Image OCR failed, falling back to raw text", exc_info=True)
-
-        # Fallback to UTF-8 text
-        try:
-            return raw_bytes.decode('utf-8', errors='ignore')
-        except Exception:
-            logger.warning("Failed to decode bytes as UTF-8, returning empty string")
-            return ""
\ No newline at end of file
+        fmt = detect_format(raw_bytes, mime)
+        key = OCRCache.make_key(raw_bytes, self.ocr_language, ocr_pool.cache_version(self.backend))
+        text = self.cache.get(key)
+        if text is not None:
+            logger.debug("Extraction cache hit")
+            return text, True
+        text, complete = self._extractors[fmt](self, raw_bytes, deadline)
+        if complete:
+            self.cache.put(key, text)
+        return text, complete
+
+    def _extract_pdf(self, raw_bytes: DocumentData, deadline: Optional[Deadline] = None) -> Tuple[str, bool]:
+        """
+        Extract a PDF page by page: text layer where present, OCR for scanned pages.
+        """
+        extraction = self.pdf_pipeline.extract(raw_bytes, deadline)
+        return extraction.text, not extraction.truncated
+
+    def _extract_image(self, raw_bytes: DocumentData, deadline: Optional[Deadline] = None) -> Tuple[str, bool]:
+        """
+        OCR an image document.
+        """
+        timeout = deadline.cap(self.document_timeout) if deadline else self.document_timeout
+        text = ocr_pool.ocr_image_bytes(
+            raw_bytes, timeout, self.ocr_language, self.backend
+        )
+        return text.strip(), True
+
+    def _extract_plaintext(self, raw_bytes: DocumentData, deadline: Optional[Deadline] = None) -> Tuple[str, bool]:
+        """
+        Decode a text document as UTF-8.
+        """
+        return read_all(raw_bytes).decode('utf-8', errors='ignore'), True
+
+    _extractors = {
+        PDF: _extract_pdf,
+        IMAGE: _extract_image,
+        TEXT: _extract_plaintext,
+    }
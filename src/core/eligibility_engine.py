@@ -2,7 +2,11 @@
 
 import os
 import logging
-from typing import List
+from typing import Any, List, Mapping, Optional
+
+import numpy as np
+
+from src.models.artifact import ELIGIBILITY_FEATURES, LinearModelArtifact, artifact_path_for
 
 # You may use joblib, pickle, etc. if you have a saved sklearn model.
 # from sklearn.base import ClassifierMixin  
@@ -14,16 +18,24 @@ logger.setLevel(logging.INFO)
 class EligibilityEngine:
     """
     Wraps a trained ML model for eligibility prediction, with
-    a rule-based fallback. All parameters are read from env vars.
+    a rule-based fallback. All parameters are read from env vars
+    (or from `settings`, e.g. env overlaid with the EngineRegistry config file).
+
+    A JSON model artifact (see src.models.artifact) next to
+    ELIGIBILITY_MODEL_PATH is scored with NumPy and preferred over the
+    pickle, which is only unpickled for other model types. A model that
+    needs features other than ELIGIBILITY_FEATURES is not used.
     """
-    def __init__(self):
+    def __init__(self, settings: Optional[Mapping[str, Any]] = None):
+        settings = os.environ if settings is None else settings
+
         # 1) Load thresholds from environment, with defaults
         try:
             self.income_threshold = float(
-                os.getenv("ELIGIBILITY_INCOME_THRESHOLD", "2000")
+                settings.get("ELIGIBILITY_INCOME_THRESHOLD", "2000")
             )
             self.family_size_threshold = int(
-                os.getenv("ELIGIBILITY_FAMILY_SIZE_THRESHOLD", "4")
+                settings.get("ELIGIBILITY_FAMILY_SIZE_THRESHOLD", "4")
             )
         except ValueError:
             logger.error("Invalid eligibility thresholds; using defaults")
@@ -32,19 +44,32 @@ class EligibilityEngine:
 
         # 2) Optionally load a trained model
         self.model = None
-        model_path = os.getenv(
+        model_path = settings.get(
             "ELIGIBILITY_MODEL_PATH", "src/models/eligibility_model.pkl"
         )
-        if os.path.isfile(model_path):
+        model_path = model_source(model_path)
+        if model_path:
             try:
-                import pickle
-                with open(model_path, "rb") as f:
-                    self.model = pickle.load(f)
-                logger.info(f"Loaded eligibility model from '{model_path}'")
+                if model_path.endswith(".json"):
+                    model = LinearModelArtifact.load(model_path)
+                else:
+                    import pickle
+                    with open(model_path, "rb") as f:
+                        model = pickle.load(f)
             except Exception:
                 logger.exception(
                     f"Failed to load eligibility model at '{model_path}'; using rule-based"
                 )
+            else:
+                unsupported = unsupported_features(model)
+                if unsupported:
+                    logger.warning(
+                        f"Eligibility model at '{model_path}' needs features the engine "
+                        f"does not provide ({', '.join(unsupported)}); using rule-based"
+                    )
+                else:
+                    self.model = model
+                    logger.info(f"Loaded eligibility model from '{model_path}'")
 
     def assess(self, income: float, family_size: int) -> str:
         """
@@ -64,8 +89,7 @@ class EligibilityEngine:
         # 1) ML path
         if self.model:
             try:
-                features: List[List[float]] = [[income, float(family_size)]]
-                pred = self.model.predict(features)[0]
+                pred = self._predict(np.array([income]), np.array([float(family_size)]))[0]
                 decision = "approved" if pred == 1 else "declined"
                 logger.debug(
                     "ML model predicted %r for income=%.2f, family_size=%d",
@@ -85,4 +109,86 @@ class EligibilityEngine:
             "Rule-based decision=%r (income*family_size=%.2f, threshold=%.2f)",
             decision, score, threshold,
         )
-        return decision
\ No newline at end of file
+        return decision
+
+    def assess_batch(self, incomes: np.ndarray, family_sizes: np.ndarray) -> np.ndarray:
+        """
+        Vectorised assess() for many applicants: one model.predict call for
+        the whole batch, or one array expression for the rule fallback.
+
+        :param incomes: 1-D array of monthly incomes
+        :param family_sizes: 1-D array of family sizes (same length)
+        :return: array of 'approved' / 'declined', in input order
+        """
+        incomes = np.asarray(incomes, dtype=float)
+        family_sizes = np.asarray(family_sizes, dtype=float)
+        if incomes.shape != family_sizes.shape or incomes.ndim != 1:
+            raise ValueError("incomes and family_sizes must be 1-D arrays of equal length")
+        if len(incomes) == 0:
+            return np.array([], dtype=object)
+
+        unexpected = int(np.count_nonzero((incomes < 0) | (family_sizes < 1)))
+        if unexpected:
+            logger.warning("Batch contains %d rows with unexpected income/family_size", unexpected)
+
+        # 1) ML path
+        if self.model:
+            try:
+                preds = self._predict(incomes, family_sizes)
+                return np.where(preds == 1, "approved", "declined").astype(object)
+            except Exception:
+                logger.exception(
+                    "Exception during batch ML predict; falling back to rule‐based"
+                )
+
+        # 2) Rule‐based fallback
+        threshold = self.income_threshold * self.family_size_threshold
+        decisions = np.where(incomes * family_sizes < threshold, "approved", "declined").astype(object)
+        logger.info(
+            "Rule-based batch of %d: %d approved (threshold=%.2f)",
+            len(decisions), int(np.count_nonzero(decisions == "approved")), threshold,
+        )
+        return decisions
+
+    def _predict(self, incomes: np.ndarray, family_sizes: np.ndarray) -> np.ndarray:
+        features = {"income": incomes, "family_size": family_sizes}
+        if isinstance(self.model, LinearModelArtifact):
+            return self.model.predict(features)
+        return np.asarray(
+            self.model.predict(np.column_stack([features[name] for name in ELIGIBILITY_FEATURES]))
+        )
+
+
+def unsupported_features(model: Any) -> List[str]:
+    """
+    Features a loaded model needs that are not in ELIGIBILITY_FEATURES
+    (a pickled model must take exactly those columns, in that order).
+    """
+    if isinstance(model, LinearModelArtifact):
+        return [name for name in model.feature_names if name not in ELIGIBILITY_FEATURES]
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        names = [str(name) for name in names]
+        if names == list(ELIGIBILITY_FEATURES):
+            return []
+        return [name for name in names if name not in ELIGIBILITY_FEATURES] or [
+            f"columns {', '.join(names)}"
+        ]
+    n_features = getattr(model, "n_features_in_", len(ELIGIBILITY_FEATURES))
+    if n_features != len(ELIGIBILITY_FEATURES):
+        return [f"{n_features} columns"]
+    return []
+
+
+def model_source(model_path: Optional[str]) -> Optional[str]:
+    """
+    File EligibilityEngine loads for ELIGIBILITY_MODEL_PATH: a JSON artifact
+    (the path itself, or the artifact next to a pickle), else the pickle.
+    None if neither exists.
+    """
+    if not model_path:
+        return None
+    artifact_path = artifact_path_for(model_path)
+    if os.path.isfile(artifact_path):
+        return artifact_path
+    return model_path if os.path.isfile(model_path) else None
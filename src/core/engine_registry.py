@@ -0,0 +1,170 @@
+"""
+EngineRegistry: process-wide, hot-reloadable decision engines.
+
+The FastAPI lifespan builds one registry at startup; routes get the current
+AgentOrchestrator from it through dependency injection instead of building
+ImageOCR / EligibilityEngine / RecommendationEngine (env parsing, model
+unpickling) on every request.
+
+Thresholds come from the environment overlaid with an optional YAML file
+(ENGINE_CONFIG_PATH, default config/engines.yml) using the same keys as the
+environment variables. At most every ENGINE_RELOAD_INTERVAL seconds the
+registry checks the mtimes of that file, the eligibility model and the
+recommendation rules; when any changed, new engines are built off to the
+side and swapped in with a single reference assignment, so in-flight requests
+keep the snapshot they started with and never see a half-updated set of
+engines.
+"""
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+from src.core.agent_orchestrator import AgentOrchestrator
+from src.core.eligibility_engine import EligibilityEngine, model_source
+from src.core.image_ocr import ImageOCR
+from src.core.recommendation_engine import RecommendationEngine
+from src.core.recommendation_rules import rules_path
+from src.services.blob_store import get_blob_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EngineSnapshot:
+    version: int
+    orchestrator: AgentOrchestrator
+    settings: Dict[str, Any]
+    # (model, config file, recommendation rules) mtimes in ns the snapshot was built from
+    sources: Tuple[Optional[int], Optional[int], Optional[int]]
+
+    @property
+    def eligibility_engine(self) -> EligibilityEngine:
+        return self.orchestrator.eligibility_engine
+
+    @property
+    def recommendation_engine(self) -> RecommendationEngine:
+        return self.orchestrator.recommendation_engine
+
+
+class EngineRegistry:
+    def __init__(self, config_path: Optional[str] = None):
+        """
+        Build the initial engines.
+
+        :param config_path: threshold overrides file (default from ENGINE_CONFIG_PATH)
+        """
+        if config_path is None:
+            config_path = os.getenv("ENGINE_CONFIG_PATH", "config/engines.yml")
+        self.config_path = config_path or None
+        try:
+            self.reload_interval = float(os.getenv("ENGINE_RELOAD_INTERVAL", "5"))
+        except ValueError:
+            logger.error("Invalid ENGINE_RELOAD_INTERVAL; using default 5s")
+            self.reload_interval = 5.0
+
+        # ImageOCR has no file-based configuration, so it is shared by all snapshots
+        self.ocr = ImageOCR()
+        self._reload_lock = threading.Lock()
+        self._next_check = time.monotonic() + self.reload_interval
+        self._snapshot = self._build(version=1)
+
+    def snapshot(self) -> EngineSnapshot:
+        """
+        Return the current engines, reloading first if their sources changed.
+        """
+        if self.reload_interval > 0 and time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._snapshot
+
+    def reload_if_changed(self) -> bool:
+        """
+        Rebuild the engines if the model file or config file changed.
+
+        :return: True if a new snapshot was swapped in
+        """
+        # Only one thread checks/rebuilds; the others keep using the current snapshot
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = time.monotonic() + self.reload_interval
+            # A changed config file shows up in its own mtime, so the model path
+            # of the current snapshot is enough here (no YAML parsing per check)
+            if self._sources(self._snapshot.settings) == self._snapshot.sources:
+                return False
+            return self._swap()
+        finally:
+            self._reload_lock.release()
+
+    def reload(self) -> bool:
+        """
+        Unconditionally rebuild the engines (e.g. from an admin hook).
+        """
+        with self._reload_lock:
+            return self._swap()
+
+    def _swap(self) -> bool:
+        # Caller holds the reload lock
+        try:
+            snapshot = self._build(version=self._snapshot.version + 1)
+        except Exception:
+            logger.exception("Engine reload failed; keeping the current engines")
+            return False
+        self._snapshot = snapshot
+        logger.info(f"Engines reloaded (version {snapshot.version})")
+        return True
+
+    def _build(self, version: int) -> EngineSnapshot:
+        settings = self._settings()
+        sources = self._sources(settings)
+        eligibility_engine = EligibilityEngine(settings)
+        # EligibilityEngine falls back to rules on a bad model file; on reload a
+        # half-written model should keep the previous engines instead.
+        if version > 1 and sources[0] is not None and eligibility_engine.model is None:
+            raise ValueError("eligibility model could not be loaded")
+        orchestrator = AgentOrchestrator(
+            ocr=self.ocr,
+            eligibility_engine=eligibility_engine,
+            recommendation_engine=RecommendationEngine(settings),
+            blob_store=get_blob_store(),
+        )
+        return EngineSnapshot(
+            version=version, orchestrator=orchestrator, settings=settings, sources=sources
+        )
+
+    def _settings(self) -> Dict[str, Any]:
+        """
+        Environment overlaid with the config file (if present).
+        """
+        settings: Dict[str, Any] = dict(os.environ)
+        if self.config_path and os.path.isfile(self.config_path):
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                overrides = yaml.safe_load(f) or {}
+            if not isinstance(overrides, dict):
+                raise ValueError(f"{self.config_path} must contain a mapping")
+            settings.update(overrides)
+        return settings
+
+    def _sources(
+        self, settings: Dict[str, Any]
+    ) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        model_path = settings.get("ELIGIBILITY_MODEL_PATH", "src/models/eligibility_model.pkl")
+        return (
+            _mtime(model_source(model_path)),
+            _mtime(self.config_path),
+            _mtime(rules_path(settings)),
+        )
+
+
+def _mtime(path: Optional[str]) -> Optional[int]:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
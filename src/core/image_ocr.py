@@ -1,50 +1,287 @@
-import base64
-import io
 import logging
 import os
-from typing import List
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple, Union
 
-from PIL import Image, UnidentifiedImageError
-import pytesseract
+from PIL import UnidentifiedImageError
+
+from src.core.data_uri import InvalidDataURIError, MAX_DOCUMENT_BYTES, decode_data_uri, parse_header
+from src.core.deadline import (
+    COMPLETE, DEFERRED, FAILED, PARTIAL, SKIPPED, Deadline, DocumentResult
+)
+from src.core.document_format import IMAGE, PDF, UnsupportedDocumentError, detect_format
+from src.core.document_payload import DocumentPayload, DocumentTooLargeError, read_all
+from src.core.ocr_backends import DEFAULT_BACKEND
+from src.core.ocr_cache import OCRCache, get_ocr_cache
+from src.core.ocr_pool import cache_version, get_pool, discard_pool, ocr_image_bytes, ocr_worker
+from src.core.pdf_pipeline import PDFPagePipeline
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+
+def _ocr_able(mime: Optional[str]) -> bool:
+    return mime == "application/pdf" or (mime or "").startswith("image/")
+
+
 class ImageOCR:
     """
-    Extract text from a list of base64‐encoded documents.
-    Only tries to OCR if the data URI mime type starts with 'image/'.
+    Extract text from a list of base64‐encoded documents or uploaded files
+    (DocumentPayload). Only tries to OCR if the data URI mime type starts with
+    'image/'; PDFs ('application/pdf') go through the page-level PDFPagePipeline.
+    Uploaded files are classified from their content instead.
+
+    With OCR_MAX_WORKERS > 1 the documents are OCR'd concurrently in a shared
+    process pool; results are always returned in the original document order.
+    Results are memoised in the shared OCRCache, so resubmitted documents are
+    not OCR'd again. An optional request Deadline bounds the whole call;
+    extract_documents reports which documents were cut short.
     """
 
-    def __init__(self):
-        # Allow override of the tesseract command
-        self.tesseract_cmd = os.getenv("TESSERACT_CMD", "tesseract")
-        pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
-        logger.info(f"Using TESSERACT_CMD='{self.tesseract_cmd}'")
+    def __init__(self, cache: Optional[OCRCache] = None):
+        # OCR engine: 'pytesseract' (honours TESSERACT_CMD) or 'tesserocr'
+        self.backend = os.getenv("OCR_BACKEND", DEFAULT_BACKEND)
+        logger.info(f"Using OCR_BACKEND='{self.backend}'")
+        self.ocr_language = os.getenv("OCR_LANGUAGE", "eng")
+        self.cache = cache or get_ocr_cache()
+        self.pdf_pipeline = PDFPagePipeline(ocr_language=self.ocr_language)
+        self.max_document_bytes = MAX_DOCUMENT_BYTES
+
+        try:
+            self.max_workers = int(os.getenv("OCR_MAX_WORKERS", "1"))
+            self.document_timeout = float(os.getenv("OCR_DOCUMENT_TIMEOUT", "30"))
+        except ValueError:
+            logger.error("Invalid OCR_MAX_WORKERS/OCR_DOCUMENT_TIMEOUT; using defaults")
+            self.max_workers = 1
+            self.document_timeout = 30.0
+
+    def extract_texts(
+        self,
+        documents: List[Union[str, DocumentPayload]],
+        deadline: Optional[Deadline] = None
+    ) -> List[str]:
+        """
+        Texts of the documents that were (at least partly) extracted, in order.
+        """
+        return [
+            result.text for result in self.extract_documents(documents, deadline)
+            if result.text is not None
+        ]
+
+    def extract_documents(
+        self,
+        documents: List[Union[str, DocumentPayload]],
+        deadline: Optional[Deadline] = None
+    ) -> List[DocumentResult]:
+        """
+        Extract every document within the request deadline.
+
+        Documents are processed smallest-first so a tight budget still covers as
+        many as possible; once the budget runs out the rest are deferred.
+
+        :param documents: data URIs or uploaded files
+        :param deadline: request-level deadline (default: unlimited)
+        :return: one DocumentResult per input document, in the original order
+        """
+        deadline = deadline or Deadline(None)
+        results: Dict[int, DocumentResult] = {}
+        jobs, pdf_indexes = self._decode_documents(documents, results)
+        try:
+            self._extract_jobs(jobs, pdf_indexes, deadline, results)
+        finally:
+            # Close the payloads decoded here; uploaded files belong to the caller
+            for idx, payload in jobs:
+                if payload is not documents[idx]:
+                    payload.close()
+        return [results[idx] for idx in range(len(documents))]
+
+    def _extract_jobs(
+        self,
+        jobs: List[Tuple[int, DocumentPayload]],
+        pdf_indexes: set,
+        deadline: Deadline,
+        results: Dict[int, DocumentResult]
+    ) -> None:
+        keys: Dict[int, str] = {}
+        pending: List[Tuple[int, DocumentPayload]] = []
+        version = cache_version(self.backend)
+        for idx, payload in jobs:
+            keys[idx] = OCRCache.make_key(payload, self.ocr_language, version)
+            cached = self.cache.get(keys[idx])
+            if cached is not None:
+                results[idx] = DocumentResult(idx, COMPLETE, cached)
+                logger.info(f"Document #{idx}: OCR cache hit, {len(cached)} chars")
+            else:
+                pending.append((idx, payload))
+        pending.sort(key=lambda job: job[1].size)
+
+        images = [job for job in pending if job[0] not in pdf_indexes]
+        if self.max_workers > 1 and len(images) > 1:
+            self._ocr_parallel(images, keys, deadline, results)
+            pending = [job for job in pending if job[0] in pdf_indexes]
 
-    def extract_texts(self, documents: List[str]) -> List[str]:
-        texts: List[str] = []
+        for idx, payload in pending:
+            if deadline.expired():
+                results[idx] = self._defer(idx)
+            elif idx in pdf_indexes:
+                results[idx] = self._extract_pdf(idx, payload, keys[idx], deadline)
+            else:
+                results[idx] = self._ocr_one(idx, payload, keys[idx], deadline)
+
+    def _decode_documents(
+        self,
+        documents: List[Union[str, DocumentPayload]],
+        results: Dict[int, DocumentResult]
+    ) -> Tuple[List[Tuple[int, DocumentPayload]], set]:
+        """
+        Decode every OCR-able data URI (chunked, see data_uri); uploaded files
+        are passed through as-is. Documents that are skipped get a SKIPPED result.
+
+        :return: (document index, payload) jobs and the indexes that are PDFs
+        """
+        jobs: List[Tuple[int, DocumentPayload]] = []
+        pdf_indexes = set()
         for idx, data_uri in enumerate(documents):
-            # split out "data:<mime>;base64,<b64>"
-            try:
-                header, b64data = data_uri.split(",", 1)
-            except ValueError:
-                logger.warning(f"Document #{idx}: malformed data URI, skipping")
+            if isinstance(data_uri, DocumentPayload):
+                try:
+                    fmt = detect_format(data_uri, data_uri.mime)
+                except UnsupportedDocumentError:
+                    fmt = None
+                if fmt == PDF:
+                    pdf_indexes.add(idx)
+                elif fmt != IMAGE:
+                    logger.warning(f"Document #{idx}: '{data_uri.name}' is not an image, skipping OCR")
+                    results[idx] = DocumentResult(idx, SKIPPED, detail="not an image or PDF")
+                    continue
+                jobs.append((idx, data_uri))
                 continue
 
-            mime = header.split(";")[0].removeprefix("data:")
-            if not mime.startswith("image/"):
+            try:
+                payload = decode_data_uri(data_uri, max_bytes=self.max_document_bytes, accept=_ocr_able)
+            except UnsupportedDocumentError:
+                mime = parse_header(data_uri)[0]
                 logger.warning(f"Document #{idx}: mime='{mime}' is not an image, skipping OCR")
+                results[idx] = DocumentResult(idx, SKIPPED, detail="not an image or PDF")
+                continue
+            except (InvalidDataURIError, DocumentTooLargeError) as e:
+                logger.warning(f"Document #{idx}: {e}, skipping")
+                results[idx] = DocumentResult(idx, SKIPPED, detail=str(e))
                 continue
 
+            if payload.mime == "application/pdf":
+                pdf_indexes.add(idx)
+            jobs.append((idx, payload))
+        return jobs, pdf_indexes
+
+    def _ocr_one(self, idx: int, payload: DocumentPayload, key: str, deadline: Deadline) -> DocumentResult:
+        try:
+            # Stripped like DocumentProcessor's, which caches under the same keys
+            text = ocr_image_bytes(
+                payload, deadline.cap(self.document_timeout), self.ocr_language, self.backend
+            ).strip()
+        except Exception as e:
+            if deadline.expired():
+                return self._defer(idx)
+            self._log_failure(idx, e)
+            return DocumentResult(idx, FAILED, detail="OCR failed")
+        self.cache.put(key, text)
+        logger.info(f"Document #{idx}: OCR succeeded, {len(text)} chars")
+        return DocumentResult(idx, COMPLETE, text)
+
+    def _extract_pdf(self, idx: int, payload: DocumentPayload, key: str, deadline: Deadline) -> DocumentResult:
+        try:
+            extraction = self.pdf_pipeline.extract(payload, deadline)
+        except Exception as e:
+            self._log_failure(idx, e)
+            return DocumentResult(idx, FAILED, detail="PDF extraction failed")
+        logger.info(
+            f"Document #{idx}: PDF extracted {extraction.pages_processed}/"
+            f"{extraction.pages_total} pages ({extraction.pages_ocr} OCR'd), "
+            f"{len(extraction.text)} chars"
+        )
+        if not extraction.truncated:
+            self.cache.put(key, extraction.text)
+            return DocumentResult(idx, COMPLETE, extraction.text)
+        # A budget-truncated PDF is not cached, so it is retried in full next time
+        return DocumentResult(
+            idx, PARTIAL, extraction.text,
+            detail=f"{extraction.pages_processed}/{extraction.pages_total} pages"
+        )
+
+    def _ocr_parallel(
+        self,
+        jobs: List[Tuple[int, DocumentPayload]],
+        keys: Dict[int, str],
+        deadline: Deadline,
+        results: Dict[int, DocumentResult]
+    ) -> None:
+        pool = get_pool(self.max_workers)
+        # Uploaded files are read into memory only when submitted (workers need
+        # picklable bytes), so at most `window` documents are held at once.
+        window = 2 * self.max_workers
+        # tesseract enforces the per-document timeout inside the worker; the
+        # wait below is only a backstop for a worker that never returns.
+        rounds = -(-min(len(jobs), window) // self.max_workers)
+        backstop = self.document_timeout * rounds + 5 if self.document_timeout else None
+
+        futures = []
+        submitted = 0
+        while submitted < len(jobs) or futures:
+            while submitted < len(jobs) and len(futures) < window:
+                idx, payload = jobs[submitted]
+                submitted += 1
+                if deadline.expired():
+                    results[idx] = self._defer(idx)
+                    continue
+                try:
+                    futures.append((idx, pool.submit(
+                        ocr_worker, read_all(payload), deadline.cap(self.document_timeout),
+                        self.ocr_language, self.backend
+                    )))
+                except BrokenProcessPool as e:
+                    discard_pool(pool)
+                    pool = get_pool(self.max_workers)
+                    self._log_failure(idx, e)
+                    results[idx] = DocumentResult(idx, FAILED, detail="OCR failed")
+            if not futures:
+                continue
+            idx, future = futures.pop(0)
             try:
-                img_bytes = io.BytesIO(base64.b64decode(b64data))
-                with Image.open(img_bytes) as img:
-                    text = pytesseract.image_to_string(img)
-                texts.append(text)
+                text = future.result(timeout=deadline.cap(backstop)).strip()
+                self.cache.put(keys[idx], text)
+                results[idx] = DocumentResult(idx, COMPLETE, text)
                 logger.info(f"Document #{idx}: OCR succeeded, {len(text)} chars")
-            except UnidentifiedImageError:
-                logger.warning(f"Document #{idx}: not a valid image file, skipping")
+            except FutureTimeoutError:
+                future.cancel()
+                if deadline.expired():
+                    results[idx] = self._defer(idx)
+                else:
+                    logger.warning(f"Document #{idx}: OCR timed out, skipping")
+                    results[idx] = DocumentResult(idx, FAILED, detail="OCR timed out")
+            except BrokenProcessPool as e:
+                discard_pool(pool)
+                if submitted < len(jobs):
+                    pool = get_pool(self.max_workers)
+                self._log_failure(idx, e)
+                results[idx] = DocumentResult(idx, FAILED, detail="OCR failed")
             except Exception as e:
-                logger.exception(f"Document #{idx}: unexpected OCR error, skipping")
-        return texts
\ No newline at end of file
+                if deadline.expired():
+                    results[idx] = self._defer(idx)
+                else:
+                    self._log_failure(idx, e)
+                    results[idx] = DocumentResult(idx, FAILED, detail="OCR failed")
+
+    @staticmethod
+    def _defer(idx: int) -> DocumentResult:
+        logger.warning(f"Document #{idx}: time budget exhausted, deferring")
+        return DocumentResult(idx, DEFERRED, detail="time budget exhausted")
+
+    @staticmethod
+    def _log_failure(idx: int, error: Exception) -> None:
+        if isinstance(error, UnidentifiedImageError):
+            logger.warning(f"Document #{idx}: not a valid image file, skipping")
+        elif isinstance(error, RuntimeError) and "timeout" in str(error).lower():
+            logger.warning(f"Document #{idx}: OCR timed out, skipping")
+        else:
+            logger.error(f"Document #{idx}: unexpected OCR error, skipping", exc_info=error)
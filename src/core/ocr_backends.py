@@ -0,0 +1,168 @@
+"""
+Pluggable OCR backends used by ocr_pool.ocr_image_bytes.
+
+  - "pytesseract" (default): runs the `tesseract` binary (TESSERACT_CMD) once
+    per image via temporary files.
+  - "tesserocr": keeps long-lived in-process tesseract engines, one pool per
+    worker process and language, and hands them in-memory PIL images. Needs
+    the optional `tesserocr` package (built against libtesseract).
+
+Select with OCR_BACKEND.
+"""
+
+import os
+import queue
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "pytesseract"
+
+
+class OCRBackend(ABC):
+    name = ""
+    _version: Optional[str] = None
+
+    def version(self) -> str:
+        """
+        Version of the recognition engine behind this backend (looked up once;
+        part of OCR cache keys, as engines may produce different text).
+        """
+        if self._version is None:
+            try:
+                self._version = self._engine_version()
+            except Exception:
+                logger.warning(f"Could not determine the {self.name} engine version; using 'unknown'")
+                self._version = "unknown"
+        return self._version
+
+    @abstractmethod
+    def _engine_version(self) -> str:
+        pass
+
+    @abstractmethod
+    def image_to_string(self, image: Image.Image, lang: str, timeout: float) -> str:
+        """
+        OCR an image.
+
+        :param lang: tesseract language code(s), e.g. 'eng' or 'eng+ara'
+        :param timeout: seconds before recognition is abandoned (0 disables the limit)
+        """
+
+
+class PytesseractBackend(OCRBackend):
+    name = "pytesseract"
+
+    def __init__(self, tesseract_cmd: Optional[str] = None):
+        import pytesseract
+
+        self._pytesseract = pytesseract
+        self.tesseract_cmd = tesseract_cmd or os.getenv("TESSERACT_CMD", "tesseract")
+        pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+
+    def _engine_version(self) -> str:
+        self._pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+        return f"{self._pytesseract.get_tesseract_version()} (pytesseract {self._pytesseract.__version__})"
+
+    def image_to_string(self, image: Image.Image, lang: str, timeout: float) -> str:
+        self._pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+        return self._pytesseract.image_to_string(image, lang=lang, timeout=timeout)
+
+
+class TesserocrBackend(OCRBackend):
+    name = "tesserocr"
+
+    def __init__(self, pool_size: Optional[int] = None):
+        """
+        :param pool_size: engines kept per language in this process
+                          (default OCR_ENGINE_POOL_SIZE, 1 per pool worker)
+        """
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        if pool_size is None:
+            try:
+                pool_size = int(os.getenv("OCR_ENGINE_POOL_SIZE", "1"))
+            except ValueError:
+                logger.error("Invalid OCR_ENGINE_POOL_SIZE; using 1")
+                pool_size = 1
+        self.pool_size = max(pool_size, 1)
+        self.tessdata_path, _ = tesserocr.get_languages()
+        self._engines: Dict[str, "queue.LifoQueue"] = {}
+        self._created: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _engine_version(self) -> str:
+        # libtesseract, which need not match the tesseract binary's version
+        library = self._tesserocr.tesseract_version().splitlines()[0]
+        return f"{library} (tesserocr {self._tesserocr.__version__})"
+
+    def image_to_string(self, image: Image.Image, lang: str, timeout: float) -> str:
+        api = self._acquire(lang)
+        try:
+            api.SetImage(image)
+            # Recognize() takes milliseconds and returns False when cancelled
+            if not api.Recognize(int(timeout * 1000)):
+                raise RuntimeError("Tesseract process timeout")
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+            self._engines[lang].put(api)
+
+    def _acquire(self, lang: str):
+        """
+        Take an idle engine for `lang`, creating one if the pool is not full yet.
+        """
+        with self._lock:
+            engines = self._engines.setdefault(lang, queue.LifoQueue())
+            create = engines.empty() and self._created.get(lang, 0) < self.pool_size
+            if create:
+                self._created[lang] = self._created.get(lang, 0) + 1
+        if not create:
+            return engines.get()
+
+        logger.info(f"Starting tesseract engine for lang='{lang}'")
+        try:
+            # Loading the language data is the expensive part; done once per engine
+            return self._tesserocr.PyTessBaseAPI(path=self.tessdata_path, lang=lang)
+        except Exception:
+            with self._lock:
+                self._created[lang] -= 1
+            raise
+
+
+_BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+_instances: Dict[str, OCRBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None) -> OCRBackend:
+    """
+    Return this process's instance of the named backend (default OCR_BACKEND).
+
+    Falls back to pytesseract if the requested backend is unknown or cannot be
+    loaded, so a missing optional package never disables OCR.
+    """
+    name = (name or os.getenv("OCR_BACKEND", DEFAULT_BACKEND)).strip().lower()
+    with _instances_lock:
+        backend = _instances.get(name)
+        if backend is None:
+            backend_cls = _BACKENDS.get(name)
+            if backend_cls is None:
+                logger.error(f"Unknown OCR_BACKEND '{name}'; using '{DEFAULT_BACKEND}'")
+                backend_cls = PytesseractBackend
+            try:
+                backend = backend_cls()
+            except ImportError:
+                logger.error(f"OCR backend '{name}' is not installed; using '{DEFAULT_BACKEND}'")
+                backend = PytesseractBackend()
+            _instances[name] = backend
+        return backend
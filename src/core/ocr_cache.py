@@ -0,0 +1,302 @@
+"""
+OCRCache: content-addressed cache for OCR / document extraction results.
+
+Entries are keyed by a SHA-256 of the decoded document bytes plus the OCR
+language and engine version (see ocr_pool.cache_version: everything else
+that changes the extracted text), so resubmitting the same ID card or
+statement reuses the earlier result. Two tiers:
+  - a bounded in-memory LRU (OCR_CACHE_MAX_ENTRIES)
+  - an optional persistent on-disk tier (OCR_CACHE_DIR, empty to disable)
+
+The on-disk tier stores the extracted text of applicants' documents (ID
+cards, bank statements, resumes) unencrypted, i.e. personal data at rest.
+It is created owner-only (directories 0o700, files 0o600) and bounded:
+entries older than OCR_CACHE_TTL seconds are deleted, then the oldest
+entries until the tier is under OCR_CACHE_MAX_DISK_BYTES. Pruning runs
+when the process first uses the cache and every few hundred writes.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.document_payload import DocumentData, iter_chunks
+
+logger = logging.getLogger(__name__)
+
+# Disk writes between two prunes of the on-disk tier
+_PRUNE_EVERY = 256
+
+_tesseract_version: Optional[str] = None
+
+
+def tesseract_version() -> str:
+    """
+    Return the installed tesseract version (looked up once per process).
+    """
+    global _tesseract_version
+    if _tesseract_version is None:
+        try:
+            import pytesseract
+            _tesseract_version = str(pytesseract.get_tesseract_version())
+        except Exception:
+            logger.warning("Could not determine tesseract version; using 'unknown'")
+            _tesseract_version = "unknown"
+    return _tesseract_version
+
+
+class OCRCache:
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_disk_bytes: Optional[int] = None
+    ):
+        """
+        Initialize the cache.
+
+        :param max_entries: in-memory LRU capacity (default from OCR_CACHE_MAX_ENTRIES)
+        :param cache_dir: on-disk tier directory (default from OCR_CACHE_DIR)
+        :param ttl: seconds an on-disk entry is kept (default from OCR_CACHE_TTL; 0 = no limit)
+        :param max_disk_bytes: on-disk tier size limit (default from OCR_CACHE_MAX_DISK_BYTES; 0 = no limit)
+        """
+        if max_entries is None:
+            try:
+                max_entries = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "256"))
+            except ValueError:
+                logger.error("Invalid OCR_CACHE_MAX_ENTRIES; using default 256")
+                max_entries = 256
+        if cache_dir is None:
+            # Holds applicants' document text unencrypted (see module docstring):
+            # keep it on a protected volume, or set it empty to disable the tier
+            cache_dir = os.getenv("OCR_CACHE_DIR", "data/cache/ocr")
+        if ttl is None:
+            try:
+                ttl = float(os.getenv("OCR_CACHE_TTL", "604800"))
+            except ValueError:
+                logger.error("Invalid OCR_CACHE_TTL; using default 604800s")
+                ttl = 604800.0
+        if max_disk_bytes is None:
+            try:
+                max_disk_bytes = int(os.getenv("OCR_CACHE_MAX_DISK_BYTES", str(512 * 1024 * 1024)))
+            except ValueError:
+                logger.error("Invalid OCR_CACHE_MAX_DISK_BYTES; using default 512 MiB")
+                max_disk_bytes = 512 * 1024 * 1024
+
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir or None
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._private_dirs: Set[str] = set()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+    @staticmethod
+    def make_key(data: DocumentData, language: str, engine_version: Optional[str] = None) -> str:
+        """
+        Build the cache key for a document's decoded bytes (hashed in chunks).
+        """
+        digest = hashlib.sha256()
+        for chunk in iter_chunks(data):
+            digest.update(chunk)
+        digest.update(b"\0" + language.encode("utf-8"))
+        digest.update(b"\0" + (engine_version or tesseract_version()).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._remember(key, text)
+        self._write_disk(key, text)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters for sizing the cache.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+            }
+
+    def clear(self) -> None:
+        """
+        Drop the in-memory tier (the on-disk tier is left in place).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def prune(self) -> int:
+        """
+        Evict on-disk entries past the TTL, then the oldest ones until the
+        tier fits in max_disk_bytes (skipped if another thread is pruning).
+
+        :return: number of entries removed
+        """
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return 0
+        if not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            now = time.time()
+            entries: List[Tuple[float, int, str]] = []
+            expired: List[str] = []
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if name.endswith(".tmp"):
+                        # Left behind by a crashed write
+                        if now - st.st_mtime > 3600:
+                            expired.append(path)
+                    elif self.ttl > 0 and now - st.st_mtime > self.ttl:
+                        expired.append(path)
+                    else:
+                        entries.append((st.st_mtime, st.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            if self.max_disk_bytes > 0 and total > self.max_disk_bytes:
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= self.max_disk_bytes:
+                        break
+                    expired.append(path)
+                    total -= size
+
+            removed = 0
+            for path in expired:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    logger.warning(f"Failed to evict OCR cache file {path}", exc_info=True)
+            with self._lock:
+                self.disk_evictions += removed
+                self._writes_since_prune = 0
+            if removed:
+                logger.info(f"Evicted {removed} OCR cache entries from {self.cache_dir}")
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    def _remember(self, key: str, text: str) -> None:
+        # Caller holds the lock
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if self.ttl > 0 and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                with self._lock:
+                    self.disk_evictions += 1
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning(f"Failed to read OCR cache entry {key}", exc_info=True)
+            return None
+
+    def _write_disk(self, key: str, text: str) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            self._make_private_dir(os.path.dirname(path))
+            # Write-then-rename so concurrent readers never see a partial
+            # entry; mkstemp creates the file 0o600
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning(f"Failed to write OCR cache entry {key}", exc_info=True)
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= _PRUNE_EVERY
+        if due:
+            self.prune()
+
+    def _make_private_dir(self, path: str) -> None:
+        """
+        Create the cache directory and a shard directory owner-only, once
+        per process (also tightening directories created by an older version).
+        """
+        if path in self._private_dirs:
+            return
+        for directory in (self.cache_dir, path):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # makedirs' mode is subject to the umask and skips existing directories
+            os.chmod(directory, 0o700)
+        self._private_dirs.add(path)
+
+
+_cache: Optional[OCRCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_ocr_cache() -> OCRCache:
+    """
+    Return the process-wide cache shared by ImageOCR and DocumentProcessor.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = OCRCache()
+            _cache.prune()
+        return _cache
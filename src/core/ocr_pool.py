@@ -0,0 +1,122 @@
+"""
+Process-wide OCR worker pool shared by ImageOCR, DocumentProcessor and the
+PDF page pipeline, plus the picklable OCR entry points that run inside it.
+"""
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from src.core.document_payload import DocumentData, open_stream
+from src.core.image_preprocessing import ImagePreprocessor
+from src.core.ocr_backends import get_backend
+from src.core.ocr_cache import tesseract_version
+
+logger = logging.getLogger(__name__)
+
+# One pool per process, shared by every caller so that building an ImageOCR
+# per request does not fork a fresh set of workers each time.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+# Built lazily in each worker process from that process's environment
+_preprocessor: Optional[ImagePreprocessor] = None
+
+
+def get_preprocessor() -> ImagePreprocessor:
+    global _preprocessor
+    if _preprocessor is None:
+        _preprocessor = ImagePreprocessor()
+    return _preprocessor
+
+
+def cache_version(backend: Optional[str] = None) -> str:
+    """
+    What determines OCR output besides a document's bytes and language, for
+    OCRCache keys: the tesseract version, the OCR backend actually used
+    (after any fallback) and its engine version, and the preprocessing
+    settings (workers build their preprocessor from the same environment).
+
+    :param backend: OCR backend name (default OCR_BACKEND)
+    """
+    engine = get_backend(backend)
+    return f"{tesseract_version()};{engine.name} {engine.version()};{get_preprocessor().signature()}"
+
+
+def get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return the process-wide OCR pool, recreating it if the worker count changed.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_workers = max_workers
+            logger.info(f"Started OCR process pool with {max_workers} workers")
+        return _pool
+
+
+def discard_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken pool so the next request starts a fresh one.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+            _pool_workers = 0
+    pool.shutdown(wait=False, cancel_futures=True)
+    logger.warning("OCR process pool broke; it will be restarted on next use")
+
+
+def shutdown_pool() -> None:
+    """
+    Stop the shared OCR pool (e.g. on application shutdown).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            logger.info("OCR process pool stopped")
+        _pool = None
+        _pool_workers = 0
+
+
+def ocr_image_bytes(
+    img_bytes: DocumentData,
+    timeout: float,
+    lang: str = "eng",
+    backend: Optional[str] = None,
+    preprocess: bool = True,
+) -> str:
+    """
+    OCR a single decoded image (bytes or an uploaded file). Module-level so
+    it can run in a pool worker.
+
+    :param timeout: seconds before tesseract is killed (0 disables the limit)
+    :param backend: OCR backend name (default OCR_BACKEND)
+    :param preprocess: run the ImagePreprocessor stages before tesseract
+    """
+    with Image.open(open_stream(img_bytes)) as img:
+        if preprocess:
+            img = get_preprocessor()(img)
+        return get_backend(backend).image_to_string(img, lang=lang, timeout=timeout)
+
+
+def ocr_worker(img_bytes: bytes, timeout: float, lang: str, backend: Optional[str] = None) -> str:
+    """
+    Pool entry point. Some pytesseract errors cannot be pickled back to the
+    parent (and would break the pool), so they are re-raised as RuntimeError.
+    """
+    try:
+        return ocr_image_bytes(img_bytes, timeout, lang, backend)
+    except UnidentifiedImageError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
@@ -0,0 +1,196 @@
+"""
+PDFPagePipeline: page-level text extraction for PDFs.
+
+Pages are streamed one at a time. A page keeps its text layer when it has one;
+pages without text (scans) are rasterised and OCR'd in the shared worker pool
+while later pages are still being read. Extraction stops early once the page
+budget (PDF_MAX_PAGES) or time budget (PDF_TIME_BUDGET seconds) is used up.
+"""
+
+import io
+import os
+import time
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from src.core import ocr_pool
+from src.core.deadline import Deadline
+from src.core.document_payload import DocumentData, open_stream
+from src.core.ocr_backends import DEFAULT_BACKEND
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PDFExtraction:
+    text: str
+    pages_total: int
+    pages_processed: int
+    pages_ocr: int
+    truncated: bool
+
+
+class PDFPagePipeline:
+    def __init__(self, ocr_language: str = "eng"):
+        """
+        Initialize the pipeline from environment-based settings.
+
+        :param ocr_language: language code for OCR of scanned pages
+        """
+        self.ocr_language = ocr_language
+        self.backend = os.getenv("OCR_BACKEND", DEFAULT_BACKEND)
+        try:
+            self.max_workers = int(os.getenv("OCR_MAX_WORKERS", "1"))
+            self.page_timeout = float(os.getenv("OCR_DOCUMENT_TIMEOUT", "30"))
+            self.max_pages = int(os.getenv("PDF_MAX_PAGES", "50"))
+            self.time_budget = float(os.getenv("PDF_TIME_BUDGET", "60"))
+            self.min_text_chars = int(os.getenv("PDF_MIN_TEXT_CHARS", "20"))
+        except ValueError:
+            logger.error("Invalid PDF pipeline configuration; using defaults")
+            self.max_workers = 1
+            self.page_timeout = 30.0
+            self.max_pages = 50
+            self.time_budget = 60.0
+            self.min_text_chars = 20
+
+    def extract(self, raw_bytes: DocumentData, deadline: Optional[Deadline] = None) -> PDFExtraction:
+        """
+        Extract text from every page within budget, in page order.
+
+        :param raw_bytes: PDF document bytes or uploaded file
+        :param deadline: request-level deadline; the PDF stops at whichever
+                         of it and PDF_TIME_BUDGET comes first
+        :return: PDFExtraction with the joined text and page counters
+        """
+        stop_at = time.monotonic() + self.time_budget
+        if deadline is not None and deadline.expires_at is not None:
+            stop_at = min(stop_at, deadline.expires_at)
+        import PyPDF2  # imported on the first PDF, not at API startup
+
+        reader = PyPDF2.PdfReader(open_stream(raw_bytes))
+        pages_total = len(reader.pages)
+        pool = ocr_pool.get_pool(self.max_workers) if self.max_workers > 1 else None
+
+        page_texts: Dict[int, Union[str, Future]] = {}
+        pages_ocr = 0
+        truncated = False
+        for page_no in range(pages_total):
+            if page_no >= self.max_pages or time.monotonic() >= stop_at:
+                logger.warning(
+                    f"PDF budget exhausted after {page_no}/{pages_total} pages; stopping early"
+                )
+                truncated = True
+                break
+
+            page = reader.pages[page_no]
+            text = (page.extract_text() or "").strip()
+            if len(text) >= self.min_text_chars:
+                page_texts[page_no] = text
+                continue
+
+            image_bytes = self._rasterize(page, page_no)
+            if image_bytes is None:
+                page_texts[page_no] = text
+                continue
+
+            pages_ocr += 1
+            if pool is not None:
+                page_texts[page_no] = pool.submit(
+                    ocr_pool.ocr_worker, image_bytes, self._ocr_timeout(stop_at),
+                    self.ocr_language, self.backend
+                )
+            else:
+                page_texts[page_no] = self._ocr_inline(image_bytes, page_no, stop_at)
+
+        texts: List[str] = []
+        for page_no in sorted(page_texts):
+            result = page_texts[page_no]
+            if isinstance(result, Future):
+                result, finished = self._collect(result, page_no, pool, stop_at)
+                truncated = truncated or not finished
+            if result:
+                texts.append(result)
+
+        return PDFExtraction(
+            text="\n".join(texts).strip(),
+            pages_total=pages_total,
+            pages_processed=len(page_texts),
+            pages_ocr=pages_ocr,
+            truncated=truncated,
+        )
+
+    def _ocr_timeout(self, deadline: float) -> float:
+        """
+        Per-page tesseract timeout, capped by what is left of the time budget.
+        """
+        remaining = max(deadline - time.monotonic(), 0.001)
+        return min(self.page_timeout, remaining) if self.page_timeout else remaining
+
+    def _ocr_inline(self, image_bytes: bytes, page_no: int, deadline: float) -> str:
+        try:
+            return ocr_pool.ocr_image_bytes(
+                image_bytes, self._ocr_timeout(deadline), self.ocr_language, self.backend
+            ).strip()
+        except Exception:
+            logger.warning(f"PDF page {page_no}: OCR failed, skipping", exc_info=True)
+            return ""
+
+    def _collect(self, future: Future, page_no: int, pool, deadline: float):
+        """
+        Wait for a page's OCR within the time budget.
+
+        :return: (text, finished) where finished is False if the page was abandoned
+        """
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0)).strip(), True
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning(f"PDF page {page_no}: OCR did not finish within budget")
+            return "", False
+        except BrokenProcessPool:
+            ocr_pool.discard_pool(pool)
+            logger.warning(f"PDF page {page_no}: OCR pool broke, skipping page")
+            return "", True
+        except Exception as e:
+            logger.warning(f"PDF page {page_no}: OCR failed ({e}), skipping")
+            return "", True
+
+    @staticmethod
+    def _rasterize(page, page_no: int) -> Optional[bytes]:
+        """
+        Return an image of a page that has no text layer.
+
+        Scanned PDFs embed one image per page, so the largest embedded image is
+        used directly. If there is none and pypdfium2 is installed, the page is
+        rendered instead.
+        """
+        try:
+            images = list(page.images)
+        except Exception:
+            logger.debug(f"PDF page {page_no}: could not read embedded images", exc_info=True)
+            images = []
+        if images:
+            return max(images, key=lambda img: len(img.data)).data
+
+        try:
+            import pypdfium2
+        except ImportError:
+            logger.info(f"PDF page {page_no}: no text layer or embedded image; skipping")
+            return None
+        try:
+            import PyPDF2
+
+            writer = PyPDF2.PdfWriter()
+            writer.add_page(page)
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            rendered = pypdfium2.PdfDocument(buffer.getvalue())[0].render(scale=300 / 72)
+            out = io.BytesIO()
+            rendered.to_pil().save(out, format="PNG")
+            return out.getvalue()
+        except Exception:
+            logger.warning(f"PDF page {page_no}: rendering failed, skipping", exc_info=True)
+            return None
@@ -0,0 +1,154 @@
+"""
+Declarative recommendation rules (config/recommendation_rules.yml), compiled
+once into a RuleSet that RecommendationEngine evaluates per application and
+that can score a whole DataFrame of applicants at once (e.g. to re-score
+history against a policy change).
+"""
+
+import os
+import logging
+import operator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import yaml
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+# Feature name → extractor over AgentOrchestrator's processed_data
+FEATURES: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    "income": lambda d: (d.get("eligibility_inputs") or {}).get("income", 0),
+    "family_size": lambda d: (d.get("eligibility_inputs") or {}).get("family_size", 0),
+    "doc_count": lambda d: len(d.get("documents") or []),
+    "ocr_text_length": lambda d: sum(len(text) for text in d.get("ocr_texts") or []),
+    "eligibility": lambda d: d.get("eligibility", "unknown"),
+    "employment_count": lambda d: (d.get("resume_data") or {}).get("employment_count", 0),
+    "net_worth": lambda d: (d.get("financial_data") or {}).get("net_worth", 0),
+}
+
+# (feature, operator, value) with thresholds already substituted
+Condition = Tuple[str, Callable[[Any, Any], Any], Any]
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    conditions: Tuple[Condition, ...]
+    recommendation: str
+
+
+class RuleSet:
+    def __init__(self, rules: List[Rule]):
+        """
+        :param rules: in priority order, ending with an unconditional fallback
+        """
+        if not rules or rules[-1].conditions:
+            raise ValueError("The last recommendation rule must have no conditions")
+        self.rules = rules
+        # Only features some rule looks at are extracted, each once per call
+        self.features = sorted({feature for rule in rules for feature, _, _ in rule.conditions})
+
+    @classmethod
+    def compile(cls, table: Any, thresholds: Mapping[str, Any]) -> "RuleSet":
+        """
+        Compile a rules table (list of {name, when, recommendation}).
+
+        :param thresholds: values for "$name" references in conditions
+        :raises ValueError: on unknown features / operators / thresholds
+        """
+        if not isinstance(table, list):
+            raise ValueError("recommendation_rules must be a list")
+        rules = []
+        for position, entry in enumerate(table):
+            name = str(entry.get("name", position))
+            when = entry.get("when") or {}
+            if not isinstance(when, dict) or "recommendation" not in entry:
+                raise ValueError(f"Rule {name!r} needs a 'when' mapping and a 'recommendation'")
+            conditions = []
+            for feature, tests in when.items():
+                if feature not in FEATURES:
+                    raise ValueError(f"Rule {name!r}: unknown feature {feature!r}")
+                if not isinstance(tests, dict):
+                    tests = {"eq": tests}
+                for op, value in tests.items():
+                    if op not in OPERATORS:
+                        raise ValueError(f"Rule {name!r}: unknown operator {op!r}")
+                    if isinstance(value, str) and value.startswith("$"):
+                        if value[1:] not in thresholds:
+                            raise ValueError(f"Rule {name!r}: unknown threshold {value!r}")
+                        value = thresholds[value[1:]]
+                    conditions.append((feature, OPERATORS[op], value))
+            rules.append(Rule(name, tuple(conditions), str(entry["recommendation"])))
+        return cls(rules)
+
+    @classmethod
+    def load(cls, path: str, thresholds: Mapping[str, Any]) -> "RuleSet":
+        with open(path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        if not isinstance(config, dict):
+            raise ValueError(f"{path} must contain a mapping")
+        return cls.compile(config.get("recommendation_rules"), thresholds)
+
+    def extract(self, processed_data: Mapping[str, Any]) -> Dict[str, Any]:
+        return {feature: FEATURES[feature](processed_data) for feature in self.features}
+
+    def evaluate(self, features: Mapping[str, Any]) -> Rule:
+        """
+        First rule whose conditions all hold for one applicant's features.
+        """
+        for rule in self.rules:
+            if all(op(features[feature], value) for feature, op, value in rule.conditions):
+                return rule
+        return self.rules[-1]
+
+    def evaluate_frame(self, frame: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Evaluate every row of a DataFrame with one column per feature
+        (e.g. pd.DataFrame([ruleset.extract(d) for d in history])).
+
+        :return: DataFrame with 'rule' and 'recommendation', same index
+        :raises ValueError: if a feature column is missing
+        """
+        # Only batch re-scoring needs pandas; API workers never import it
+        import pandas as pd
+
+        missing = [feature for feature in self.features if feature not in frame.columns]
+        if missing:
+            raise ValueError(f"Frame is missing feature columns: {', '.join(missing)}")
+
+        columns = {feature: frame[feature].to_numpy() for feature in self.features}
+        conditions = []
+        for rule in self.rules[:-1]:
+            matched = np.ones(len(frame), dtype=bool)
+            for feature, op, value in rule.conditions:
+                matched &= np.asarray(op(columns[feature], value), dtype=bool)
+            conditions.append(matched)
+
+        fallback = len(self.rules) - 1
+        if conditions:
+            positions = np.select(conditions, list(range(fallback)), default=fallback)
+        else:
+            positions = np.full(len(frame), fallback)
+        names = np.array([rule.name for rule in self.rules], dtype=object)
+        texts = np.array([rule.recommendation for rule in self.rules], dtype=object)
+        return pd.DataFrame(
+            {"rule": names[positions], "recommendation": texts[positions]}, index=frame.index
+        )
+
+
+def rules_path(settings: Optional[Mapping[str, Any]] = None) -> str:
+    settings = os.environ if settings is None else settings
+    return settings.get("RECOMMENDATION_RULES_PATH", "config/recommendation_rules.yml")
@@ -0,0 +1,163 @@
+"""
+StageCheckpointStore: per-application progress of the decision pipeline.
+
+AgentOrchestrator.run_async() records the state after every named stage
+(documents, validation, extraction, eligibility, recommendation, decision).
+A checkpoint is keyed by the application ID and a hash of the application's
+inputs, so a client retrying a failed application with the same ID resumes
+after the last completed stage — documents are not OCR'd again — while a
+retry with different inputs starts over. The route removes the checkpoint
+once the application is committed.
+
+Checkpoints are JSON files under PIPELINE_CHECKPOINT_DIR (empty to disable)
+and expire after PIPELINE_CHECKPOINT_TTL seconds (expired ones are pruned
+when the process first uses the store).
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.core.document_payload import DocumentPayload, iter_chunks
+
+logger = logging.getLogger(__name__)
+
+
+def input_hash(
+    applicant_id: str,
+    income: float,
+    family_size: int,
+    documents: Sequence[Union[str, DocumentPayload]]
+) -> str:
+    """
+    SHA-256 over everything the pipeline's output depends on (uploaded files
+    are hashed by content, in chunks).
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([applicant_id, income, family_size]).encode("utf-8"))
+    for doc in documents:
+        digest.update(b"\0")
+        if isinstance(doc, DocumentPayload):
+            for chunk in iter_chunks(doc):
+                digest.update(chunk)
+        else:
+            digest.update(doc.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StageCheckpointStore:
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        :param directory: where checkpoints are kept (default from PIPELINE_CHECKPOINT_DIR)
+        :param ttl: seconds a checkpoint stays usable (default from PIPELINE_CHECKPOINT_TTL)
+        """
+        if directory is None:
+            directory = os.getenv("PIPELINE_CHECKPOINT_DIR", "data/checkpoints/pipeline")
+        if ttl is None:
+            try:
+                ttl = float(os.getenv("PIPELINE_CHECKPOINT_TTL", "86400"))
+            except ValueError:
+                logger.error("Invalid PIPELINE_CHECKPOINT_TTL; using default 86400s")
+                ttl = 86400.0
+        self.directory = directory or None
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def load(self, application_id: str, key: str) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Completed stage names and the pipeline state after the last of them,
+        or nothing if there is no usable checkpoint for these inputs.
+        """
+        path = self._path(application_id)
+        if path is None or not os.path.isfile(path):
+            return [], {}
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return [], {}
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Unreadable pipeline checkpoint for {application_id}; starting over")
+            return [], {}
+        if data.get("input_hash") != key:
+            logger.info(f"Inputs of application {application_id} changed; starting over")
+            return [], {}
+        return list(data["completed"]), data["state"]
+
+    def save(
+        self, application_id: str, key: str, completed: Sequence[str], state: Dict[str, Any]
+    ) -> None:
+        path = self._path(application_id)
+        if path is None:
+            return
+        try:
+            # Write-then-rename so a crash never leaves a truncated checkpoint
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"input_hash": key, "completed": list(completed), "state": state}, f)
+            os.replace(path + ".tmp", path)
+        except (OSError, TypeError, ValueError):
+            # Checkpoints only save work on retries; never fail the request
+            logger.exception(f"Could not checkpoint application {application_id}")
+
+    def clear(self, application_id: str) -> None:
+        path = self._path(application_id)
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning(f"Could not remove pipeline checkpoint of {application_id}")
+
+    def prune(self) -> int:
+        """
+        Remove expired checkpoints (of applications that were never retried).
+
+        :return: number of checkpoints removed
+        """
+        if self.directory is None or not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _path(self, application_id: str) -> Optional[str]:
+        if self.directory is None:
+            return None
+        # Application IDs may come from clients: hash them into a safe file name
+        name = hashlib.sha256(application_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+
+_store: Optional[StageCheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> StageCheckpointStore:
+    """
+    Return the process-wide checkpoint store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = StageCheckpointStore()
+            _store.prune()
+        return _store
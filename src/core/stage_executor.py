@@ -0,0 +1,121 @@
+"""
+StageExecutor: bounded thread pool for the blocking stages of
+AgentOrchestrator.run_async (OCR, document parsing).
+
+Async routes offload those stages here so the event loop keeps serving other
+requests (health checks included). Admission is per request: at most
+PIPELINE_MAX_PENDING applications are in the pipeline at once (running or
+waiting for one of the PIPELINE_MAX_WORKERS threads); beyond that a request
+is rejected immediately with PipelineBusyError instead of queueing up.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineBusyError(RuntimeError):
+    """
+    Raised when the pipeline already holds PIPELINE_MAX_PENDING requests.
+    """
+
+
+class StageExecutor:
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Initialize the executor.
+
+        :param max_workers: threads running stages (default from PIPELINE_MAX_WORKERS)
+        :param max_pending: requests admitted at once (default from PIPELINE_MAX_PENDING)
+        """
+        try:
+            if max_workers is None:
+                max_workers = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+            if max_pending is None:
+                max_pending = int(os.getenv("PIPELINE_MAX_PENDING", "8"))
+        except ValueError:
+            logger.error("Invalid PIPELINE_MAX_WORKERS/PIPELINE_MAX_PENDING; using defaults")
+            max_workers, max_pending = 4, 8
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        Reserve a pipeline slot for one request, or fail fast.
+
+        :raises PipelineBusyError: if every slot is taken
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PipelineBusyError(f"Pipeline is at capacity ({self.max_pending} requests)")
+        with self._lock:
+            self.admitted += 1
+            self.in_flight += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking stage on the pool and await its result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(fn, *args))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[StageExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_stage_executor() -> StageExecutor:
+    """
+    Return the process-wide executor shared by all requests.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = StageExecutor()
+        return _executor
+
+
+def shutdown_stage_executor() -> None:
+    """
+    Stop the shared executor (e.g. on application shutdown).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
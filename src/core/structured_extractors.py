@@ -0,0 +1,183 @@
+"""
+Structured extractors for resumes and financial statements.
+
+Resume patterns are compiled once at import. Financial statements are
+summarised by a registry of per-format extractors that stream the file and
+only look at the Assets / Liabilities columns: CSV through the csv module,
+Excel workbooks through openpyxl (.xlsx) or xlrd (.xls), imported on first
+use so workers that never see a spreadsheet don't pay for them.
+"""
+
+import re
+import csv
+import codecs
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from src.core.document_format import parse_mime
+from src.core.document_payload import DocumentData, open_stream, read_all
+
+logger = logging.getLogger(__name__)
+
+# Financial statement formats
+CSV = "csv"
+XLSX = "xlsx"
+XLS = "xls"
+
+ASSETS_COLUMN = "Assets"
+LIABILITIES_COLUMN = "Liabilities"
+
+_FORMAT_BY_EXTENSION = {".csv": CSV, ".xlsx": XLSX, ".xls": XLS}
+_FORMAT_BY_MIME = {
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": XLSX,
+    "application/vnd.ms-excel": XLS,
+}
+
+_RESUME_PATTERN = re.compile(
+    r"(?:Title|Position|Role):\s*(.+)\s*(?:Duration|Period):\s*(.+)", re.I
+)
+
+
+# ─── Typed results ─────────────────────────────────────────────────────
+@dataclass
+class EmploymentRecord:
+    title: str
+    duration: str
+
+
+@dataclass
+class ResumeData:
+    employment_history: List[EmploymentRecord] = field(default_factory=list)
+
+    @property
+    def employment_count(self) -> int:
+        return len(self.employment_history)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "employment_history": [asdict(record) for record in self.employment_history],
+            "employment_count": self.employment_count,
+        }
+
+
+@dataclass
+class FinancialSummary:
+    total_assets: float = 0.0
+    total_liabilities: float = 0.0
+
+    @property
+    def net_worth(self) -> float:
+        return self.total_assets - self.total_liabilities
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "total_assets": self.total_assets,
+            "total_liabilities": self.total_liabilities,
+            "net_worth": self.net_worth,
+        }
+
+
+# ─── Resumes ───────────────────────────────────────────────────────────
+def parse_resume(text: str) -> ResumeData:
+    """
+    Employment history ("Title: … Duration: …" lines) from resume text.
+    """
+    return ResumeData([
+        EmploymentRecord(title.strip(), duration.strip())
+        for title, duration in _RESUME_PATTERN.findall(text)
+    ])
+
+
+# ─── Financial statements ──────────────────────────────────────────────
+def financial_format(name: Optional[str], mime: Optional[str] = None) -> Optional[str]:
+    """
+    Statement format from a file name / URL extension or MIME type, or None
+    if the document is not a supported spreadsheet.
+    """
+    name = (name or "").lower().split("?", 1)[0]
+    for extension, fmt in _FORMAT_BY_EXTENSION.items():
+        if name.endswith(extension):
+            return fmt
+    return _FORMAT_BY_MIME.get(parse_mime(mime))
+
+
+def extract_financial(data: DocumentData, fmt: str = CSV) -> FinancialSummary:
+    """
+    Sum the Assets and Liabilities columns of a statement.
+
+    Missing columns count as 0; empty or non-numeric cells are skipped.
+
+    :raises ValueError: for an unsupported format
+    """
+    try:
+        extractor = _FINANCIAL_EXTRACTORS[fmt]
+    except KeyError:
+        raise ValueError(f"Unsupported financial statement format {fmt!r}")
+    return extractor(data)
+
+
+def _csv_summary(data: DocumentData) -> FinancialSummary:
+    return _summarise(csv.reader(codecs.iterdecode(open_stream(data), "utf-8-sig")))
+
+
+def _xlsx_summary(data: DocumentData) -> FinancialSummary:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(open_stream(data), read_only=True, data_only=True)
+    try:
+        return _summarise(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def _xls_summary(data: DocumentData) -> FinancialSummary:
+    import xlrd
+
+    # Legacy .xls has no streaming reader; xlrd needs the whole file
+    workbook = xlrd.open_workbook(file_contents=read_all(data), on_demand=True)
+    try:
+        sheet = workbook.sheet_by_index(0)
+        return _summarise(sheet.row_values(i) for i in range(sheet.nrows))
+    finally:
+        workbook.release_resources()
+
+
+def _summarise(rows: Iterable[Sequence[Any]]) -> FinancialSummary:
+    rows = iter(rows)
+    header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+    # A missing column is read from an always-empty extra cell
+    width = len(header)
+    assets_pos = header.index(ASSETS_COLUMN) if ASSETS_COLUMN in header else width
+    liabilities_pos = header.index(LIABILITIES_COLUMN) if LIABILITIES_COLUMN in header else width
+    summary = FinancialSummary()
+    if assets_pos == width and liabilities_pos == width:
+        return summary
+
+    assets = liabilities = 0.0
+    for row in rows:
+        # Hot loop: plain float() and exceptions instead of per-cell type checks;
+        # NaN cells (v != v) are skipped like pandas does
+        try:
+            value = float(row[assets_pos])
+            if value == value:
+                assets += value
+        except (IndexError, TypeError, ValueError):
+            pass
+        try:
+            value = float(row[liabilities_pos])
+            if value == value:
+                liabilities += value
+        except (IndexError, TypeError, ValueError):
+            pass
+    summary.total_assets, summary.total_liabilities = assets, liabilities
+    return summary
+
+
+_FINANCIAL_EXTRACTORS: Dict[str, Callable[[DocumentData], FinancialSummary]] = {
+    CSV: _csv_summary,
+    XLSX: _xlsx_summary,
+    XLS: _xls_summary,
+}
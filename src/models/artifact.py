@@ -0,0 +1,199 @@
+"""
+Compact, versioned artifact for linear eligibility models.
+
+Training exports a fitted binary linear classifier (e.g. sklearn's
+LogisticRegression) as JSON: coefficients, intercept, class labels and the
+feature order, plus a SHA-256 over those parameters. EligibilityEngine scores
+from the artifact with plain NumPy, so API workers never import sklearn or
+unpickle arbitrary objects. Other model types keep using the pickle path.
+
+Export an existing pickle:
+  python -m src.models.artifact src/models/eligibility_model.pkl \
+      --features income family_size
+"""
+
+import os
+import json
+import hashlib
+import logging
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT = "linear-classifier"
+FORMAT_VERSION = 1
+
+# What EligibilityEngine supplies, in column order: the training scripts
+# export eligibility models with exactly these features
+ELIGIBILITY_FEATURES = ("income", "family_size")
+
+
+def artifact_path_for(model_path: str) -> str:
+    """
+    Artifact file that sits next to a pickled model (model.pkl → model.json).
+    """
+    return os.path.splitext(model_path)[0] + ".json"
+
+
+@dataclass
+class LinearModelArtifact:
+    feature_names: List[str]
+    coef: np.ndarray
+    intercept: float
+    classes: List[Any]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def sha256(self) -> str:
+        return _params_hash(self._params())
+
+    def predict(self, features: Mapping[str, Any]) -> np.ndarray:
+        """
+        Class labels for named feature columns (scalars or 1-D arrays).
+
+        Same decision rule as LogisticRegression.predict: the positive class
+        where coef · x + intercept > 0.
+
+        :raises ValueError: if a feature the model was trained on is missing
+        """
+        missing = [name for name in self.feature_names if name not in features]
+        if missing:
+            raise ValueError(f"Model needs features not provided: {', '.join(missing)}")
+        X = np.column_stack(
+            [np.atleast_1d(np.asarray(features[name], dtype=float)) for name in self.feature_names]
+        )
+        scores = X @ self.coef + self.intercept
+        return np.where(scores > 0, self.classes[1], self.classes[0])
+
+    def to_dict(self) -> Dict[str, Any]:
+        params = self._params()
+        return {
+            "format": FORMAT,
+            "format_version": FORMAT_VERSION,
+            **params,
+            "metadata": self.metadata,
+            "sha256": _params_hash(params),
+        }
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "LinearModelArtifact":
+        """
+        Read and verify an artifact.
+
+        :raises ValueError: on an unknown format/version or a hash mismatch
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != FORMAT or data.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model artifact {data.get('format')!r} v{data.get('format_version')!r}"
+            )
+        artifact = cls(
+            feature_names=list(data["feature_names"]),
+            coef=np.asarray(data["coef"], dtype=float),
+            intercept=float(data["intercept"]),
+            classes=list(data["classes"]),
+            metadata=data.get("metadata") or {},
+        )
+        if len(artifact.coef) != len(artifact.feature_names) or len(artifact.classes) != 2:
+            raise ValueError(f"Malformed model artifact at '{path}'")
+        if artifact.sha256 != data.get("sha256"):
+            raise ValueError(f"Model artifact hash mismatch at '{path}'")
+        return artifact
+
+    @classmethod
+    def from_estimator(
+        cls,
+        model: Any,
+        feature_names: Optional[Sequence[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> "LinearModelArtifact":
+        """
+        Capture a fitted binary linear classifier.
+
+        :param feature_names: column order (default: the model's feature_names_in_)
+        :raises ValueError: if the model is not a binary linear classifier
+        """
+        coef = np.asarray(getattr(model, "coef_", None), dtype=float)
+        classes = list(np.asarray(getattr(model, "classes_", [])).tolist())
+        if coef.ndim != 2 or coef.shape[0] != 1 or len(classes) != 2:
+            raise ValueError(f"{type(model).__name__} is not a binary linear classifier")
+        if feature_names is None:
+            feature_names = getattr(model, "feature_names_in_", None)
+            if feature_names is None:
+                raise ValueError("feature_names are required for models fitted without column names")
+        feature_names = [str(name) for name in feature_names]
+        if len(feature_names) != coef.shape[1]:
+            raise ValueError(f"Model has {coef.shape[1]} features, got {len(feature_names)} names")
+
+        meta = {"model_type": f"{type(model).__module__}.{type(model).__name__}"}
+        meta.update(metadata or {})
+        return cls(
+            feature_names=feature_names,
+            coef=coef[0],
+            intercept=float(np.ravel(model.intercept_)[0]),
+            classes=classes,
+            metadata=meta,
+        )
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "feature_names": list(self.feature_names),
+            "coef": [float(c) for c in self.coef],
+            "intercept": float(self.intercept),
+            "classes": list(self.classes),
+        }
+
+
+def export_model(
+    model: Any,
+    path: str,
+    feature_names: Optional[Sequence[str]] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> LinearModelArtifact:
+    """
+    Write a fitted model's artifact to `path` (used by the training scripts).
+    """
+    artifact = LinearModelArtifact.from_estimator(model, feature_names, metadata)
+    artifact.save(path)
+    logger.info(f"Model artifact saved to {path} (sha256 {artifact.sha256[:12]})")
+    return artifact
+
+
+def _params_hash(params: Mapping[str, Any]) -> str:
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def main():
+    import pickle
+
+    parser = argparse.ArgumentParser(description="Export a pickled linear model as a JSON artifact")
+    parser.add_argument("model_path", help="Pickled sklearn model")
+    parser.add_argument("--output", help="Artifact path (default: next to the pickle, .json)")
+    parser.add_argument("--features", nargs="+", help="Feature order (default: from the model)")
+    args = parser.parse_args()
+
+    with open(args.model_path, "rb") as f:
+        model = pickle.load(f)
+    export_model(
+        model,
+        args.output or artifact_path_for(args.model_path),
+        feature_names=args.features,
+        metadata={"source": os.path.basename(args.model_path)},
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -6,6 +6,7 @@ import os
 import logging
 import argparse
 import pickle
+from datetime import datetime, timezone
 
 import pandas as pd
 from sklearn.model_selection import train_test_split
@@ -14,6 +15,8 @@ from sklearn.metrics import classification_report
 
 from dotenv import load_dotenv
 
+from src.models.artifact import ELIGIBILITY_FEATURES, artifact_path_for, export_model
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,16 +32,18 @@ def train_eligibility_model(
 ):
     """
     Train a logistic regression model for eligibility.
-    Expects a CSV with columns: income, family_size, doc_count, label
+    Expects a CSV with columns: income, family_size, label
     where label is 1 (approve) or 0 (soft decline).
+
+    Saves the pickled model and its JSON artifact (same path, .json).
     """
     logger.info(f"Loading training data from {input_csv}")
     df = pd.read_csv(input_csv)
-    if not {'income', 'family_size', 'doc_count', 'label'}.issubset(df.columns):
+    if not {*ELIGIBILITY_FEATURES, 'label'}.issubset(df.columns):
         logger.error("Input CSV missing required columns")
         return
 
-    X = df[['income', 'family_size', 'doc_count']]
+    X = df[list(ELIGIBILITY_FEATURES)]
     y = df['label']
 
     logger.info("Splitting data")
@@ -60,6 +65,16 @@ def train_eligibility_model(
     with open(model_output_path, 'wb') as f:
         pickle.dump(model, f)
     logger.info(f"Model saved to {model_output_path}")
+    export_model(
+        model,
+        artifact_path_for(model_output_path),
+        feature_names=ELIGIBILITY_FEATURES,
+        metadata={
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+            "training_csv": os.path.basename(input_csv),
+            "training_rows": int(len(X_train)),
+        },
+    )
 
 def main():
     load_dotenv()
@@ -0,0 +1,135 @@
+"""
+Applicant rows on first sight.
+
+ensure_applicant() creates the applicant with a single
+INSERT ... ON CONFLICT DO NOTHING (PostgreSQL and SQLite), so concurrent
+requests for a new applicant cannot race between a lookup and an insert.
+IDs known to exist are kept in a bounded in-process LRU
+(APPLICANT_CACHE_SIZE, default 10000; 0 disables it), and a known ID needs
+no database call at all.
+
+An ID is only cached once the transaction that inserted it has committed:
+a rolled-back insert must not be remembered, or later rows referencing the
+applicant would violate the foreign key. Applicants are never deleted, so
+cached IDs do not go stale.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.db import Applicant
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_applicants"
+
+
+class ApplicantCache:
+    """
+    Thread-safe LRU set of applicant IDs known to exist.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, applicant_id: str) -> bool:
+        with self._lock:
+            if applicant_id not in self._ids:
+                return False
+            self._ids.move_to_end(applicant_id)
+            return True
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, applicant_id: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._ids[applicant_id] = None
+            self._ids.move_to_end(applicant_id)
+            while len(self._ids) > self.maxsize:
+                self._ids.popitem(last=False)
+
+
+def _insert_ignore(dialect: str, applicant_id: str):
+    module = {"postgresql": postgresql, "sqlite": sqlite}.get(dialect)
+    if module is None:
+        return None
+    return module.insert(Applicant).values(
+        applicant_id=applicant_id, demographic={}
+    ).on_conflict_do_nothing(index_elements=[Applicant.applicant_id])
+
+
+def _remember(session) -> None:
+    for cache, applicant_id in session.info.pop(_PENDING_KEY, ()):
+        cache.add(applicant_id)
+
+
+def _forget(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _remember_on_commit(db: AsyncSession, cache: ApplicantCache, applicant_id: str) -> None:
+    session = db.sync_session
+    pending: Optional[List[Tuple[ApplicantCache, str]]] = session.info.get(_PENDING_KEY)
+    if pending is None:
+        pending = session.info[_PENDING_KEY] = []
+        if not event.contains(session, "after_commit", _remember):
+            event.listen(session, "after_commit", _remember)
+            event.listen(session, "after_rollback", _forget)
+    pending.append((cache, applicant_id))
+
+
+async def ensure_applicant(
+    db: AsyncSession, applicant_id: str, cache: Optional[ApplicantCache] = None
+) -> bool:
+    """
+    Make sure an applicant row exists, as part of the session's transaction.
+
+    :param cache: known-ID cache (default: the process-wide one)
+    :return: True if the database was queried (the ID is cached once the
+             caller commits), False if the ID was already known
+    """
+    cache = get_applicant_cache() if cache is None else cache
+    if applicant_id in cache:
+        return False
+
+    statement = _insert_ignore(db.get_bind().dialect.name, applicant_id)
+    if statement is not None:
+        await db.execute(statement)
+    elif await db.get(Applicant, applicant_id) is None:
+        # Other databases: lookup then insert (may race, as before)
+        db.add(Applicant(applicant_id=applicant_id, demographic={}))
+        await db.flush()
+    _remember_on_commit(db, cache, applicant_id)
+    return True
+
+
+_cache: Optional[ApplicantCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_applicant_cache() -> ApplicantCache:
+    """
+    Return the process-wide cache of known applicant IDs.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                maxsize = int(os.getenv("APPLICANT_CACHE_SIZE", "10000"))
+            except ValueError:
+                logger.error("Invalid APPLICANT_CACHE_SIZE; using default 10000")
+                maxsize = 10000
+            _cache = ApplicantCache(maxsize)
+        return _cache
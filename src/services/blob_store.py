@@ -0,0 +1,261 @@
+"""
+Content-addressed blob store for application documents.
+
+Documents are stored once under the SHA-256 of their bytes and referenced
+from Application.raw_data as {"blob": "sha256:<hex>", "mime", "size",
+"filename"}, instead of keeping base64 data URIs in the JSON column.
+Storing the same document again (resubmissions, retries) is a no-op.
+
+Backends (BLOB_STORE):
+  - "local": files under BLOB_STORE_DIR (default data/blobs), fanned out by
+    the first two hex digits
+  - "s3": an S3-compatible bucket (BLOB_S3_BUCKET, BLOB_S3_PREFIX); point
+    BLOB_S3_ENDPOINT_URL at a local stand-in such as MinIO. boto3 is
+    imported on first use.
+  - "" (empty): disabled; documents are recorded as before
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import IO, Any, Dict, Optional, Tuple, Union
+
+from src.core.data_uri import InvalidDataURIError, decode_data_uri, is_base64_data_uri
+from src.core.document_payload import DocumentPayload, DocumentTooLargeError, open_stream
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "sha256:"
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _spool(stream: IO[bytes], directory: Optional[str] = None) -> Tuple[IO[bytes], str, int]:
+    """
+    Copy a stream to a temporary file, hashing it on the way.
+
+    :return: (temporary file positioned at 0, blob key, size)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    spool = tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", delete=False)
+    try:
+        while True:
+            chunk = stream.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            spool.write(chunk)
+            size += len(chunk)
+        spool.flush()
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        os.remove(spool.name)
+        raise
+    return spool, KEY_PREFIX + digest.hexdigest(), size
+
+
+def _hex(key: str) -> str:
+    if not key.startswith(KEY_PREFIX):
+        raise ValueError(f"Not a blob key: {key!r}")
+    digest = key[len(KEY_PREFIX):]
+    if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+        raise ValueError(f"Not a blob key: {key!r}")
+    return digest
+
+
+class BlobStore:
+    """
+    Interface of the blob store backends.
+    """
+
+    def put(self, stream: IO[bytes]) -> Tuple[str, int]:
+        """
+        Store a stream's bytes (once per content).
+
+        :return: (blob key "sha256:<hex>", size)
+        """
+        raise NotImplementedError
+
+    def open(self, key: str) -> IO[bytes]:
+        """
+        :raises KeyError: if there is no such blob
+        """
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+
+    def put(self, stream: IO[bytes]) -> Tuple[str, int]:
+        os.makedirs(self.root, exist_ok=True)
+        spool, key, size = _spool(stream, self.root)
+        spool.close()
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(spool.name)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomic: concurrent writers of the same content both end up with one file
+            os.replace(spool.name, path)
+        return key, size
+
+    def open(self, key: str) -> IO[bytes]:
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def _path(self, key: str) -> str:
+        digest = _hex(key)
+        return os.path.join(self.root, digest[:2], digest)
+
+
+class S3BlobStore(BlobStore):
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        client: Any = None
+    ):
+        """
+        :param endpoint_url: S3-compatible endpoint (e.g. a local MinIO)
+        :param client: boto3 S3 client to use instead of building one
+        """
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url or None)
+        return self._client
+
+    def put(self, stream: IO[bytes]) -> Tuple[str, int]:
+        # The key is only known once the content is hashed
+        spool, key, size = _spool(stream)
+        try:
+            if not self.exists(key):
+                self.client.upload_fileobj(spool, self.bucket, self._object(key))
+        finally:
+            spool.close()
+            os.remove(spool.name)
+        return key, size
+
+    def open(self, key: str) -> IO[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._object(key))["Body"]
+        except self.client.exceptions.NoSuchKey:
+            raise KeyError(key)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object(key))
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def _object(self, key: str) -> str:
+        digest = _hex(key)
+        return f"{self.prefix}{digest[:2]}/{digest}"
+
+
+def store_document(
+    store: BlobStore, doc: Union[str, DocumentPayload]
+) -> Union[str, Dict[str, Any]]:
+    """
+    Store an application document and return what raw_data keeps for it.
+
+    Uploaded files and base64 data URIs become blob references; other
+    strings (URLs, paths) already are references and are returned as is. A
+    data URI that cannot be decoded is recorded without its payload.
+    """
+    if isinstance(doc, DocumentPayload):
+        key, size = store.put(open_stream(doc))
+        return {"blob": key, "mime": doc.mime, "size": size, "filename": doc.name}
+    if not is_base64_data_uri(doc):
+        return doc
+    try:
+        payload = decode_data_uri(doc)
+    except (InvalidDataURIError, DocumentTooLargeError) as e:
+        logger.warning(f"Not storing undecodable document: {e}")
+        return {"blob": None, "detail": str(e)}
+    try:
+        key, size = store.put(payload.body)
+    finally:
+        payload.body.close()
+    return {"blob": key, "mime": payload.mime, "size": size, "filename": None}
+
+
+def has_inline_documents(raw_data: Optional[Dict[str, Any]]) -> bool:
+    documents = (raw_data or {}).get("documents")
+    return isinstance(documents, list) and any(
+        isinstance(doc, str) and is_base64_data_uri(doc) for doc in documents
+    )
+
+
+def migrate_raw_data(store: BlobStore, raw_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    raw_data with its inline data URIs moved to the blob store, or None if
+    it has none (already migrated or never had any).
+    """
+    if not has_inline_documents(raw_data):
+        return None
+    documents = raw_data["documents"]
+    migrated = dict(raw_data)
+    migrated["documents"] = [
+        store_document(store, doc) if isinstance(doc, str) else doc for doc in documents
+    ]
+    return migrated
+
+
+def blob_store_from_env(settings: Optional[Dict[str, Any]] = None) -> Optional[BlobStore]:
+    settings = os.environ if settings is None else settings
+    backend = settings.get("BLOB_STORE", "local").strip().lower()
+    if not backend:
+        return None
+    if backend == "local":
+        return LocalBlobStore(settings.get("BLOB_STORE_DIR", "data/blobs"))
+    if backend == "s3":
+        bucket = settings.get("BLOB_S3_BUCKET")
+        if not bucket:
+            raise ValueError("BLOB_STORE=s3 requires BLOB_S3_BUCKET")
+        return S3BlobStore(
+            bucket,
+            prefix=settings.get("BLOB_S3_PREFIX", "documents/"),
+            endpoint_url=settings.get("BLOB_S3_ENDPOINT_URL"),
+        )
+    raise ValueError(f"Unknown BLOB_STORE {backend!r} (expected local, s3 or empty)")
+
+
+_store: Optional[BlobStore] = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """
+    Return the process-wide blob store configured by BLOB_STORE (None if disabled).
+    """
+    global _store, _store_loaded
+    with _store_lock:
+        if not _store_loaded:
+            _store = blob_store_from_env()
+            _store_loaded = True
+        return _store
@@ -0,0 +1,251 @@
+"""
+ChatHistoryBuffer: write-behind persistence of chat messages.
+
+The chatbot route appends ChatHistory rows to the buffer and returns without
+waiting for the database. A background task writes the buffered rows with
+one bulk INSERT when CHAT_HISTORY_BATCH_SIZE rows are pending or
+CHAT_HISTORY_FLUSH_INTERVAL seconds have passed, whichever comes first, and
+the app lifespan drains the buffer on shutdown.
+
+Rows are written in the order they were appended by a single flusher, and
+carry the time they were appended, so messages of a session keep their
+order. At CHAT_HISTORY_MAX_PENDING rows appends wait for a flush instead of
+growing the buffer without bound.
+
+When the database is unreachable the whole batch stays at the front of the
+buffer for the next flush. When a batch fails for any other reason (a bad
+row), its rows are retried one at a time; a row that has failed
+CHAT_HISTORY_MAX_ATTEMPTS times is logged and dropped, so one bad row cannot
+block the buffer.
+"""
+
+import os
+import time
+import hashlib
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.db import AsyncSessionLocal, ChatHistory, get_async_engine
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ("session_id", "applicant_id", "role", "message", "timestamp")
+# The database, not the rows: retrying row by row would not help
+_UNAVAILABLE = (OperationalError, InterfaceError, ConnectionError, asyncio.TimeoutError)
+
+
+def _error(e: BaseException) -> str:
+    """
+    Name an error without its message: database errors quote the statement
+    parameters, i.e. the applicants' chat messages.
+    """
+    if isinstance(e, DBAPIError) and e.orig is not None:
+        return f"{type(e).__name__} ({type(e.orig).__name__})"
+    return type(e).__name__
+
+
+class ChatHistoryBuffer:
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None
+    ):
+        """
+        Initialize the buffer (call start() to begin flushing).
+
+        :param batch_size: rows that trigger a flush (default from CHAT_HISTORY_BATCH_SIZE)
+        :param flush_interval: max seconds a row waits (default from CHAT_HISTORY_FLUSH_INTERVAL)
+        :param max_pending: rows buffered before appends wait (default from CHAT_HISTORY_MAX_PENDING)
+        :param max_attempts: failed writes before a row is dropped (default from CHAT_HISTORY_MAX_ATTEMPTS)
+        :param session_factory: async sessions to write with (default: the app's async engine)
+        """
+        try:
+            if batch_size is None:
+                batch_size = int(os.getenv("CHAT_HISTORY_BATCH_SIZE", "100"))
+            if flush_interval is None:
+                flush_interval = float(os.getenv("CHAT_HISTORY_FLUSH_INTERVAL", "0.5"))
+            if max_pending is None:
+                max_pending = int(os.getenv("CHAT_HISTORY_MAX_PENDING", "10000"))
+            if max_attempts is None:
+                max_attempts = int(os.getenv("CHAT_HISTORY_MAX_ATTEMPTS", "3"))
+        except ValueError:
+            logger.error("Invalid CHAT_HISTORY_* settings; using defaults")
+            batch_size, flush_interval, max_pending, max_attempts = 100, 0.5, 10000, 3
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max(max_pending, batch_size)
+        self.max_attempts = max(max_attempts, 1)
+        self._session_factory = session_factory
+        self._rows: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.dropped_rows = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────
+    async def start(self) -> None:
+        if self._session_factory is None:
+            get_async_engine()
+            self._session_factory = AsyncSessionLocal
+        self._closing = False
+        self._task = asyncio.create_task(self._run(), name="chat-history-flusher")
+
+    async def close(self) -> None:
+        """
+        Stop the flusher after writing every buffered row.
+        """
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self._rows:
+            logger.error(f"Chat history buffer closed with {len(self._rows)} unwritten rows")
+
+    # ─── Producers ──────────────────────────────────────────────────────
+    async def append(self, session_id: str, applicant_id: str, role: str, message: str) -> None:
+        """
+        Buffer one chat message; waits only if the buffer is full.
+        """
+        while len(self._rows) >= self.max_pending and not self._closing:
+            self._wakeup.set()
+            self._drained.clear()
+            await self._drained.wait()
+        self._rows.append({
+            "session_id": session_id,
+            "applicant_id": applicant_id,
+            "role": role,
+            "message": message,
+            "timestamp": datetime.now(timezone.utc),
+        })
+        if len(self._rows) >= self.batch_size:
+            self._wakeup.set()
+
+    # ─── Flushing ───────────────────────────────────────────────────────
+    async def flush(self) -> int:
+        """
+        Write the buffered rows with one bulk INSERT (row by row if it fails).
+
+        :return: rows written (rows that could not be written stay buffered,
+                 unless they have used up their attempts)
+        """
+        async with self._flush_lock:
+            if not self._rows:
+                return 0
+            rows: List[Dict[str, Any]] = [self._rows.popleft() for _ in range(len(self._rows))]
+            start = time.perf_counter()
+            written, retry = 0, rows
+            try:
+                await self._write(rows)
+                written, retry = len(rows), []
+            except _UNAVAILABLE as e:
+                self.failed_flushes += 1
+                logger.error(f"Chat history flush of {len(rows)} rows failed ({_error(e)}); will retry")
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.error(
+                    f"Chat history flush of {len(rows)} rows failed ({_error(e)}); writing them one by one"
+                )
+                written, retry = await self._write_each(rows)
+            finally:
+                # Back in front, in their original order
+                self._rows.extendleft(reversed(retry))
+                self._drained.set()
+
+            if written:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.flushes += 1
+                self.flushed_rows += written
+                self.last_flush_ms = elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                self._total_flush_ms += elapsed_ms
+            return written
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        async with self._session_factory() as db:
+            await db.execute(insert(ChatHistory), [{c: row[c] for c in _COLUMNS} for row in rows])
+            await db.commit()
+
+    async def _write_each(self, rows: List[Dict[str, Any]]):
+        """
+        Write rows one at a time, isolating the ones that cannot be written.
+
+        :return: (rows written, rows to keep for the next flush)
+        """
+        written, retry = 0, []
+        for i, row in enumerate(rows):
+            try:
+                await self._write([row])
+                written += 1
+            except _UNAVAILABLE as e:
+                logger.error(f"Database unavailable ({_error(e)}); keeping the remaining chat history rows")
+                retry.extend(rows[i:])
+                break
+            except Exception as e:
+                row["attempts"] = row.get("attempts", 0) + 1
+                if row["attempts"] < self.max_attempts:
+                    retry.append(row)
+                    continue
+                self.dropped_rows += 1
+                # Identifies the message without logging its text
+                message = (row["message"] or "").encode("utf-8")
+                logger.error(
+                    f"Dropping chat history row after {row['attempts']} failed writes ({_error(e)}): "
+                    f"session {row['session_id']}, applicant {row['applicant_id']}, role {row['role']}, "
+                    f"message of {len(message)} bytes, sha256 {hashlib.sha256(message).hexdigest()[:16]}"
+                )
+        return written, retry
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._closing:
+                # Drain, giving up after a few failed attempts rather than hanging shutdown
+                for _ in range(3):
+                    await self.flush()
+                    if not self._rows:
+                        return
+                    await asyncio.sleep(self.flush_interval)
+                return
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Chat history flusher error ({_error(e)})")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._rows),
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "dropped_rows": self.dropped_rows,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
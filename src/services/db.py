@@ -1,25 +1,124 @@
 import os
 import logging
-from typing import Generator
+import threading
+from typing import Any, AsyncGenerator, Dict, Generator, Mapping, Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy import (
     create_engine,
     Column, String, Float, Integer, JSON,
-    DateTime, ForeignKey, func
+    DateTime, ForeignKey, Index, func
 )
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
 logger = logging.getLogger(__name__)
 
 # ─── Engine & Session Setup ────────────────────────────────────────────
-DATABASE_URL = os.environ["POSTGRES_URL"]
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Engines are created on first use (API startup, first session), so that
+# importing the models neither needs POSTGRES_URL nor touches the database.
+# The async routes use the asyncpg-backed async engine; scripts, startup
+# table creation and batch jobs use the synchronous one.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
+
+# Async driver for each synchronous URL scheme
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def engine_options(url: str, settings: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """
+    create_engine() options from DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE (seconds) and DB_ECHO (false, true or debug to also log
+    result rows).
+    """
+    settings = os.environ if settings is None else settings
+    echo = str(settings.get("DB_ECHO", "false")).strip().lower()
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "echo": "debug" if echo == "debug" else echo in ("1", "true", "yes"),
+    }
+    # SQLite (tests, benchmarks) uses single-connection pools without sizing
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+    try:
+        options["pool_size"] = int(settings.get("DB_POOL_SIZE", "5"))
+        options["max_overflow"] = int(settings.get("DB_MAX_OVERFLOW", "10"))
+        options["pool_recycle"] = int(settings.get("DB_POOL_RECYCLE", "1800"))
+    except ValueError:
+        logger.error("Invalid DB_POOL_SIZE/DB_MAX_OVERFLOW/DB_POOL_RECYCLE; using defaults")
+        options.update(pool_size=5, max_overflow=10, pool_recycle=1800)
+    return options
+
+
+def async_url(url: str) -> str:
+    """
+    The async-driver equivalent of a database URL (postgresql:// → asyncpg).
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} URLs")
+    return parsed.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def _database_url() -> str:
+    url = os.getenv("POSTGRES_URL")
+    if not url:
+        raise RuntimeError("POSTGRES_URL must be set in the environment")
+    return url
+
+
+def get_engine() -> Engine:
+    """
+    Return the process-wide engine for POSTGRES_URL, creating it on first use.
+
+    :raises RuntimeError: if POSTGRES_URL is not set
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            url = _database_url()
+            _engine = create_engine(url, **engine_options(url))
+            SessionLocal.configure(bind=_engine)
+        return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the process-wide async engine for POSTGRES_URL, creating it on first use.
+
+    :raises RuntimeError: if POSTGRES_URL is not set
+    """
+    global _async_engine
+    with _engine_lock:
+        if _async_engine is None:
+            url = _database_url()
+            _async_engine = create_async_engine(async_url(url), **engine_options(url))
+            AsyncSessionLocal.configure(bind=_async_engine)
+        return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """
+    Close the async engine's pooled connections (on application shutdown).
+    """
+    global _async_engine
+    with _engine_lock:
+        engine, _async_engine = _async_engine, None
+    if engine is not None:
+        await engine.dispose()
+
 # ─── ORM Models ────────────────────────────────────────────────────────
 class Applicant(Base):
     __tablename__ = "applicants"
@@ -46,6 +145,17 @@ class Application(Base):
                             server_default=func.now(),
                             nullable=False)
 
+    # An applicant's applications, newest first (keyset pagination). On
+    # PostgreSQL the listed columns ride along, so listings without
+    # raw_data are index-only scans.
+    __table_args__ = (
+        Index(
+            "ix_applications_applicant_created", "applicant_id", "created_at",
+            postgresql_include=["application_id", "income", "family_size",
+                                "eligibility", "recommendation"],
+        ),
+    )
+
 class ChatHistory(Base):
     __tablename__ = "chat_history"
     id           = Column(Integer, primary_key=True, autoincrement=True)
@@ -61,10 +171,22 @@ class ChatHistory(Base):
                           server_default=func.now(),
                           nullable=False)
 
+    # A session's messages in order (keyset pagination)
+    __table_args__ = (
+        Index("ix_chat_history_session_timestamp", "session_id", "timestamp"),
+    )
+
 # ─── Dependency: DB session generator ─────────────────────────────────
 def get_db_session() -> Generator[Session, None, None]:
+    get_engine()
     db: Session = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
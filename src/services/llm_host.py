@@ -1,6 +1,5 @@
 import os
 import logging
-import requests
 from fastapi import HTTPException, status
 
 logger = logging.getLogger(__name__)
@@ -39,6 +38,9 @@ class LLMClient:
             "stream": False,
         }
 
+        # Imported on the first chat request, not at API startup
+        import requests
+
         try:
             resp = requests.post(
                 url,
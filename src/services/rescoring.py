@@ -0,0 +1,212 @@
+"""
+Bulk re-scoring of stored applications after a threshold, model or rules
+change (see scripts/rescore_applications.py).
+
+Applications are streamed from the database in application_id order through
+a server-side cursor, re-assessed in chunks from their stored income /
+family_size and processed_data (raw_data) — no OCR is repeated — and rows
+whose eligibility or recommendation changed are written back with one
+executemany UPDATE per chunk.
+
+The id space is split into contiguous partitions that separate worker
+processes handle independently. The partition plan and each partition's last
+committed application_id are checkpointed as JSON, so an interrupted run
+resumes after the last committed chunk.
+"""
+
+import os
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.core.eligibility_engine import EligibilityEngine
+from src.core.recommendation_engine import RecommendationEngine
+from src.services.db import Application
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    Application.application_id,
+    Application.income,
+    Application.family_size,
+    Application.eligibility,
+    Application.recommendation,
+    Application.raw_data,
+)
+
+
+@dataclass
+class Partition:
+    index: int
+    # application_id range [lower, upper); None means unbounded
+    lower: Optional[str]
+    upper: Optional[str]
+
+
+@dataclass
+class PartitionResult:
+    index: int
+    scanned: int = 0
+    changed: int = 0
+    last_id: Optional[str] = None
+
+
+class Checkpoint:
+    def __init__(self, directory: str):
+        """
+        Partition plan (plan.json) and per-partition progress
+        (partition-<n>.json) under `directory`.
+        """
+        self.directory = directory
+
+    def load_plan(self) -> Optional[List[Partition]]:
+        data = self._read("plan.json")
+        return [Partition(**p) for p in data["partitions"]] if data else None
+
+    def save_plan(self, partitions: Sequence[Partition]) -> None:
+        self._write("plan.json", {"partitions": [asdict(p) for p in partitions]})
+
+    def load_progress(self, index: int) -> Optional[PartitionResult]:
+        data = self._read(f"partition-{index}.json")
+        return PartitionResult(**data) if data else None
+
+    def save_progress(self, result: PartitionResult) -> None:
+        self._write(f"partition-{result.index}.json", asdict(result))
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name == "plan.json" or name.startswith("partition-"):
+                os.remove(os.path.join(self.directory, name))
+
+    def _read(self, name: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.directory, name)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, name: str, data: Dict[str, Any]) -> None:
+        # Write-then-rename so a crash never leaves a truncated checkpoint
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+
+
+def plan_partitions(db_engine: Engine, workers: int) -> List[Partition]:
+    """
+    Split applications into up to `workers` contiguous application_id ranges
+    of roughly equal size.
+    """
+    with db_engine.connect() as conn:
+        total = conn.execute(select(func.count()).select_from(Application)).scalar_one()
+        bounds: List[Optional[str]] = [None]
+        for i in range(1, max(workers, 1)):
+            boundary = conn.execute(
+                select(Application.application_id)
+                .order_by(Application.application_id)
+                .offset(total * i // workers)
+                .limit(1)
+            ).scalar()
+            if boundary is not None and boundary != bounds[-1]:
+                bounds.append(boundary)
+    bounds.append(None)
+    return [Partition(i, bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def rescore_partition(
+    database_url: str,
+    partition: Partition,
+    checkpoint_dir: str,
+    chunk_size: int = 1000,
+    dry_run: bool = False,
+    settings: Optional[Dict[str, Any]] = None
+) -> PartitionResult:
+    """
+    Re-score one partition, resuming after its checkpoint. Runs in a worker
+    process, so it builds its own database and decision engines.
+    """
+    checkpoint = Checkpoint(checkpoint_dir)
+    result = checkpoint.load_progress(partition.index) or PartitionResult(partition.index)
+    eligibility_engine = EligibilityEngine(settings)
+    recommendation_engine = RecommendationEngine(settings)
+
+    db_engine = create_engine(database_url, pool_pre_ping=True)
+    try:
+        # Reads stream on one connection; each chunk's writes commit on another
+        with db_engine.connect() as reader, Session(db_engine) as writer:
+            for rows in _stream_chunks(reader, partition, result.last_id, chunk_size):
+                changes = rescore_rows(rows, eligibility_engine, recommendation_engine)
+                if changes and not dry_run:
+                    # ORM bulk UPDATE by primary key: one executemany per chunk
+                    writer.execute(update(Application), changes)
+                    writer.commit()
+                result.scanned += len(rows)
+                result.changed += len(changes)
+                result.last_id = rows[-1].application_id
+                if not dry_run:
+                    checkpoint.save_progress(result)
+                logger.info(
+                    f"Partition {partition.index}: {result.scanned} scanned, "
+                    f"{result.changed} changed (at {result.last_id})"
+                )
+    finally:
+        db_engine.dispose()
+    return result
+
+
+def rescore_rows(
+    rows: Sequence[Any],
+    eligibility_engine: EligibilityEngine,
+    recommendation_engine: RecommendationEngine
+) -> List[Dict[str, Any]]:
+    """
+    Re-assess a chunk of application rows in batch.
+
+    :return: {application_id, eligibility, recommendation} for changed rows
+    """
+    incomes = np.array([row.income for row in rows], dtype=float)
+    family_sizes = np.array([row.family_size for row in rows], dtype=float)
+    eligibility = eligibility_engine.assess_batch(incomes, family_sizes)
+
+    rules = recommendation_engine.rules
+    features = []
+    for row, decision in zip(rows, eligibility):
+        # Same processed_data the pipeline built, with the new eligibility
+        processed_data = dict(row.raw_data or {})
+        processed_data["eligibility_inputs"] = {"income": row.income, "family_size": row.family_size}
+        processed_data["eligibility"] = decision
+        features.append(rules.extract(processed_data))
+    recommendations = rules.evaluate_frame(pd.DataFrame(features, columns=rules.features))
+
+    return [
+        {"application_id": row.application_id, "eligibility": decision, "recommendation": text}
+        for row, decision, text in zip(rows, eligibility, recommendations["recommendation"])
+        if decision != row.eligibility or text != row.recommendation
+    ]
+
+
+def _stream_chunks(
+    conn: Any, partition: Partition, after: Optional[str], chunk_size: int
+) -> Iterator[List[Any]]:
+    query = select(*_COLUMNS).order_by(Application.application_id)
+    if after is not None:
+        query = query.where(Application.application_id > after)
+    elif partition.lower is not None:
+        query = query.where(Application.application_id >= partition.lower)
+    if partition.upper is not None:
+        query = query.where(Application.application_id < partition.upper)
+
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+    for rows in result.partitions():
+        yield list(rows)
@@ -4,7 +4,6 @@ Streamlit UI for Social Support Application Demo, with stable session_state hand
 
 import os
 import json
-import base64
 import requests
 import streamlit as st
 from src.core.agent_orchestrator import AgentOrchestrator
@@ -38,27 +37,26 @@ if submitted:
     if not applicant_id:
         st.error("Please enter an Applicant ID.")
     else:
-        # Build and store documents in session_state
-        st.session_state.documents = []
-        for f in docs or []:
-            raw  = f.read()
-            mime = f.type or "application/octet-stream"
-            b64  = base64.b64encode(raw).decode("utf-8")
-            st.session_state.documents.append(f"data:{mime};base64,{b64}")
+        # Remember the uploaded file names in session_state
+        st.session_state.documents = [f.name for f in docs or []]
 
-        # Now safe to reference session_state.documents
-        payload = {
+        # Files go up as multipart parts (no base64 inflation)
+        form = {
             "applicant_id": applicant_id,
-            "income":       income,
-            "family_size":  family_size,
-            "documents":    st.session_state.documents,
+            "income":       str(income),
+            "family_size":  str(int(family_size)),
         }
+        files = [
+            ("documents", (f.name, f, f.type or "application/octet-stream"))
+            for f in docs or []
+        ]
 
         api_url = os.environ["API_URL"].rstrip("/")
         try:
             resp = requests.post(
-                f"{api_url}/application/",
-                json=payload,
+                f"{api_url}/application/upload",
+                data=form,
+                files=files,
                 timeout=(10, 120)
             )
             resp.raise_for_status()
@@ -69,6 +67,11 @@ if submitted:
             st.write(f"**Eligibility:** {data['eligibility']}")
             st.write(f"**Recommendation:** {data['recommendation']}")
             st.write(f"**Final Decision:** {data['final_decision']}")
+            unfinished = [d for d in data.get("documents", []) if d["status"] != "complete"]
+            for doc in unfinished:
+                name = (st.session_state.documents[doc["document_index"]]
+                        if doc["document_index"] < len(st.session_state.documents) else doc["document_index"])
+                st.warning(f"Document {name}: {doc['status']} ({doc.get('detail') or 'no detail'})")
         except Exception as e:
             st.error(f"Submission error: {e}")
 
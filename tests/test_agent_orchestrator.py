@@ -0,0 +1,178 @@
+import asyncio
+import base64
+import threading
+
+import pytest
+from src.core.agent_orchestrator import AgentOrchestrator
+from src.core.data_uri import decode_data_uri
+from src.core.deadline import COMPLETE, DocumentResult
+from src.core.eligibility_engine import EligibilityEngine
+from src.core.recommendation_engine import RecommendationEngine
+from src.core.stage_executor import PipelineBusyError, StageExecutor
+
+
+class _BarrierOCR:
+    ocr_language = "eng"
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def extract_documents(self, documents, deadline=None):
+        self.barrier.wait(timeout=5)
+        return [DocumentResult(i, COMPLETE, "id card") for i in range(len(documents))]
+
+
+class _BarrierProcessor:
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def process(self, documents, applicant_id, deadline=None):
+        self.barrier.wait(timeout=5)
+        return {
+            "documents": [{"document_index": 0, "text": "Title: Clerk Duration: 2 years"}],
+            "document_status": [{"document_index": 0, "status": COMPLETE, "detail": None}],
+        }
+
+    def open_document(self, doc_ref, deadline=None):
+        return decode_data_uri(doc_ref)
+
+
+def _orchestrator(barrier):
+    return AgentOrchestrator(
+        ocr=_BarrierOCR(barrier),
+        eligibility_engine=EligibilityEngine(settings={}),
+        recommendation_engine=RecommendationEngine(settings={}),
+        document_processor=_BarrierProcessor(barrier),
+    )
+
+
+def _data_uri(mime, payload):
+    return f"data:{mime};base64,{base64.b64encode(payload).decode()}"
+
+
+def test_run_async_runs_document_stages_concurrently():
+    # OCR and resume parsing only get past the barrier if they run at the same time
+    orchestrator = _orchestrator(threading.Barrier(2))
+    documents = [
+        _data_uri("image/png", b"png"),
+        "https://example.com/docs/resume.pdf",
+        _data_uri("text/csv", b"Assets,Liabilities\n100,40\n50,10\n"),
+    ]
+
+    result = asyncio.run(orchestrator.run_async(
+        "a1", documents, income=1500.0, family_size=3, executor=StageExecutor(4, 4)
+    ))
+
+    data = result["processed_data"]
+    assert data["ocr_texts"] == ["id card", "Title: Clerk Duration: 2 years"]
+    assert data["resume_data"]["employment_count"] == 1
+    assert data["financial_data"]["net_worth"] == 100.0
+    assert [s["status"] for s in data["document_status"]] == [COMPLETE] * 3
+    assert result["eligibility"] == "approved"
+
+
+def test_run_async_rejects_when_pipeline_is_full():
+    orchestrator = _orchestrator(threading.Barrier(1))
+    executor = StageExecutor(max_workers=1, max_pending=1)
+
+    async def scenario():
+        async with executor.admit():
+            await orchestrator.run_async("a2", [], 1500.0, 3, executor=executor)
+
+    with pytest.raises(PipelineBusyError):
+        asyncio.run(scenario())
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["in_flight"] == 0
+
+
+class _RecordingOCR(_BarrierOCR):
+    def __init__(self):
+        super().__init__(threading.Barrier(1))
+        self.seen = []
+
+    def extract_documents(self, documents, deadline=None):
+        self.seen.extend(documents)
+        return super().extract_documents(documents, deadline)
+
+
+class _CountingEligibility:
+    def __init__(self):
+        self.calls = 0
+
+    def assess(self, income, family_size):
+        self.calls += 1
+        return "approved"
+
+
+def test_run_incremental_async_processes_only_new_documents():
+    ocr = _RecordingOCR()
+    eligibility = _CountingEligibility()
+    orchestrator = AgentOrchestrator(
+        ocr=ocr,
+        eligibility_engine=eligibility,
+        recommendation_engine=RecommendationEngine(settings={}),
+        document_processor=_BarrierProcessor(threading.Barrier(1)),
+    )
+    stored = {
+        "documents": ["https://example.com/docs/resume.pdf", "data:image/png;base64,AA=="],
+        "ocr_texts": ["Title: Clerk Duration: 2 years", "old id"],
+        "document_status": [
+            {"document_index": 0, "status": COMPLETE, "detail": None},
+            {"document_index": 1, "status": COMPLETE, "detail": None},
+        ],
+        "resume_data": {
+            "employment_history": [{"title": "Clerk", "duration": "2 years"}],
+            "employment_count": 1,
+        },
+        "financial_data": {"total_assets": 100.0, "total_liabilities": 40.0, "net_worth": 60.0},
+        "eligibility_inputs": {"income": 1500.0, "family_size": 3},
+        # Decided by an earlier model: not kept
+        "eligibility": "declined",
+    }
+    new = [
+        _data_uri("image/png", b"png"),
+        _data_uri("text/csv", b"Assets,Liabilities\n50,80\n"),
+    ]
+
+    result = asyncio.run(orchestrator.run_incremental_async(
+        "a1", stored, new, income=1500.0, family_size=3, executor=StageExecutor(2, 2)
+    ))
+
+    data = result["processed_data"]
+    assert ocr.seen == [new[0]]
+    assert data["documents"] == stored["documents"] + new
+    assert data["ocr_texts"] == stored["ocr_texts"] + ["id card"]
+    assert [s["document_index"] for s in data["document_status"]] == [0, 1, 2, 3]
+    assert data["resume_data"]["employment_count"] == 1
+    assert data["financial_data"] == {"total_assets": 150.0, "total_liabilities": 120.0, "net_worth": 30.0}
+    # Re-assessed by the current engine even for the same income / family size
+    assert eligibility.calls == 1
+    assert result["eligibility"] == data["eligibility"] == "approved"
+
+
+def test_documents_are_recorded_as_blob_references(tmp_path):
+    from src.services.blob_store import LocalBlobStore
+
+    store = LocalBlobStore(str(tmp_path))
+    orchestrator = _orchestrator(threading.Barrier(1))
+    orchestrator.blob_store = store
+    png = _data_uri("image/png", b"png")
+
+    result = asyncio.run(orchestrator.run_async("a1", [png], 1500.0, 3, executor=StageExecutor(2, 2)))
+
+    (ref,) = result["processed_data"]["documents"]
+    assert ref["mime"] == "image/png" and ref["size"] == 3
+    assert store.open(ref["blob"]).read() == b"png"
+
+
+def test_uploads_are_recorded_by_metadata_without_blob_store():
+    import io
+    from src.core.document_payload import DocumentPayload
+
+    orchestrator = _orchestrator(threading.Barrier(1))
+    orchestrator.blob_store = None
+    upload = DocumentPayload(body=io.BytesIO(b"png"), mime="image/png", size=3, name="id.png")
+
+    result = asyncio.run(orchestrator.run_async("a1", [upload], 1500.0, 3, executor=StageExecutor(2, 2)))
+
+    assert result["processed_data"]["documents"] == [{"filename": "id.png", "mime": "image/png", "size": 3}]
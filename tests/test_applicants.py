@@ -0,0 +1,68 @@
+import asyncio
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.services.applicants import ApplicantCache, _insert_ignore, ensure_applicant
+from src.services.db import Applicant, Base, async_url
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ApplicantCache(2)
+    cache.add("a")
+    cache.add("b")
+    assert "a" in cache  # refreshes "a"
+    cache.add("c")
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert len(cache) == 2
+
+    disabled = ApplicantCache(0)
+    disabled.add("a")
+    assert "a" not in disabled
+
+
+def test_postgres_upsert_is_a_single_statement():
+    sql = str(_insert_ignore("postgresql", "a1").compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (applicant_id) DO NOTHING" in sql
+    assert _insert_ignore("mysql", "a1") is None
+
+
+def test_ensure_applicant_is_idempotent_and_cached_after_commit(tmp_path):
+    url = f"sqlite:///{tmp_path / 'applicants.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    cache = ApplicantCache(10)
+
+    async def scenario():
+        async_engine = create_async_engine(async_url(url))
+        sessions = async_sessionmaker(async_engine)
+        try:
+            # Rolled back: not remembered
+            async with sessions() as db:
+                assert await ensure_applicant(db, "a1", cache) is True
+                await db.rollback()
+            rolled_back = "a1" in cache
+
+            # Two requests for the same new applicant: no conflict error
+            async with sessions() as first, sessions() as second:
+                assert await ensure_applicant(first, "a1", cache) is True
+                await first.commit()
+                assert await ensure_applicant(second, "a1", ApplicantCache(10)) is True
+                await second.commit()
+
+            # Known now: no database call
+            async with sessions() as db:
+                known = await ensure_applicant(db, "a1", cache)
+            return rolled_back, known
+        finally:
+            await async_engine.dispose()
+
+    rolled_back, known = asyncio.run(scenario())
+
+    assert rolled_back is False
+    assert known is False
+    with Session(sync_engine) as session:
+        assert session.scalar(select(func.count()).select_from(Applicant)) == 1
+    sync_engine.dispose()
@@ -0,0 +1,286 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.api.dependencies import get_orchestrator
+from src.api.main import app
+from src.api.routes import applications
+from src.core.document_payload import DocumentPayload, read_all
+from src.core.stage_executor import PipelineBusyError
+from src.services.db import get_async_db_session
+
+
+class _FakeSession:
+    bind = create_engine("sqlite://")
+
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+        self.sync_session = Session()
+
+    def get_bind(self):
+        return self.bind
+
+    async def execute(self, statement):
+        pass
+
+    async def get(self, model, key):
+        return None
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.fixture
+def upload_client():
+    session = _FakeSession()
+    seen = []
+
+    class FakeOrchestrator:
+        async def run_async(self, applicant_id, documents, income, family_size, deadline=None,
+                            application_id=None):
+            seen.extend((doc.name, doc.mime, read_all(doc)) for doc in documents)
+            assert all(isinstance(doc, DocumentPayload) for doc in documents)
+            return {
+                "eligibility": "approved",
+                "recommendation": "ok",
+                "final_decision": "done",
+                # As the orchestrator records uploads without a blob store
+                "processed_data": {"documents": [doc.describe() for doc in documents]},
+            }
+
+    app.dependency_overrides[get_orchestrator] = FakeOrchestrator
+    app.dependency_overrides[get_async_db_session] = lambda: session
+    yield TestClient(app), session, seen
+    app.dependency_overrides.pop(get_orchestrator, None)
+    app.dependency_overrides.pop(get_async_db_session, None)
+
+
+def test_upload_streams_files_to_pipeline(upload_client):
+    client, session, seen = upload_client
+    response = client.post(
+        "/application/upload",
+        data={"applicant_id": "a1", "income": "1200", "family_size": "3"},
+        files=[
+            ("documents", ("id.png", io.BytesIO(b"png-bytes"), "image/png")),
+            ("documents", ("bank.pdf", io.BytesIO(b"%PDF-1.4"), "application/pdf")),
+        ],
+    )
+
+    assert response.status_code == 201
+    assert response.json()["eligibility"] == "approved"
+    assert seen == [("id.png", "image/png", b"png-bytes"), ("bank.pdf", "application/pdf", b"%PDF-1.4")]
+    # Only metadata is persisted, not the file contents
+    application = session.added[-1]
+    assert application.raw_data["documents"] == [
+        {"filename": "id.png", "mime": "image/png", "size": 9},
+        {"filename": "bank.pdf", "mime": "application/pdf", "size": 8},
+    ]
+
+
+def test_upload_rejects_oversized_file(upload_client, monkeypatch):
+    client, _, seen = upload_client
+    monkeypatch.setattr(applications, "MAX_DOCUMENT_BYTES", 4)
+    response = client.post(
+        "/application/upload",
+        data={"applicant_id": "a1", "income": "1200", "family_size": "3"},
+        files=[("documents", ("big.png", io.BytesIO(b"too-large"), "image/png"))],
+    )
+
+    assert response.status_code == 413
+    assert seen == []
+
+
+def test_busy_pipeline_returns_503(upload_client):
+    client, _, _ = upload_client
+
+    class BusyOrchestrator:
+        async def run_async(self, *args, **kwargs):
+            raise PipelineBusyError("full")
+
+    app.dependency_overrides[get_orchestrator] = BusyOrchestrator
+    response = client.post(
+        "/application/upload",
+        data={"applicant_id": "a1", "income": "1200", "family_size": "3"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_batch_streams_decisions():
+    from src.api.dependencies import get_engine_registry
+    from src.core.eligibility_engine import EligibilityEngine
+
+    class FakeRegistry:
+        def snapshot(self):
+            class Snapshot:
+                eligibility_engine = EligibilityEngine(settings={})
+            return Snapshot()
+
+    app.dependency_overrides[get_engine_registry] = FakeRegistry
+    try:
+        client = TestClient(app)
+        rows = "".join(f"a{i},{1000 + i},{4}\n" for i in range(12000))
+        response = client.post(
+            "/application/batch",
+            files={"file": ("batch.csv", io.BytesIO(f"applicant_id,income,family_size\n{rows}x,oops,2\n".encode()), "text/csv")},
+        )
+        missing = client.post(
+            "/application/batch",
+            files={"file": ("batch.csv", io.BytesIO(b"applicant_id,income\na,1\n"), "text/csv")},
+        )
+    finally:
+        app.dependency_overrides.pop(get_engine_registry, None)
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "applicant_id,income,family_size,eligibility"
+    assert lines[1] == "a0,1000,4,approved"
+    assert lines[12000] == "a11999,12999,4,declined"
+    assert lines[-1] == "x,oops,2,invalid"
+    assert len(lines) == 12002
+    assert missing.status_code == 422
+
+
+class _ApplicationQuery:
+    def __init__(self, application):
+        self.application = application
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def scalar_one_or_none(self):
+        return self.application
+
+
+def test_patch_documents_runs_incremental_pipeline():
+    from src.services.db import Application
+
+    stored = Application(
+        application_id="app-1", applicant_id="a1", income=1200.0, family_size=3,
+        eligibility="approved", recommendation="old",
+        raw_data={"documents": ["data:image/png;base64,AA=="], "eligibility": "approved"},
+    )
+    query = _ApplicationQuery(stored)
+    session = _FakeSession()
+    session.execute = query.execute
+    calls = []
+
+    class FakeOrchestrator:
+        async def run_incremental_async(self, applicant_id, processed_data, new_documents,
+                                        income, family_size, deadline=None):
+            calls.append((applicant_id, processed_data, new_documents, income, family_size))
+            return {
+                "eligibility": "approved",
+                "recommendation": "new",
+                "final_decision": "done",
+                "processed_data": {
+                    "documents": processed_data["documents"] + new_documents,
+                    "document_status": [{"document_index": 1, "status": "complete", "detail": None}],
+                },
+            }
+
+    app.dependency_overrides[get_orchestrator] = FakeOrchestrator
+    app.dependency_overrides[get_async_db_session] = lambda: session
+    try:
+        client = TestClient(app)
+        response = client.patch("/application/app-1/documents", json={"documents": ["data:text/csv;base64,QQ=="]})
+        empty = client.patch("/application/app-1/documents", json={"documents": []})
+        query.application = None
+        missing = client.patch("/application/nope/documents", json={"documents": ["data:text/csv;base64,QQ=="]})
+    finally:
+        app.dependency_overrides.pop(get_orchestrator, None)
+        app.dependency_overrides.pop(get_async_db_session, None)
+
+    assert response.status_code == 200
+    assert response.json()["recommendation"] == "new"
+    assert response.json()["documents"][0]["document_index"] == 1
+    (applicant_id, processed_data, new_documents, income, family_size), = calls
+    assert (applicant_id, income, family_size) == ("a1", 1200.0, 3)
+    assert processed_data["documents"] == ["data:image/png;base64,AA=="]
+    assert new_documents == ["data:text/csv;base64,QQ=="]
+    # Read without a lock; the row is only locked for the write after processing
+    read, write = query.statements[:2]
+    assert read._for_update_arg is None and write._for_update_arg is not None
+    assert stored.recommendation == "new"
+    assert len(stored.raw_data["documents"]) == 2
+    assert empty.status_code == 422
+    assert missing.status_code == 404
+
+
+def test_applicant_is_committed_before_the_pipeline_runs():
+    session = _FakeSession()
+    commits_at_run = []
+
+    class FakeOrchestrator:
+        async def run_async(self, applicant_id, documents, income, family_size, deadline=None,
+                            application_id=None):
+            commits_at_run.append(session.commits)
+            return {"eligibility": "approved", "recommendation": "ok", "final_decision": "done",
+                    "processed_data": {}}
+
+    app.dependency_overrides[get_orchestrator] = FakeOrchestrator
+    app.dependency_overrides[get_async_db_session] = lambda: session
+    try:
+        response = TestClient(app).post(
+            "/application/", json={"applicant_id": "new-applicant", "income": 1000, "family_size": 2, "documents": []}
+        )
+    finally:
+        app.dependency_overrides.pop(get_orchestrator, None)
+        app.dependency_overrides.pop(get_async_db_session, None)
+
+    assert response.status_code == 201
+    # One commit for the applicant before the pipeline, one for the application
+    assert commits_at_run == [1] and session.commits == 2
+
+
+def test_patch_documents_reprocesses_when_application_changed_meanwhile():
+    from src.services.db import Application
+
+    stored = Application(
+        application_id="app-1", applicant_id="a1", income=1200.0, family_size=3,
+        eligibility="approved", recommendation="old", raw_data={"documents": ["a"]},
+    )
+    query = _ApplicationQuery(stored)
+    session = _FakeSession()
+    session.execute = query.execute
+    seen = []
+
+    class FakeOrchestrator:
+        async def run_incremental_async(self, applicant_id, processed_data, new_documents,
+                                        income, family_size, deadline=None):
+            seen.append(processed_data["documents"])
+            if len(seen) == 1:
+                # Another request adds a document while this one is processing
+                stored.raw_data = {"documents": ["a", "b"]}
+            return {
+                "eligibility": "approved", "recommendation": "new", "final_decision": "done",
+                "processed_data": {"documents": processed_data["documents"] + new_documents},
+            }
+
+    app.dependency_overrides[get_orchestrator] = FakeOrchestrator
+    app.dependency_overrides[get_async_db_session] = lambda: session
+    try:
+        response = TestClient(app).patch("/application/app-1/documents", json={"documents": ["c"]})
+    finally:
+        app.dependency_overrides.pop(get_orchestrator, None)
+        app.dependency_overrides.pop(get_async_db_session, None)
+
+    assert response.status_code == 200
+    assert seen == [["a"], ["a", "b"]]
+    assert stored.raw_data["documents"] == ["a", "b", "c"]
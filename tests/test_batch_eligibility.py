@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.core.batch_eligibility import column_positions, iter_batch_decisions
+from src.core.eligibility_engine import EligibilityEngine
+
+
+class _ThresholdModel:
+    """Stand-in for a 2-feature classifier: approve below an income."""
+
+    def predict(self, features):
+        return (np.asarray(features)[:, 0] < 1500).astype(int)
+
+
+def _engine(model=None):
+    engine = EligibilityEngine(settings={"ELIGIBILITY_MODEL_PATH": "nonexistent.pkl"})
+    engine.model = model
+    return engine
+
+
+def test_assess_batch_matches_assess():
+    incomes = np.array([500.0, 1000.0, 1999.0, 2500.0, 8000.0, -1.0])
+    sizes = np.array([1, 4, 4, 3, 1, 0])
+    for model in (None, _ThresholdModel()):
+        engine = _engine(model)
+        expected = [engine.assess(i, int(s)) for i, s in zip(incomes, sizes)]
+        assert list(engine.assess_batch(incomes, sizes)) == expected
+
+
+def test_assess_batch_falls_back_to_rules():
+    class Broken:
+        def predict(self, features):
+            raise ValueError("X has 2 features, but model expects 3")
+
+    decisions = _engine(Broken()).assess_batch(np.array([1000.0, 5000.0]), np.array([4, 5]))
+    assert list(decisions) == ["approved", "declined"]
+    assert len(_engine().assess_batch(np.array([]), np.array([]))) == 0
+    with pytest.raises(ValueError):
+        _engine().assess_batch(np.array([1.0, 2.0]), np.array([1.0]))
+
+
+def test_iter_batch_decisions_chunks_and_marks_invalid():
+    positions = column_positions(["Family_Size", "applicant_id", "income", "note"])
+    assert positions == [1, 2, 0]
+    with pytest.raises(ValueError, match="income"):
+        column_positions(["applicant_id", "family_size"])
+
+    rows = [["4", "a", "1000"], [], ["1", "b", "n/a"], ["5", "c", "5000"], ["2", "d"]]
+    chunks = list(iter_batch_decisions(_engine(), rows, positions, chunk_rows=2))
+    assert len(chunks) == 3
+    assert "".join(chunks).splitlines() == [
+        "applicant_id,income,family_size,eligibility",
+        "a,1000,4,approved",
+        "b,n/a,1,invalid",
+        "c,5000,5,declined",
+        "d,,2,invalid",
+    ]
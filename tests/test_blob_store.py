@@ -0,0 +1,138 @@
+import base64
+import hashlib
+import io
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.core.document_payload import DocumentPayload
+from src.services.blob_store import (
+    KEY_PREFIX,
+    LocalBlobStore,
+    S3BlobStore,
+    migrate_raw_data,
+    store_document,
+)
+from src.services.db import Applicant, Application, Base
+
+
+def _data_uri(mime, payload):
+    return f"data:{mime};base64,{base64.b64encode(payload).decode()}"
+
+
+def test_local_store_deduplicates_by_content(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    key, size = store.put(io.BytesIO(b"statement"))
+    again, _ = store.put(io.BytesIO(b"statement"))
+
+    assert key == again == KEY_PREFIX + hashlib.sha256(b"statement").hexdigest()
+    assert size == 9
+    assert store.open(key).read() == b"statement"
+    blobs = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert len(blobs) == 1
+    with pytest.raises(KeyError):
+        store.open(KEY_PREFIX + "0" * 64)
+    with pytest.raises(ValueError):
+        store.open("sha256:../../etc/passwd")
+
+
+def test_store_document_keeps_only_references(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    upload = DocumentPayload(body=io.BytesIO(b"png-bytes"), mime="image/png", size=9, name="id.png")
+
+    uploaded = store_document(store, upload)
+    inline = store_document(store, _data_uri("image/png", b"png-bytes"))
+
+    assert uploaded["blob"] == inline["blob"]
+    assert uploaded == {"blob": uploaded["blob"], "mime": "image/png", "size": 9, "filename": "id.png"}
+    assert inline["mime"] == "image/png" and inline["filename"] is None
+    assert store_document(store, "https://example.com/cv.pdf") == "https://example.com/cv.pdf"
+    assert store_document(store, "data:image/png;base64,A")["blob"] is None
+
+
+def test_migrate_raw_data(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    raw_data = {"documents": [_data_uri("text/csv", b"Assets\n1\n"), "cv.pdf"], "ocr_texts": ["x"]}
+
+    migrated = migrate_raw_data(store, raw_data)
+
+    assert migrated["documents"][0]["blob"].startswith(KEY_PREFIX)
+    assert migrated["documents"][1] == "cv.pdf"
+    assert migrated["ocr_texts"] == ["x"]
+    assert migrate_raw_data(store, migrated) is None
+    assert migrate_raw_data(store, None) is None
+
+
+class _FakeS3:
+    class exceptions:
+        class ClientError(Exception):
+            def __init__(self, code):
+                self.response = {"Error": {"Code": code}}
+
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = 0
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.ClientError("404")
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        self.uploads += 1
+        self.objects[(bucket, key)] = fileobj.read()
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey()
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+def test_s3_store_uploads_each_content_once():
+    client = _FakeS3()
+    store = S3BlobStore("docs", prefix="documents/", client=client)
+
+    key, _ = store.put(io.BytesIO(b"scan"))
+    store.put(io.BytesIO(b"scan"))
+
+    digest = key[len(KEY_PREFIX):]
+    assert client.uploads == 1
+    assert list(client.objects) == [("docs", f"documents/{digest[:2]}/{digest}")]
+    assert store.open(key).read() == b"scan"
+    with pytest.raises(KeyError):
+        store.open(KEY_PREFIX + "0" * 64)
+
+
+def test_migration_script_rewrites_inline_documents(tmp_path):
+    url = f"sqlite:///{tmp_path / 'apps.db'}"
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        # Persistent: lets the script's streaming reader and writer share the file
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Applicant(applicant_id="a", demographic={}))
+        for i, documents in enumerate([[_data_uri("image/png", b"png")], ["id.png"]]):
+            session.add(Application(
+                application_id=f"app-{i}", applicant_id="a", income=1.0, family_size=1,
+                eligibility="approved", recommendation="ok", raw_data={"documents": documents},
+            ))
+        session.commit()
+
+    subprocess.run(
+        [sys.executable, "scripts/migrate_documents_to_blobs.py", "--database-url", url, "--chunk-size", "1"],
+        check=True, capture_output=True,
+        env={"BLOB_STORE": "local", "BLOB_STORE_DIR": str(tmp_path / "blobs"), "PATH": ""},
+    )
+
+    with Session(engine) as session:
+        rows = dict(session.execute(select(Application.application_id, Application.raw_data)).all())
+    engine.dispose()
+    (ref,) = rows["app-0"]["documents"]
+    assert LocalBlobStore(str(tmp_path / "blobs")).open(ref["blob"]).read() == b"png"
+    assert rows["app-1"] == {"documents": ["id.png"]}
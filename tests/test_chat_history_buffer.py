@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.api.dependencies import get_chat_history_buffer
+from src.api.main import app
+from src.api.routes import chatbot
+from src.services import applicants
+from src.services.applicants import ApplicantCache
+from src.services.chat_history_buffer import ChatHistoryBuffer
+from src.services.db import Applicant, Base, ChatHistory, async_url, get_async_db_session
+
+
+@pytest.fixture
+def databases(tmp_path):
+    url = f"sqlite:///{tmp_path / 'chat.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        session.add(Applicant(applicant_id="a1", demographic={}))
+        session.commit()
+    yield sync_engine, url
+    sync_engine.dispose()
+
+
+def _messages(sync_engine):
+    with Session(sync_engine) as session:
+        rows = session.scalars(select(ChatHistory).order_by(ChatHistory.id)).all()
+        return [(row.session_id, row.role, row.message) for row in rows]
+
+
+def _run(url, scenario, **options):
+    async def main():
+        async_engine = create_async_engine(async_url(url))
+        buffer = ChatHistoryBuffer(session_factory=async_sessionmaker(async_engine), **options)
+        try:
+            return await scenario(buffer)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_flushes_in_order_when_batch_is_full(databases):
+    sync_engine, url = databases
+
+    async def scenario(buffer):
+        await buffer.start()
+        for i in range(3):
+            await buffer.append("s1", "a1", "user", f"q{i}")
+            await buffer.append("s2", "a1", "assistant", f"r{i}")
+        await asyncio.sleep(0.2)
+        written = _messages(sync_engine)
+        await buffer.close()
+        return written, buffer.stats()
+
+    written, stats = _run(url, scenario, batch_size=6, flush_interval=60)
+
+    assert [m for s, _, m in written if s == "s1"] == ["q0", "q1", "q2"]
+    assert [m for s, _, m in written if s == "s2"] == ["r0", "r1", "r2"]
+    assert stats["flushes"] == 1 and stats["flushed_rows"] == 6 and stats["depth"] == 0
+    assert stats["last_flush_ms"] > 0
+
+
+def test_flushes_on_interval_and_drains_on_close(databases):
+    sync_engine, url = databases
+
+    async def scenario(buffer):
+        await buffer.start()
+        await buffer.append("s1", "a1", "user", "hello")
+        await asyncio.sleep(0.3)
+        after_interval = len(_messages(sync_engine))
+        await buffer.append("s1", "a1", "assistant", "hi")
+        await buffer.close()
+        return after_interval
+
+    assert _run(url, scenario, batch_size=100, flush_interval=0.05) == 1
+    assert [m for _, _, m in _messages(sync_engine)] == ["hello", "hi"]
+
+
+def test_failed_flush_keeps_rows_for_next_attempt(databases):
+    sync_engine, url = databases
+
+    async def scenario(buffer):
+        await buffer.append("s1", "a1", "user", "first")
+        await buffer.append("s1", "a1", "user", "second")
+        real_factory = buffer._session_factory
+        buffer._session_factory = lambda: (_ for _ in ()).throw(ConnectionError("db down"))
+        failed = await buffer.flush()
+        depth = buffer.stats()["depth"]
+        buffer._session_factory = real_factory
+        return failed, depth, await buffer.flush(), buffer.stats()
+
+    failed, depth, written, stats = _run(url, scenario, batch_size=100, flush_interval=60)
+
+    assert (failed, depth, written) == (0, 2, 2)
+    assert stats["failed_flushes"] == 1 and stats["depth"] == 0
+    assert [m for _, _, m in _messages(sync_engine)] == ["first", "second"]
+
+
+def test_row_that_always_fails_is_dropped_without_blocking_the_buffer(databases, caplog):
+    sync_engine, url = databases
+
+    async def scenario(buffer):
+        await buffer.start()
+
+        async def chat():
+            await buffer.append("s1", "a1", "user", "before")
+            # NOT NULL violation (role): fails on every attempt
+            await buffer.append("s1", "a1", None, "my income is 1234")
+            for i in range(6):
+                await buffer.append("s1", "a1", "user", f"after{i}")
+
+        # With max_pending=2 the appends would wait forever if the bad row stayed queued
+        await asyncio.wait_for(chat(), timeout=10)
+        await buffer.close()
+        return buffer.stats()
+
+    stats = _run(url, scenario, batch_size=2, max_pending=2, max_attempts=3, flush_interval=0.01)
+
+    assert [m for _, _, m in _messages(sync_engine)] == ["before"] + [f"after{i}" for i in range(6)]
+    assert stats["dropped_rows"] == 1 and stats["depth"] == 0 and stats["flushed_rows"] == 7
+    # Logged without the message text (nor the statement parameters quoting it)
+    assert "Dropping chat history row" in caplog.text
+    assert "my income" not in caplog.text
+
+
+def test_chat_route_buffers_history_instead_of_committing(monkeypatch):
+    class FakeSession:
+        commits = 0
+
+        async def commit(self):
+            FakeSession.commits += 1
+
+    buffer = ChatHistoryBuffer(batch_size=100, flush_interval=60, session_factory=object)
+    # An applicant already known to exist costs no database call
+    monkeypatch.setattr(applicants, "_cache", ApplicantCache(10))
+    applicants.get_applicant_cache().add("a1")
+    monkeypatch.setenv("OLLAMA_MODEL", "test-model")
+    monkeypatch.setattr(chatbot.LLMClient, "chat", lambda self, **kwargs: (["hi there"], "llm-1"))
+    app.dependency_overrides[get_async_db_session] = FakeSession
+    app.dependency_overrides[get_chat_history_buffer] = lambda: buffer
+    try:
+        client = TestClient(app)
+        response = client.post("/chatbot/", json={"user_id": "a1", "messages": ["hello"]})
+        stats = client.get("/health/chat-history").json()
+    finally:
+        app.dependency_overrides.pop(get_async_db_session, None)
+        app.dependency_overrides.pop(get_chat_history_buffer, None)
+
+    assert response.status_code == 200
+    assert FakeSession.commits == 0
+    assert [(row["role"], row["message"]) for row in buffer._rows] == [("user", "hello"), ("assistant", "hi there")]
+    assert {row["session_id"] for row in buffer._rows} == {response.json()["session_id"]}
+    assert stats["depth"] == 2 and stats["flushes"] == 0
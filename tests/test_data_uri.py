@@ -0,0 +1,50 @@
+import base64
+import os
+
+import pytest
+from src.core import data_uri
+from src.core.data_uri import InvalidDataURIError, decode_data_uri, is_base64_data_uri, parse_header
+from src.core.document_format import UnsupportedDocumentError
+from src.core.document_payload import DocumentTooLargeError
+
+
+def _uri(payload, mime="image/png"):
+    return f"data:{mime};base64,{base64.b64encode(payload).decode()}"
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 47, 48, 49, 1000])
+def test_decode_across_chunk_boundaries(monkeypatch, length):
+    monkeypatch.setattr(data_uri, "_CHUNK_CHARS", 16)
+    payload = os.urandom(length)
+    doc = decode_data_uri(_uri(payload), spool_bytes=64)
+    assert doc.size == length
+    assert doc.mime == "image/png"
+    assert doc.read_bytes() == payload
+
+
+def test_header_parsed_without_payload():
+    uri = _uri(b"abc", mime="Application/PDF")
+    assert parse_header(uri) == ("application/pdf", True, uri.index(",") + 1)
+    assert is_base64_data_uri(uri)
+    assert not is_base64_data_uri("data:text/plain,hello")
+    with pytest.raises(InvalidDataURIError):
+        parse_header("no header here")
+
+
+def test_limits_checked_before_decoding(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("payload should not be decoded")
+    monkeypatch.setattr(data_uri.base64, "b64decode", fail)
+
+    with pytest.raises(DocumentTooLargeError):
+        decode_data_uri(_uri(b"x" * 100), max_bytes=99)
+    with pytest.raises(UnsupportedDocumentError):
+        decode_data_uri(_uri(b"x", mime="text/html"), accept=lambda mime: mime.startswith("image/"))
+
+
+def test_line_wrapped_and_corrupt_payloads():
+    payload = os.urandom(300)
+    wrapped = "data:image/png;base64," + base64.encodebytes(payload).decode()
+    assert decode_data_uri(wrapped).read_bytes() == payload
+    with pytest.raises(InvalidDataURIError):
+        decode_data_uri("data:image/png;base64,abc")
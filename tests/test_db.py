@@ -0,0 +1,83 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.api.dependencies import get_orchestrator
+from src.api.main import app
+from src.services import applicants
+from src.services.applicants import ApplicantCache
+from src.services.db import (
+    Applicant,
+    Application,
+    Base,
+    async_url,
+    engine_options,
+    get_async_db_session,
+)
+
+
+def test_engine_options_from_settings():
+    options = engine_options(
+        "postgresql://u:p@db/social",
+        {"DB_POOL_SIZE": "20", "DB_MAX_OVERFLOW": "0", "DB_POOL_RECYCLE": "600", "DB_ECHO": "debug"},
+    )
+    assert options == {
+        "pool_pre_ping": True, "echo": "debug", "pool_size": 20, "max_overflow": 0, "pool_recycle": 600,
+    }
+    # Statement logging is off unless asked for
+    assert engine_options("postgresql://db/social", {})["echo"] is False
+    assert engine_options("postgresql://db/social", {"DB_POOL_SIZE": "many"})["pool_size"] == 5
+    assert "pool_size" not in engine_options("sqlite:///apps.db", {})
+
+
+def test_async_url():
+    assert async_url("postgresql://u:p@db:5432/social") == "postgresql+asyncpg://u:p@db:5432/social"
+    assert async_url("postgresql+psycopg2://u:p@db/social") == "postgresql+asyncpg://u:p@db/social"
+    assert async_url("sqlite:///apps.db") == "sqlite+aiosqlite:///apps.db"
+    with pytest.raises(ValueError):
+        async_url("mysql://db/social")
+
+
+def test_application_is_stored_through_async_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(applicants, "_cache", ApplicantCache(10))
+    path = tmp_path / "apps.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(async_url(f"sqlite:///{path}"))
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def session_override():
+        async with sessions() as db:
+            yield db
+
+    class FakeOrchestrator:
+        async def run_async(self, applicant_id, documents, income, family_size, deadline=None,
+                            application_id=None):
+            return {
+                "eligibility": "approved",
+                "recommendation": "ok",
+                "final_decision": "done",
+                "processed_data": {"documents": documents},
+            }
+
+    app.dependency_overrides[get_orchestrator] = FakeOrchestrator
+    app.dependency_overrides[get_async_db_session] = session_override
+    try:
+        client = TestClient(app)
+        body = {"applicant_id": "a1", "income": 1000, "family_size": 3, "documents": ["cv.pdf"]}
+        created = client.post("/application/", json=body)
+        conflict = client.post("/application/", json={**body, "application_id": created.json()["application_id"]})
+    finally:
+        app.dependency_overrides.pop(get_orchestrator, None)
+        app.dependency_overrides.pop(get_async_db_session, None)
+
+    assert created.status_code == 201
+    assert conflict.status_code == 409
+    with Session(sync_engine) as session:
+        assert session.get(Applicant, "a1") is not None
+        (row,) = session.scalars(select(Application)).all()
+    assert row.application_id == created.json()["application_id"]
+    assert row.raw_data["documents"] == ["cv.pdf"]
+    sync_engine.dispose()
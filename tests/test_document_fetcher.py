@@ -0,0 +1,91 @@
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.core.deadline import DEFERRED, TIMEOUT, Deadline
+from src.core.document_fetcher import AsyncDocumentFetcher, DocumentTooLargeError
+from src.core.document_processor import DocumentProcessor
+from src.core.ocr_cache import OCRCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == "/slow":
+            time.sleep(0.5)
+        size = 4096 if self.path.startswith("/big") else 0
+        body = b"x" * size if size else f"document at {self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        if self.path != "/big-chunked":
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except BrokenPipeError:
+            # The client gave up on /slow
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    monkeypatch.setenv("MAX_DOCUMENT_BYTES", "1024")
+    monkeypatch.setenv("FETCH_SPOOL_BYTES", "16")
+    fetcher = AsyncDocumentFetcher()
+    yield fetcher
+    fetcher.close()
+
+
+def test_fetch_all_returns_results_in_order(server, fetcher):
+    results = fetcher.fetch_all_sync([f"{server}/a", f"{server}/missing", f"{server}/b"])
+    assert results[0].read_bytes() == b"document at /a"
+    assert results[0].mime == "text/plain"
+    assert isinstance(results[1], Exception)
+    assert results[2].read_bytes() == b"document at /b"
+
+
+def test_oversized_documents_are_aborted(server, fetcher):
+    declared, streamed = fetcher.fetch_all_sync([f"{server}/big", f"{server}/big-chunked"])
+    assert isinstance(declared, DocumentTooLargeError)
+    assert isinstance(streamed, DocumentTooLargeError)
+
+
+def test_process_fetches_url_documents(server, fetcher):
+    processor = DocumentProcessor(cache=OCRCache(cache_dir=""))
+    processor.fetcher = fetcher
+    result = processor.process([f"{server}/one", "raw text", f"{server}/two"], applicant_id="a1")
+    assert [d["text"] for d in result["documents"]] == [
+        "document at /one", "raw text", "document at /two"
+    ]
+
+
+def test_downloads_are_bounded_by_the_deadline(server, fetcher):
+    slow, fast = fetcher.fetch_all_sync([f"{server}/slow", f"{server}/a"], timeout=0.2)
+    assert isinstance(slow, asyncio.TimeoutError)
+    assert fast.read_bytes() == b"document at /a"
+    assert isinstance(fetcher.fetch_all_sync([f"{server}/a"], timeout=0)[0], asyncio.TimeoutError)
+
+    processor = DocumentProcessor(cache=OCRCache(cache_dir=""))
+    processor.fetcher = fetcher
+    start = time.monotonic()
+    result = processor.process([f"{server}/slow", "raw text"], applicant_id="a1", deadline=Deadline(0.2))
+    assert time.monotonic() - start < 0.45
+    # The download used up the budget: nothing else is extracted
+    assert [s["status"] for s in result["document_status"]] == [TIMEOUT, DEFERRED]
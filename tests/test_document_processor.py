@@ -0,0 +1,70 @@
+import base64
+
+import pytest
+from src.core.deadline import COMPLETE, DEFERRED, SKIPPED, Deadline
+from src.core.document_format import IMAGE, PDF, TEXT, UnsupportedDocumentError, detect_format
+from src.core.document_processor import DocumentProcessor
+from src.core.ocr_cache import OCRCache
+
+
+@pytest.fixture
+def processor():
+    return DocumentProcessor(cache=OCRCache(cache_dir=""))
+
+
+def test_detect_format_from_magic_bytes():
+    with open("bank_statement.pdf", "rb") as f:
+        assert detect_format(f.read()) == PDF
+    with open("id_card.jpg", "rb") as f:
+        assert detect_format(f.read(), "application/octet-stream") == IMAGE
+    with open("utility_bill.png", "rb") as f:
+        assert detect_format(f.read()) == IMAGE
+    assert detect_format(b"Assets,Liabilities\n10,5\n", "text/csv") == TEXT
+
+
+def test_detect_format_rejects_unknown_binary():
+    with pytest.raises(UnsupportedDocumentError):
+        detect_format(b"\x00\x01\x02\xff\xfe" * 10, "application/octet-stream")
+
+
+def test_process_dispatches_by_format(processor):
+    with open("bank_statement.pdf", "rb") as f:
+        pdf_uri = "data:application/pdf;base64," + base64.b64encode(f.read()).decode()
+    junk_uri = "data:application/octet-stream;base64," + base64.b64encode(b"\x00\xff" * 8).decode()
+    text_uri = "data:text/plain;base64," + base64.b64encode(b"hello").decode()
+
+    result = processor.process([pdf_uri, junk_uri, text_uri], applicant_id="a1")
+
+    docs = {d["document_index"]: d["text"] for d in result["documents"]}
+    assert "Account Holder: John Doe" in docs[0]
+    assert 1 not in docs
+    assert docs[2] == "hello"
+
+
+def test_process_accepts_uploaded_files(processor):
+    import tempfile
+    from src.core.document_payload import DocumentPayload
+
+    body = tempfile.SpooledTemporaryFile(max_size=1024)
+    with open("bank_statement.pdf", "rb") as f:
+        size = body.write(f.read())
+    upload = DocumentPayload(body=body, mime="application/pdf", size=size, name="statement.pdf")
+
+    result = processor.process([upload], applicant_id="a1")
+
+    assert "Account Holder: John Doe" in result["documents"][0]["text"]
+    assert upload.describe() == {"filename": "statement.pdf", "mime": "application/pdf", "size": size}
+
+
+def test_process_reports_status_per_document(processor):
+    text_uri = "data:text/plain;base64," + base64.b64encode(b"hello").decode()
+    junk_uri = "data:application/octet-stream;base64," + base64.b64encode(b"\x00\xff" * 8).decode()
+
+    result = processor.process([text_uri, junk_uri], applicant_id="a1", deadline=Deadline(60))
+    assert [s["status"] for s in result["document_status"]] == [COMPLETE, SKIPPED]
+
+    expired = Deadline(60)
+    expired.expires_at = 0
+    result = processor.process([text_uri], applicant_id="a1", deadline=expired)
+    assert result["documents"] == []
+    assert result["document_status"][0]["status"] == DEFERRED
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from src.core.engine_registry import EngineRegistry
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "engines.yml"
+    path.write_text("ELIGIBILITY_INCOME_THRESHOLD: 3000\n")
+    return path
+
+
+def _touch(path, text):
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def test_config_overrides_environment(config_file, monkeypatch):
+    monkeypatch.setenv("ELIGIBILITY_INCOME_THRESHOLD", "1000")
+    monkeypatch.setenv("LOW_INCOME_THRESHOLD", "700")
+    registry = EngineRegistry(config_path=str(config_file))
+
+    snapshot = registry.snapshot()
+    assert snapshot.eligibility_engine.income_threshold == 3000
+    assert snapshot.recommendation_engine.low_income_threshold == 700
+    # Unchanged sources: the same snapshot is served
+    assert registry.reload_if_changed() is False
+    assert registry.snapshot() is snapshot
+
+
+def test_reload_swaps_snapshot_atomically(config_file):
+    registry = EngineRegistry(config_path=str(config_file))
+    old = registry.snapshot()
+
+    _touch(config_file, "ELIGIBILITY_INCOME_THRESHOLD: 5000\n")
+    assert registry.reload_if_changed() is True
+
+    new = registry.snapshot()
+    assert new.version == old.version + 1
+    assert new.eligibility_engine.income_threshold == 5000
+    # Requests holding the old snapshot keep consistent engines
+    assert old.eligibility_engine.income_threshold == 3000
+    assert new.orchestrator.ocr is old.orchestrator.ocr
+
+
+def test_broken_config_keeps_current_engines(config_file):
+    registry = EngineRegistry(config_path=str(config_file))
+    old = registry.snapshot()
+
+    _touch(config_file, "- not\n- a mapping\n")
+    assert registry.reload_if_changed() is False
+    assert registry.snapshot() is old
+
+
+def test_rules_file_change_reloads(config_file, tmp_path, monkeypatch):
+    rules = tmp_path / "rules.yml"
+    rules.write_text("recommendation_rules:\n  - name: fallback\n    recommendation: old\n")
+    monkeypatch.setenv("RECOMMENDATION_RULES_PATH", str(rules))
+    registry = EngineRegistry(config_path=str(config_file))
+    assert registry.snapshot().recommendation_engine.generate({}) == "old"
+
+    _touch(rules, "recommendation_rules:\n  - name: fallback\n    recommendation: new\n")
+    assert registry.reload_if_changed() is True
+    assert registry.snapshot().recommendation_engine.generate({}) == "new"
@@ -0,0 +1,103 @@
+import base64
+import time
+
+import pytest
+from src.core import image_ocr, ocr_pool
+from src.core.deadline import COMPLETE, DEFERRED, SKIPPED, Deadline
+from src.core.document_payload import read_all
+from src.core.image_ocr import ImageOCR
+from src.core.ocr_cache import OCRCache
+
+
+def _data_uri(mime, payload):
+    return f"data:{mime};base64,{base64.b64encode(payload).decode()}"
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    calls = []
+
+    def fake(img_bytes, timeout, lang="eng", backend=None):
+        img_bytes = read_all(img_bytes)
+        calls.append(img_bytes)
+        if img_bytes == b"broken":
+            raise RuntimeError("boom")
+        return img_bytes.decode()
+    monkeypatch.setattr(image_ocr, "ocr_image_bytes", fake)
+    return calls
+
+
+def test_extract_texts_keeps_document_order(fake_ocr):
+    docs = [
+        _data_uri("image/png", b"first"),
+        _data_uri("application/pdf", b"skipped"),
+        _data_uri("image/png", b"broken"),
+        _data_uri("image/jpeg", b"second"),
+    ]
+    ocr = ImageOCR(cache=OCRCache(cache_dir=""))
+    assert ocr.extract_texts(docs) == ["first", "second"]
+
+
+def test_extract_texts_uses_cache(fake_ocr):
+    cache = OCRCache(cache_dir="")
+    docs = [_data_uri("image/png", b"first")]
+    ImageOCR(cache=cache).extract_texts(docs)
+    assert ImageOCR(cache=cache).extract_texts(docs) == ["first"]
+    assert len(fake_ocr) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_is_keyed_by_preprocessing_settings(fake_ocr, monkeypatch):
+    cache = OCRCache(cache_dir="")
+    docs = [_data_uri("image/png", b"first")]
+    ImageOCR(cache=cache).extract_texts(docs)
+
+    monkeypatch.setenv("OCR_BINARIZE", "true")
+    # A restarted process builds its preprocessor from the new settings
+    monkeypatch.setattr(ocr_pool, "_preprocessor", None)
+    ImageOCR(cache=cache).extract_texts(docs)
+    assert len(fake_ocr) == 2
+
+
+def test_text_is_cached_stripped_like_document_processor(monkeypatch):
+    from src.core.document_processor import DocumentProcessor
+
+    monkeypatch.setattr(image_ocr, "ocr_image_bytes", lambda *args, **kwargs: "  id card\n\f")
+    cache = OCRCache(cache_dir="")
+    payload = b"\x89PNG\r\n\x1a\n-image"
+    assert ImageOCR(cache=cache).extract_texts([_data_uri("image/png", payload)]) == ["id card"]
+    # DocumentProcessor hits the entry ImageOCR wrote and gets the same text
+    text, complete = DocumentProcessor(cache=cache)._extract_text(payload, "image/png")
+    assert (text, complete) == ("id card", True)
+    assert cache.stats()["hits"] == 1
+
+
+def test_invalid_worker_config_falls_back(monkeypatch):
+    monkeypatch.setenv("OCR_MAX_WORKERS", "many")
+    ocr = ImageOCR()
+    assert ocr.max_workers == 1
+    assert ocr.document_timeout == 30.0
+
+
+def test_smallest_first_and_deferred_after_deadline(fake_ocr, monkeypatch):
+    deadline = Deadline(60)
+    docs = [
+        _data_uri("image/png", b"large document"),
+        _data_uri("text/plain", b"skip me"),
+        _data_uri("image/png", b"tiny"),
+        _data_uri("image/png", b"medium"),
+    ]
+    ocr = ImageOCR(cache=OCRCache(cache_dir=""))
+    real = image_ocr.ocr_image_bytes
+
+    def expire_after_first(*args, **kwargs):
+        deadline.expires_at = time.monotonic() - 1
+        return real(*args, **kwargs)
+    monkeypatch.setattr(image_ocr, "ocr_image_bytes", expire_after_first)
+
+    results = ocr.extract_documents(docs, deadline)
+
+    assert fake_ocr == [b"tiny"]
+    assert [r.status for r in results] == [DEFERRED, SKIPPED, COMPLETE, DEFERRED]
+    assert results[2].text == "tiny"
+    assert ocr.extract_texts(docs[2:3]) == ["tiny"]
@@ -0,0 +1,37 @@
+from PIL import Image
+from src.core.image_preprocessing import ImagePreprocessor
+
+
+def test_large_photo_is_downscaled_to_max_side(monkeypatch):
+    monkeypatch.setenv("OCR_MAX_SIDE_PX", "1000")
+    photo = Image.new("RGB", (4000, 3000), "white")
+    assert max(ImagePreprocessor()(photo).size) == 1000
+
+
+def test_dpi_metadata_drives_downscale():
+    scan = Image.new("RGB", (2400, 1200), "white")
+    scan.info["dpi"] = (600, 600)
+    assert ImagePreprocessor()(scan).size == (1200, 600)
+
+
+def test_borders_are_cropped_and_image_is_grayscale():
+    page = Image.new("RGB", (400, 300), "white")
+    page.paste((0, 0, 0), (100, 100, 200, 150))
+    out = ImagePreprocessor()(page)
+    assert out.mode == "L"
+    assert out.size == (120, 70)
+
+
+def test_binarize_produces_two_levels(monkeypatch):
+    monkeypatch.setenv("OCR_BINARIZE", "true")
+    monkeypatch.setenv("OCR_CROP_BORDERS", "false")
+    with Image.open("id_card.jpg") as img:
+        out = ImagePreprocessor()(img)
+    assert set(out.getdata()) <= {0, 255}
+
+
+def test_signature_follows_settings(monkeypatch):
+    default = ImagePreprocessor().signature()
+    assert ImagePreprocessor().signature() == default
+    monkeypatch.setenv("OCR_DESKEW", "true")
+    assert ImagePreprocessor().signature() != default
@@ -0,0 +1,14 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_api_import_defers_heavy_dependencies():
+    # Timing is left to the benchmark's budget; here only what gets imported
+    proc = subprocess.run(
+        [sys.executable, "benchmarks/import_time_benchmark.py", "--runs", "1", "--budget-ms", "1e9"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
@@ -0,0 +1,76 @@
+import json
+import pickle
+import logging
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.core.eligibility_engine import EligibilityEngine, model_source
+from src.models.artifact import ELIGIBILITY_FEATURES, LinearModelArtifact, export_model
+
+
+def _fit():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.uniform(0, 8000, 400), rng.integers(1, 9, 400)])
+    y = (X[:, 0] * X[:, 1] < 8000).astype(int)
+    return LogisticRegression(max_iter=1000).fit(X, y), X
+
+
+def test_artifact_matches_sklearn_and_is_preferred(tmp_path):
+    model, X = _fit()
+    pkl = tmp_path / "model.pkl"
+    pkl.write_bytes(pickle.dumps(model))
+    export_model(model, str(tmp_path / "model.json"), feature_names=["income", "family_size"])
+
+    assert model_source(str(pkl)) == str(tmp_path / "model.json")
+    engine = EligibilityEngine({"ELIGIBILITY_MODEL_PATH": str(pkl)})
+    assert isinstance(engine.model, LinearModelArtifact)
+
+    expected = np.where(model.predict(X) == 1, "approved", "declined")
+    assert list(engine.assess_batch(X[:, 0], X[:, 1])) == list(expected)
+    assert engine.assess(X[0, 0], int(X[0, 1])) == expected[0]
+
+
+def test_tampered_artifact_is_rejected(tmp_path):
+    model, _ = _fit()
+    path = tmp_path / "model.json"
+    export_model(model, str(path), feature_names=["income", "family_size"])
+    data = json.loads(path.read_text())
+    data["intercept"] += 1.0
+    path.write_text(json.dumps(data))
+
+    with pytest.raises(ValueError, match="hash mismatch"):
+        LinearModelArtifact.load(str(path))
+    assert EligibilityEngine({"ELIGIBILITY_MODEL_PATH": str(path)}).model is None
+
+
+def test_missing_features_disable_the_model_at_load(tmp_path, caplog):
+    model, _ = _fit()
+    path = tmp_path / "model.json"
+    export_model(model, str(path), feature_names=["income", "doc_count"])
+    pkl = tmp_path / "wide.pkl"
+    pkl.write_bytes(pickle.dumps(LogisticRegression().fit(np.eye(3), [0, 1, 1])))
+
+    with caplog.at_level(logging.WARNING):
+        engine = EligibilityEngine({"ELIGIBILITY_MODEL_PATH": str(path)})
+        assert EligibilityEngine({"ELIGIBILITY_MODEL_PATH": str(pkl)}).model is None
+        assert engine.model is None
+        assert engine.assess(1000.0, 4) == "approved"
+    assert [r.levelname for r in caplog.records if "does not provide" in r.getMessage()] == ["WARNING"] * 2
+    assert "doc_count" in caplog.text and "Traceback" not in caplog.text
+    assert list(engine.assess_batch(np.array([1000.0, 5000.0]), np.array([4, 5]))) == ["approved", "declined"]
+
+
+def test_shipped_artifact_is_used_by_assess(caplog):
+    model_path = Path(__file__).resolve().parent.parent / "src" / "models" / "eligibility_model.pkl"
+    engine = EligibilityEngine({"ELIGIBILITY_MODEL_PATH": str(model_path)})
+    assert isinstance(engine.model, LinearModelArtifact)
+    assert tuple(engine.model.feature_names) == ELIGIBILITY_FEATURES
+
+    # The rule would approve both (income * family_size < 8000); the model declines one
+    with caplog.at_level(logging.INFO):
+        decisions = [engine.assess(5000.0, 1), engine.assess(500.0, 4)]
+    assert decisions == ["declined", "approved"]
+    assert "Rule-based" not in caplog.text and "falling back" not in caplog.text
@@ -0,0 +1,37 @@
+import sys
+
+from src.core import ocr_backends
+from src.core.ocr_backends import PytesseractBackend, get_backend
+
+
+def test_pytesseract_backend_honours_tesseract_cmd(monkeypatch):
+    monkeypatch.setenv("TESSERACT_CMD", "/opt/tesseract/bin/tesseract")
+    assert PytesseractBackend().tesseract_cmd == "/opt/tesseract/bin/tesseract"
+
+
+def test_missing_backend_falls_back_to_pytesseract(monkeypatch):
+    monkeypatch.setattr(ocr_backends, "_instances", {})
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+    assert isinstance(get_backend("tesserocr"), PytesseractBackend)
+    assert isinstance(get_backend("no-such-engine"), PytesseractBackend)
+
+
+def test_cache_version_names_the_backend_in_use(monkeypatch):
+    from src.core.ocr_pool import cache_version
+
+    class FakeBackend(ocr_backends.OCRBackend):
+        name = "fake"
+
+        def _engine_version(self):
+            return "1.0"
+
+        def image_to_string(self, image, lang, timeout):
+            return ""
+
+    monkeypatch.setattr(ocr_backends, "_instances", {})
+    monkeypatch.setitem(ocr_backends._BACKENDS, "fake", FakeBackend)
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+    assert "fake 1.0" in cache_version("fake")
+    assert cache_version("fake") != cache_version("pytesseract")
+    # A backend that fell back to pytesseract shares pytesseract's entries
+    assert cache_version("tesserocr") == cache_version("pytesseract")
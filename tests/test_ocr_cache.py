@@ -0,0 +1,64 @@
+import os
+import stat
+import time
+
+from src.core.ocr_cache import OCRCache
+
+
+def test_key_depends_on_language_and_engine():
+    key = OCRCache.make_key(b"doc", "eng", "5.3")
+    assert key == OCRCache.make_key(b"doc", "eng", "5.3")
+    assert key != OCRCache.make_key(b"doc", "ara", "5.3")
+    assert key != OCRCache.make_key(b"doc", "eng", "4.1")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = OCRCache(max_entries=2, cache_dir="")
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path):
+    cache = OCRCache(max_entries=1, cache_dir=str(tmp_path))
+    cache.put("a" * 64, "first")
+    cache.put("b" * 64, "second")
+    assert cache.get("a" * 64) == "first"
+    assert cache.stats()["disk_hits"] == 1
+    # A new process sees the persisted entry
+    assert OCRCache(cache_dir=str(tmp_path)).get("b" * 64) == "second"
+
+
+def test_disk_tier_is_private(tmp_path):
+    cache_dir = tmp_path / "ocr"
+    cache_dir.mkdir(mode=0o755)
+    cache = OCRCache(cache_dir=str(cache_dir))
+    cache.put("a" * 64, "id card text")
+
+    entry = cache_dir / "aa" / f"{'a' * 64}.txt"
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    assert stat.S_IMODE(entry.parent.stat().st_mode) == 0o700
+    assert stat.S_IMODE(entry.stat().st_mode) == 0o600
+
+
+def test_disk_tier_evicts_by_age_and_size(tmp_path):
+    cache = OCRCache(max_entries=0, cache_dir=str(tmp_path), ttl=3600, max_disk_bytes=10)
+    now = time.time()
+    for key, age in [("a" * 64, 7200), ("b" * 64, 60), ("c" * 64, 30)]:
+        cache.put(key, "12345")
+        os.utime(cache._disk_path(key), (now - age, now - age))
+
+    # An expired entry is not served even before a prune
+    assert cache.get("a" * 64) is None
+    cache.put("d" * 64, "12345")
+
+    # 15 bytes over a 10-byte limit: the oldest goes
+    assert cache.prune() == 1
+    assert cache.get("b" * 64) is None
+    assert cache.get("c" * 64) == "12345" and cache.get("d" * 64) == "12345"
+    assert cache.stats()["disk_evictions"] == 2
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.api.main import app
+from src.api.pagination import decode_cursor, encode_cursor
+from src.services.db import Applicant, Application, Base, ChatHistory, async_url, get_async_db_session
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'read.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        session.add_all([Applicant(applicant_id="a1", demographic={}), Applicant(applicant_id="a2", demographic={})])
+        session.flush()
+        # app-2 and app-3 share a timestamp: the ID breaks the tie
+        for i, minutes in enumerate([0, 1, 1, 2, 3]):
+            session.add(Application(
+                application_id=f"app-{i}", applicant_id="a1", income=1000.0 + i, family_size=3,
+                eligibility="approved", recommendation="ok", raw_data={"documents": [f"doc-{i}"]},
+                created_at=START + timedelta(minutes=minutes),
+            ))
+        session.add(Application(
+            application_id="other", applicant_id="a2", income=1.0, family_size=1,
+            eligibility="declined", recommendation="-", raw_data={}, created_at=START,
+        ))
+        for i in range(5):
+            session.add(ChatHistory(
+                session_id="s1", applicant_id="a1", role="user" if i % 2 == 0 else "assistant",
+                message=f"m{i}", timestamp=START + timedelta(seconds=i // 2),
+            ))
+        session.commit()
+
+    async_engine = create_async_engine(async_url(url))
+    sessions = async_sessionmaker(async_engine)
+
+    async def session_override():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db_session] = session_override
+    yield TestClient(app), sync_engine
+    app.dependency_overrides.pop(get_async_db_session, None)
+    sync_engine.dispose()
+
+
+def _pages(client, path, key, **params):
+    pages, cursor = [], None
+    while True:
+        body = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})}).json()
+        pages.append(body[key])
+        cursor = body.get("next_cursor")
+        if not cursor:
+            return pages
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(START, "app-1")) == (START, "app-1")
+    assert decode_cursor(encode_cursor(START, 7)) == (START, 7)
+
+
+def test_list_applications_pages_newest_first_without_raw_data(client):
+    client, _ = client
+    pages = _pages(client, "/application/", "items", applicant_id="a1", limit=2)
+
+    assert [[item["application_id"] for item in page] for page in pages] == [
+        ["app-4", "app-3"], ["app-2", "app-1"], ["app-0"],
+    ]
+    assert all("raw_data" not in item for page in pages for item in page)
+    assert pages[0][0]["income"] == 1004.0
+
+
+def test_list_applications_raw_data_on_request(client):
+    client, _ = client
+    body = client.get("/application/", params={"applicant_id": "a2", "include_raw_data": "true"}).json()
+
+    assert [(item["application_id"], item["raw_data"]) for item in body["items"]] == [("other", {})]
+    # Same contract as the chat sessions endpoint: the key is always there
+    assert body["next_cursor"] is None
+    assert client.get("/application/", params={"applicant_id": "a1", "cursor": "bogus"}).status_code == 400
+
+
+def test_chat_session_pages_in_order(client):
+    client, _ = client
+    pages = _pages(client, "/chatbot/sessions/s1", "messages", limit=2)
+
+    assert [[m["message"] for m in page] for page in pages] == [["m0", "m1"], ["m2", "m3"], ["m4"]]
+    assert pages[0][0]["role"] == "user"
+    assert client.get("/chatbot/sessions/s1").json()["next_cursor"] is None
+    assert client.get("/chatbot/sessions/unknown").status_code == 404
+
+
+def test_composite_indexes_are_created(client):
+    _, sync_engine = client
+    inspector = inspect(sync_engine)
+    indexes = {
+        index["name"]: index["column_names"]
+        for table in ("applications", "chat_history")
+        for index in inspector.get_indexes(table)
+    }
+    assert indexes["ix_applications_applicant_created"] == ["applicant_id", "created_at"]
+    assert indexes["ix_chat_history_session_timestamp"] == ["session_id", "timestamp"]
@@ -0,0 +1,48 @@
+import io
+
+import pytest
+from PIL import Image
+from src.core import ocr_pool
+from src.core.pdf_pipeline import PDFPagePipeline
+
+
+@pytest.fixture
+def scanned_pdf():
+    pages = [Image.open(name).convert("RGB") for name in ("id_card.jpg", "utility_bill.png")]
+    buffer = io.BytesIO()
+    pages[0].save(buffer, "PDF", save_all=True, append_images=pages[1:])
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    calls = []
+
+    def fake(img_bytes, timeout, lang="eng", backend=None):
+        calls.append(img_bytes)
+        return f"page {len(calls)} text"
+    monkeypatch.setattr(ocr_pool, "ocr_image_bytes", fake)
+    return calls
+
+
+def test_text_layer_pages_skip_ocr(fake_ocr):
+    with open("bank_statement.pdf", "rb") as f:
+        result = PDFPagePipeline().extract(f.read())
+    assert "Account Holder: John Doe" in result.text
+    assert result.pages_ocr == 0
+    assert fake_ocr == []
+
+
+def test_scanned_pages_are_ocrd_in_order(fake_ocr, scanned_pdf):
+    result = PDFPagePipeline().extract(scanned_pdf)
+    assert result.text == "page 1 text\npage 2 text"
+    assert result.pages_ocr == 2
+    assert not result.truncated
+
+
+def test_page_budget_stops_early(fake_ocr, scanned_pdf, monkeypatch):
+    monkeypatch.setenv("PDF_MAX_PAGES", "1")
+    result = PDFPagePipeline().extract(scanned_pdf)
+    assert result.text == "page 1 text"
+    assert result.pages_processed == 1
+    assert result.truncated
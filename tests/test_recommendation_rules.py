@@ -0,0 +1,118 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+from src.core.recommendation_engine import RecommendationEngine
+from src.core.recommendation_rules import RuleSet
+
+TABLE = [
+    {"name": "approved", "when": {"eligibility": "approved"}, "recommendation": "A"},
+    {"name": "low_income", "when": {"income": {"lt": "$low"}}, "recommendation": "L"},
+    {"name": "band", "when": {"income": {"ge": 1000, "lt": 2000}}, "recommendation": "B"},
+    {"name": "fallback", "recommendation": "F"},
+]
+
+
+def test_first_matching_rule_wins():
+    rules = RuleSet.compile(TABLE, {"low": 500})
+    assert rules.features == ["eligibility", "income"]
+    data = {"eligibility_inputs": {"income": 100}, "eligibility": "approved", "ocr_texts": ["x"]}
+    assert rules.extract(data) == {"eligibility": "approved", "income": 100}
+    assert rules.evaluate({"eligibility": "approved", "income": 100}).name == "approved"
+    assert rules.evaluate({"eligibility": "declined", "income": 100}).name == "low_income"
+    assert rules.evaluate({"eligibility": "declined", "income": 1500}).name == "band"
+    assert rules.evaluate({"eligibility": "declined", "income": 2000}).recommendation == "F"
+
+
+@pytest.mark.parametrize("table, message", [
+    ([{"name": "x", "when": {"age": 3}, "recommendation": "r"}], "unknown feature"),
+    ([{"name": "x", "when": {"income": {"between": 3}}, "recommendation": "r"}], "unknown operator"),
+    ([{"name": "x", "when": {"income": {"lt": "$nope"}}, "recommendation": "r"}], "unknown threshold"),
+    ([{"name": "x", "when": {"income": 3}, "recommendation": "r"}], "no conditions"),
+])
+def test_invalid_tables_are_rejected(table, message):
+    with pytest.raises(ValueError, match=message):
+        RuleSet.compile(table, {})
+
+
+def test_frame_evaluation_matches_single_evaluation():
+    rules = RuleSet.compile(TABLE, {"low": 500})
+    frame = pd.DataFrame({
+        "eligibility": ["approved", "declined", "declined", "unknown"],
+        "income": [100.0, 100.0, 1500.0, 2500.0],
+    }, index=[10, 11, 12, 13])
+    out = rules.evaluate_frame(frame)
+    assert list(out.index) == [10, 11, 12, 13]
+    assert list(out["rule"]) == ["approved", "low_income", "band", "fallback"]
+    assert list(out["recommendation"]) == [
+        rules.evaluate(row).recommendation for row in frame.to_dict("records")
+    ]
+    with pytest.raises(ValueError, match="income"):
+        rules.evaluate_frame(frame[["eligibility"]])
+
+
+def test_engine_uses_configured_rules_file(tmp_path):
+    path = tmp_path / "rules.yml"
+    path.write_text(
+        "recommendation_rules:\n"
+        "  - name: many_docs\n"
+        "    when: {doc_count: {ge: $doc_threshold}}\n"
+        "    recommendation: Thanks for the documents.\n"
+        "  - name: fallback\n"
+        "    recommendation: Please send documents.\n"
+    )
+    engine = RecommendationEngine({"RECOMMENDATION_RULES_PATH": str(path), "RECOMMEND_DOC_THRESHOLD": "3"})
+    assert engine.generate({"documents": ["a", "b", "c"]}) == "Thanks for the documents."
+    assert engine.generate({"documents": ["a"]}) == "Please send documents."
+
+
+def _if_chain(engine, data):
+    """
+    The hard-coded policy the rules table replaced, as it was.
+    """
+    inputs = data.get("eligibility_inputs", {})
+    income, family_size = inputs.get("income", 0), inputs.get("family_size", 0)
+    doc_count = len(data.get("documents", []))
+    if data.get("eligibility") == "approved":
+        if income < engine.low_income_threshold:
+            return "approved_low_income"
+        if family_size >= engine.high_family_size_threshold:
+            return "approved_large_family"
+        return "approved"
+    if income < engine.low_income_threshold:
+        return "low_income"
+    if family_size >= engine.high_family_size_threshold:
+        return "large_family"
+    if doc_count >= engine.doc_threshold:
+        return "well_documented"
+    if sum(len(text) for text in data.get("ocr_texts", [])) > 1000:
+        return "detailed_documents"
+    if income < 500:
+        return "very_low_income"
+    if data.get("resume_data", {}).get("employment_count", 0) == 0:
+        return "no_employment_history"
+    if data.get("financial_data", {}).get("net_worth", 0) < 0:
+        return "negative_net_worth"
+    return "fallback"
+
+
+@pytest.mark.parametrize("low_income_threshold", ["300", "500", "800"])
+def test_shipped_rules_match_the_original_if_chain(low_income_threshold):
+    engine = RecommendationEngine({
+        "LOW_INCOME_THRESHOLD": low_income_threshold,
+        "HIGH_FAMILY_SIZE_THRESHOLD": "4",
+        "RECOMMEND_DOC_THRESHOLD": "3",
+    })
+    for eligibility, income, family_size, docs, text, jobs, net_worth in itertools.product(
+        ["approved", "declined"], [100, 400, 600, 1000], [1, 5], [1, 3], [10, 2000], [0, 2], [-5, 5]
+    ):
+        data = {
+            "eligibility": eligibility,
+            "eligibility_inputs": {"income": income, "family_size": family_size},
+            "documents": ["doc"] * docs,
+            "ocr_texts": ["x" * text],
+            "resume_data": {"employment_count": jobs},
+            "financial_data": {"net_worth": net_worth},
+        }
+        assert engine.rules.evaluate(engine.rules.extract(data)).name == _if_chain(engine, data), data
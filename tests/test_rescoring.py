@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from src.services.db import Applicant, Application, Base
+from src.services.rescoring import Checkpoint, plan_partitions, rescore_partition
+
+
+@pytest.fixture
+def database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'apps.db'}"
+    engine = create_engine(url)
+
+    @event.listens_for(engine, "connect")
+    def _wal(dbapi_conn, _):
+        # Lets the streaming reader and the writer share the file
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Applicant(applicant_id="a", demographic={}))
+        for i in range(10):
+            session.add(Application(
+                application_id=f"app-{i:02d}", applicant_id="a",
+                income=1000.0 + 200 * i, family_size=4,
+                eligibility="approved", recommendation="old",
+                raw_data={"documents": ["id.png"], "ocr_texts": [], "resume_data": {"employment_count": 1}},
+            ))
+        session.commit()
+    yield url, engine
+    engine.dispose()
+
+
+def _rows(engine):
+    with Session(engine) as session:
+        return {a.application_id: (a.eligibility, a.recommendation)
+                for a in session.scalars(select(Application))}
+
+
+def test_partitions_cover_all_rows_and_update_changes(database, tmp_path):
+    url, engine = database
+    settings = {"ELIGIBILITY_MODEL_PATH": "", "ELIGIBILITY_INCOME_THRESHOLD": "1500"}
+    partitions = plan_partitions(engine, 3)
+    assert len(partitions) == 3 and partitions[0].lower is None and partitions[-1].upper is None
+
+    results = [
+        rescore_partition(url, p, str(tmp_path / "ckpt"), chunk_size=2, settings=settings)
+        for p in partitions
+    ]
+    assert sum(r.scanned for r in results) == 10
+
+    rows = _rows(engine)
+    # income * 4 < 1500 * 4 → approved for income 1000, 1200, 1400
+    assert [rows[f"app-{i:02d}"][0] for i in range(10)] == ["approved"] * 3 + ["declined"] * 7
+    assert all(rec != "old" for _, rec in rows.values())
+    assert sum(r.changed for r in results) == 10
+
+    # A second run over unchanged settings finds nothing to update
+    again = rescore_partition(url, partitions[0], str(tmp_path / "fresh"), settings=settings)
+    assert again.scanned > 0 and again.changed == 0
+
+
+def test_resumes_after_checkpoint(database, tmp_path):
+    url, engine = database
+    checkpoint = Checkpoint(str(tmp_path / "ckpt"))
+    partition = plan_partitions(engine, 1)[0]
+    checkpoint.save_plan([partition])
+    (tmp_path / "ckpt" / "partition-0.json").write_text(
+        json.dumps({"index": 0, "scanned": 6, "changed": 0, "last_id": "app-05"})
+    )
+
+    result = rescore_partition(url, partition, checkpoint.directory, chunk_size=3, dry_run=False,
+                               settings={"ELIGIBILITY_MODEL_PATH": ""})
+    assert result.scanned == 10 and result.last_id == "app-09"
+    rows = _rows(engine)
+    assert {k for k, (_, rec) in rows.items() if rec == "old"} == {f"app-{i:02d}" for i in range(6)}
+    assert checkpoint.load_progress(0).last_id == "app-09"
+    assert checkpoint.load_plan() == [partition]
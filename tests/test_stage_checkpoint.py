@@ -0,0 +1,169 @@
+import asyncio
+import base64
+import io
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from src.agents.decision_agent import DecisionAgent
+from src.core.agent_orchestrator import AgentOrchestrator, STAGES
+from src.core.deadline import COMPLETE, FAILED, DocumentResult
+from src.core.document_payload import DocumentPayload
+from src.core.eligibility_engine import EligibilityEngine
+from src.core.recommendation_engine import RecommendationEngine
+from src.core.stage_checkpoint import StageCheckpointStore, input_hash
+from src.core.stage_executor import StageExecutor
+
+
+class _CountingOCR:
+    ocr_language = "eng"
+
+    def __init__(self):
+        self.calls = 0
+
+    def extract_documents(self, documents, deadline=None):
+        self.calls += 1
+        return [DocumentResult(i, COMPLETE, "id card") for i in range(len(documents))]
+
+
+class _FlakyDecisionAgent(DecisionAgent):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def decide(self, eligibility, recommendation, processed_data):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("decision service down")
+        return super().decide(eligibility, recommendation, processed_data)
+
+
+class _FailingOCR(_CountingOCR):
+    def extract_documents(self, documents, deadline=None):
+        self.calls += 1
+        return [DocumentResult(i, FAILED, detail="OCR failed") for i in range(len(documents))]
+
+
+class _FlakyEligibilityEngine(EligibilityEngine):
+    def __init__(self, failures):
+        super().__init__(settings={})
+        self.failures = failures
+
+    def assess(self, income, family_size):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("model unavailable")
+        return super().assess(income, family_size)
+
+
+def _orchestrator(ocr, decision_agent, eligibility_engine=None):
+    return AgentOrchestrator(
+        ocr=ocr,
+        eligibility_engine=eligibility_engine or EligibilityEngine(settings={}),
+        recommendation_engine=RecommendationEngine(settings={}),
+        document_processor=object(),
+        decision_agent=decision_agent,
+    )
+
+
+def _run(orchestrator, store, income=1500.0, application_id="app-1"):
+    png = f"data:image/png;base64,{base64.b64encode(b'png').decode()}"
+    return asyncio.run(orchestrator.run_async(
+        "a1", [png], income, 3, executor=StageExecutor(2, 2),
+        application_id=application_id, checkpoints=store,
+    ))
+
+
+def test_retry_resumes_after_last_completed_stage(tmp_path):
+    store = StageCheckpointStore(str(tmp_path))
+    ocr = _CountingOCR()
+    orchestrator = _orchestrator(ocr, _FlakyDecisionAgent(failures=1))
+
+    with pytest.raises(RuntimeError):
+        _run(orchestrator, store)
+    result = _run(orchestrator, store)
+
+    # The retry did not OCR the document again
+    assert ocr.calls == 1
+    assert result["eligibility"] == "approved"
+    assert result["final_decision"].startswith("✅ APPROVED")
+    assert result["processed_data"]["ocr_texts"] == ["id card"]
+    completed, state = store.load("app-1", input_hash("a1", 1500.0, 3, result["processed_data"]["documents"]))
+    assert completed == list(STAGES)
+    assert state["final_decision"] == result["final_decision"]
+
+    # Different inputs under the same ID start over
+    _run(orchestrator, store, income=900.0)
+    assert ocr.calls == 2
+
+
+def test_degraded_eligibility_is_not_checkpointed(tmp_path):
+    store = StageCheckpointStore(str(tmp_path))
+    ocr = _CountingOCR()
+    orchestrator = _orchestrator(ocr, DecisionAgent(), _FlakyEligibilityEngine(failures=1))
+
+    degraded = _run(orchestrator, store)
+    key = input_hash("a1", 1500.0, 3, degraded["processed_data"]["documents"])
+    # The fallback is returned, but the checkpoint stays at the last good stage
+    assert degraded["eligibility"] == "declined"
+    assert store.load("app-1", key)[0] == ["documents", "validation", "extraction"]
+
+    result = _run(orchestrator, store)
+    assert ocr.calls == 1
+    assert result["eligibility"] == "approved"
+    assert result["final_decision"].startswith("✅ APPROVED")
+    completed, state = store.load("app-1", key)
+    assert completed == list(STAGES) and "degraded" not in state
+
+
+def test_failed_extraction_fails_validation(tmp_path):
+    store = StageCheckpointStore(str(tmp_path))
+    orchestrator = _orchestrator(_FailingOCR(), DecisionAgent())
+
+    with pytest.raises(HTTPException) as exc:
+        _run(orchestrator, store)
+    assert exc.value.status_code == 422
+    assert "OCR failed" in exc.value.detail
+
+
+def test_without_application_id_nothing_is_checkpointed(tmp_path):
+    store = StageCheckpointStore(str(tmp_path))
+    _run(_orchestrator(_CountingOCR(), DecisionAgent()), store, application_id=None)
+    assert os.listdir(tmp_path) == []
+
+
+def test_store_expiry_clear_and_disabled(tmp_path):
+    store = StageCheckpointStore(str(tmp_path), ttl=60)
+    store.save("../../etc/app", "k", ["documents"], {"processed_data": {}})
+    # Client-supplied IDs never escape the directory
+    assert len(os.listdir(tmp_path)) == 1
+    assert store.load("../../etc/app", "k") == (["documents"], {"processed_data": {}})
+    assert store.load("../../etc/app", "other") == ([], {})
+
+    (path,) = [os.path.join(tmp_path, name) for name in os.listdir(tmp_path)]
+    os.utime(path, (0, 0))
+    assert store.load("../../etc/app", "k") == ([], {})
+    assert not os.path.exists(path)
+
+    store.save("stale", "k", ["documents"], {})
+    os.utime(os.path.join(tmp_path, os.listdir(tmp_path)[0]), (0, 0))
+    assert store.prune() == 1
+
+    store.save("app", "k", ["documents"], {})
+    store.clear("app")
+    store.clear("app")
+    assert os.listdir(tmp_path) == []
+
+    disabled = StageCheckpointStore("")
+    disabled.save("app", "k", ["documents"], {})
+    assert not disabled.enabled
+    assert disabled.load("app", "k") == ([], {})
+
+
+def test_input_hash_covers_uploaded_content():
+    first = DocumentPayload(body=io.BytesIO(b"one"), mime="image/png", size=3, name="a.png")
+    second = DocumentPayload(body=io.BytesIO(b"two"), mime="image/png", size=3, name="a.png")
+    assert input_hash("a1", 1.0, 2, [first]) != input_hash("a1", 1.0, 2, [second])
+    assert input_hash("a1", 1.0, 2, [first]) == input_hash("a1", 1.0, 2, [first])
+    assert input_hash("a1", 1.0, 2, ["x"]) != input_hash("a1", 1.0, 3, ["x"])
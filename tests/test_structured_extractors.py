@@ -0,0 +1,82 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from src.core.agent_orchestrator import AgentOrchestrator
+from src.core.document_payload import DocumentPayload
+from src.core.structured_extractors import (
+    CSV,
+    XLS,
+    XLSX,
+    extract_financial,
+    financial_format,
+    parse_resume,
+)
+
+
+def test_parse_resume_is_typed():
+    resume = parse_resume("Title: Clerk Duration: 2 years\nRole: Driver  Period: 6 months\nHobbies: none")
+    assert resume.employment_count == 2
+    assert resume.employment_history[1].title == "Driver"
+    assert resume.to_dict()["employment_history"][0] == {"title": "Clerk", "duration": "2 years"}
+
+
+def test_csv_sums_only_the_needed_columns():
+    content = (
+        "\ufeffDate,Notes,Assets,Liabilities\n"
+        '2024-01-01,"multi\nline",100.5,40\n'
+        "2024-01-02,x,,10\n"
+        "2024-01-03,y,n/a,\n"
+        "2024-01-04,short\n"
+        "2024-01-05,z,NaN,NaN\n"
+    ).encode("utf-8")
+    summary = extract_financial(content, CSV)
+    assert (summary.total_assets, summary.total_liabilities, summary.net_worth) == (100.5, 50.0, 50.5)
+
+    payload = DocumentPayload(body=io.BytesIO(b"Liabilities\n7\n"), mime="text/csv", size=14)
+    assert extract_financial(payload).to_dict() == {
+        "total_assets": 0.0, "total_liabilities": 7.0, "net_worth": -7.0
+    }
+
+
+def test_xlsx_is_read_with_openpyxl():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Assets", "Liabilities"])
+    sheet.append([1000, 250.5])
+    sheet.append([None, "n/a"])
+    sheet.append([500, 0])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    summary = extract_financial(buffer.getvalue(), XLSX)
+    assert (summary.total_assets, summary.total_liabilities) == (1500.0, 250.5)
+
+
+def test_xls_is_read_with_xlrd():
+    pytest.importorskip("xlrd")
+    content = (Path(__file__).resolve().parent.parent / "bank_statement.xls").read_bytes()
+
+    summary = extract_financial(content, XLS)
+    assert (summary.total_assets, summary.total_liabilities, summary.net_worth) == (2000.5, 450.25, 1550.25)
+
+
+def test_financial_formats_and_routing():
+    assert financial_format("https://example.com/statement.XLSX?sig=1") == XLSX
+    assert financial_format("", "application/vnd.ms-excel") == XLS
+    assert financial_format("scan.png", "image/png") is None
+    with pytest.raises(ValueError):
+        extract_financial(b"", "ods")
+
+    documents = [
+        "docs/bank.xlsx",
+        DocumentPayload(body=io.BytesIO(b""), mime=None, size=0, name="old.xls"),
+        "docs/my_cv.pdf",
+        "docs/id.png",
+    ]
+    ocr, resume, financial = AgentOrchestrator._route_documents(documents)
+    assert [idx for idx, _ in financial] == [0, 1]
+    assert [idx for idx, _ in resume] == [2]
+    assert [idx for idx, _ in ocr] == [3]
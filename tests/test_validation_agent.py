@@ -27,3 +27,15 @@ def test_validate_missing_text():
     with pytest.raises(HTTPException) as exc:
         agent.validate({"documents": [{}]})
     assert exc.value.status_code == 400
+
+def test_validate_failed_extraction():
+    agent = ValidationAgent()
+    documents = [
+        {"document_index": 0, "status": "complete", "detail": None},
+        {"document_index": 1, "status": "failed", "detail": "could not read document"},
+    ]
+    assert agent.validate({"documents": documents[:1]})["documents"] == documents[:1]
+    with pytest.raises(HTTPException) as exc:
+        agent.validate({"documents": documents})
+    assert exc.value.status_code == 422
+    assert "could not read document" in exc.value.detail